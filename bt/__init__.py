@@ -3,10 +3,20 @@ Bradley-Terry Model for Pokemon Battle Rankings
 
 This module provides tools for computing Bradley-Terry rankings from head-to-head
 battle data, including bootstrap uncertainty estimation and minimum games analysis.
+
+The implementation lives in `leaderboard.whr`; the classes below are imported
+lazily on first access so that `import bt` stays cheap.
 """
 
-from .whr import HeadToHeadMatrix, BradleyTerryModel
+import importlib
 
 __version__ = '1.0.0'
 __all__ = ['HeadToHeadMatrix', 'BradleyTerryModel']
 
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module('leaderboard.whr'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
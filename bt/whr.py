@@ -0,0 +1,8 @@
+"""
+Compatibility alias for `leaderboard.whr`, where the Bradley-Terry
+implementation lives. Kept so that `from bt.whr import ...` keeps working.
+"""
+
+from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
+
+__all__ = ['HeadToHeadMatrix', 'BradleyTerryModel']
@@ -22,6 +22,7 @@ export const API_CONFIG = {
   // Fallback data sources (used when API fails or USE_LIVE_DATA is false)
   FALLBACK: {
     LEADERBOARD_JSON: 'leaderboard/track1_qualifying.json',
+    LEADERBOARD_INDEX: 'leaderboard/track1_qualifying/index.json', // Per-format shards
     H2H_TSV_DIR: 'leaderboard/showdown_tsvs'
   },
   
@@ -15,6 +15,7 @@ class BattlingLeaderboard {
     this.h2hMatrix = new HeadToHeadMatrix();
     this.showH2HMatrix = false;
     this.usingLiveData = false; // Track which data source we're using
+    this.formats = ['gen1ou', 'gen9ou']; // Formats rendered on the page
     this.elements = {
       gen1Table: document.getElementById('gen1ou-leaderboard'),
       gen9Table: document.getElementById('gen9ou-leaderboard'),
@@ -95,10 +96,68 @@ class BattlingLeaderboard {
     }
   }
 
+  /**
+   * Fetch the shard index and only the shards of the rendered formats
+   */
+  async loadShardedData() {
+    const indexUrl = API_CONFIG.FALLBACK.LEADERBOARD_INDEX;
+    const response = await fetch(`${indexUrl}?t=${Date.now()}`);
+    if (!response.ok) throw new Error('Failed to load leaderboard shard index');
+    const index = await response.json();
+    if (await this.shardsAreStale(index)) {
+      throw new Error('Leaderboard shards are older than the full JSON');
+    }
+
+    const baseUrl = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+    const formats = this.formats.filter(format => index.formats[format]);
+    const shards = await Promise.all(formats.map(async format => {
+      const shardResponse = await fetch(`${baseUrl}${index.formats[format].path}?t=${Date.now()}`);
+      if (!shardResponse.ok) throw new Error(`Failed to load ${format} shard`);
+      return shardResponse.json();
+    }));
+
+    // Same shape as the monolithic document
+    this.data = { ...index, formats: {} };
+    shards.forEach(shard => {
+      this.data.formats[shard.format] = shard.players;
+    });
+  }
+
+  /**
+   * Whether the full JSON changed since the shards were cut from it: the
+   * index records the size of the document it was written with
+   * (source_bytes), compared with the size the server reports for it. A
+   * compressed response carries no comparable size, so the shards are
+   * trusted then.
+   */
+  async shardsAreStale(index) {
+    if (typeof index.source_bytes !== 'number') return true;
+    const response = await fetch(`${API_CONFIG.FALLBACK.LEADERBOARD_JSON}?t=${Date.now()}`, {
+      method: 'HEAD'
+    });
+    const length = response.headers.get('Content-Length');
+    const encoding = response.headers.get('Content-Encoding');
+    if (!response.ok || length === null || (encoding && encoding !== 'identity')) {
+      return false;
+    }
+    return Number(length) !== index.source_bytes;
+  }
+
   /**
    * Fetch data from static JSON (fallback)
    */
   async loadStaticData() {
+    if (API_CONFIG.FALLBACK.LEADERBOARD_INDEX) {
+      try {
+        await this.loadShardedData();
+        this.usingLiveData = false;
+        console.log('[Leaderboard] ✓ Loaded static JSON shards');
+        return;
+      } catch (error) {
+        console.warn('[Leaderboard] Failed to load shards, falling back to full JSON:', error);
+      }
+    }
+
     console.log('[Leaderboard] Loading static JSON fallback');
     try {
       const response = await fetch(`${API_CONFIG.FALLBACK.LEADERBOARD_JSON}?t=${Date.now()}`);
@@ -15,6 +15,8 @@ class HeadToHeadMatrix {
     this.maxDeviation = 80; // Maximum Glicko-1 deviation (matches main leaderboard)
     this.debugCount = 0; // For debugging H2H lookups
     this.usingLiveData = false; // Track which data source we're using
+    this.h2hCounts = null; // Dense (w, l, t) table of the compact export
+    this.h2hPlayerIndex = null; // Username -> row of h2hCounts
   }
 
   /**
@@ -275,16 +277,21 @@ class HeadToHeadMatrix {
       
       const data = await response.json();
       
-      // Map JSON response to internal format (same as API format)
-      this.filteredPlayers = data.players.map(p => ({
-        Username: p.username,
-        DisplayName: p.display_name,
-        Elo: p.elo,
-        Glicko: p.glicko,
-        Rating_Deviation: p.rating_deviation,
-        H2H_Data: p.h2h_data,
-        IsOrgBaseline: p.is_org_baseline || false
-      }));
+      if (data.encoding === 'coo-upper') {
+        await this.loadCompactH2HData(data);
+      } else {
+        // Map JSON response to internal format (same as API format)
+        this.filteredPlayers = data.players.map(p => ({
+          Username: p.username,
+          DisplayName: p.display_name,
+          Elo: p.elo,
+          Glicko: p.glicko,
+          Rating_Deviation: p.rating_deviation,
+          H2H_Data: p.h2h_data,
+          IsOrgBaseline: p.is_org_baseline || false
+        }));
+        this.h2hCounts = null;
+      }
       
       this.usingLiveData = false;
       console.log(`[H2H] ✓ Frozen data loaded: ${this.filteredPlayers.length} players for ${format}`);
@@ -296,16 +303,78 @@ class HeadToHeadMatrix {
     }
   }
 
+  /**
+   * Decode the compact export of leaderboard/export_h2h.py: a columnar player
+   * table plus upper-triangle COO arrays (i, j, w, l, t), inline or in a
+   * little-endian typed-array sidecar. Records go to a dense n x n x 3 table
+   * indexed by player position.
+   */
+  async loadCompactH2HData(data) {
+    const table = data.players;
+    const n = table.username.length;
+    this.filteredPlayers = table.username.map((username, k) => ({
+      Username: username,
+      DisplayName: table.display_name[k],
+      Elo: table.elo[k],
+      Glicko: table.glicko[k],
+      Rating_Deviation: table.rating_deviation[k],
+      IsOrgBaseline: table.is_org_baseline[k],
+      Index: k
+    }));
+
+    const pairs = data.pairs;
+    let fields = pairs;
+    if (pairs.binary) {
+      const response = await fetch(`leaderboard/${pairs.binary}?t=${Date.now()}`);
+      if (!response.ok) throw new Error(`Failed to load ${pairs.binary}`);
+      const buffer = await response.arrayBuffer();
+      const ArrayType = pairs.dtype === 'uint16' ? Uint16Array : Uint32Array;
+      fields = {};
+      pairs.fields.forEach((name, f) => {
+        fields[name] = new ArrayType(buffer, f * pairs.count * ArrayType.BYTES_PER_ELEMENT, pairs.count);
+      });
+    }
+
+    // Row player's (w, l, t) against the column player; (j, i) mirrors (i, j)
+    const counts = new Uint32Array(n * n * 3);
+    for (let k = 0; k < pairs.count; k++) {
+      const i = fields.i[k], j = fields.j[k];
+      const w = fields.w[k], l = fields.l[k], t = fields.t[k];
+      counts.set([w, l, t], (i * n + j) * 3);
+      counts.set([l, w, t], (j * n + i) * 3);
+    }
+    this.h2hCounts = counts;
+    this.h2hPlayerIndex = new Map(table.username.map((username, k) => [username, k]));
+  }
+
+  /**
+   * Ladder TSV text, from <format>.tsv or, when only the gzip-compressed
+   * ladder is deployed (leaderboard/fetch_ladders.py stores them that way),
+   * from <format>.tsv.gz decompressed in the browser
+   */
+  async fetchTSVText(format) {
+    const base = `leaderboard/showdown_tsvs/${format}`;
+    let response = await fetch(`${base}.tsv?t=${Date.now()}`);
+    if (response.ok) return response.text();
+
+    response = await fetch(`${base}.tsv.gz?t=${Date.now()}`);
+    if (!response.ok || typeof DecompressionStream === 'undefined') {
+      throw new Error(`Failed to load ${format} TSV`);
+    }
+    const bytes = new Uint8Array(await response.arrayBuffer());
+    // Already decoded if the server sent the file with Content-Encoding: gzip
+    if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) return new TextDecoder().decode(bytes);
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text();
+  }
+
   /**
    * Fetch and parse TSV (fallback)
    */
   async loadTSVData(format) {
     console.log(`[H2H] Loading TSV fallback for ${format}`);
     try {
-      const response = await fetch(`leaderboard/showdown_tsvs/${format}.tsv?t=${Date.now()}`);
-      if (!response.ok) throw new Error(`Failed to load ${format} TSV`);
-      
-      const tsvText = await response.text();
+      const tsvText = await this.fetchTSVText(format);
       const lines = tsvText.trim().split('\n');
       const headers = lines[0].split('\t');
       
@@ -422,6 +491,18 @@ class HeadToHeadMatrix {
    * Get head-to-head record between two players
    */
   getH2HRecord(player1, player2Username) {
+    if (this.h2hCounts && player1.Index !== undefined) {
+      const j = this.h2hPlayerIndex.get(player2Username);
+      if (j === undefined) return null;
+      const base = (player1.Index * this.h2hPlayerIndex.size + j) * 3;
+      const wins = this.h2hCounts[base];
+      const losses = this.h2hCounts[base + 1];
+      const ties = this.h2hCounts[base + 2];
+      const totalGames = wins + losses + ties;
+      if (totalGames === 0) return null;
+      return { wins, losses, ties, total: totalGames };
+    }
+
     const h2hData = player1.H2H_Data || {};
     const player2Key = this.usernameToH2HKey(player2Username);
     const record = h2hData[player2Key];
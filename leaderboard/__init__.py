@@ -0,0 +1,39 @@
+"""
+PokéAgent leaderboard tooling.
+
+Bradley-Terry / WHR rating computation, ladder parsing and the scripts that
+publish the leaderboard JSON files.
+
+Submodules and the core classes are resolved lazily on first access, so
+`import leaderboard` (and lightweight commands such as JSON validation) do
+not pay the import cost of numpy, pandas or scipy.
+"""
+
+import importlib
+import importlib.util
+
+__version__ = "1.0.0"
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "HeadToHeadMatrix": "whr",
+    "BradleyTerryModel": "whr",
+    "WholeHistoryRating": "whole_history_rating",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if not name.startswith("_") and importlib.util.find_spec(f"{__name__}.{name}"):
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -7,25 +7,187 @@ This script uses several methods to determine an appropriate minimum:
 2. Subsampling stability test (your suggestion)
 3. Ranking stability across thresholds
 4. Prediction accuracy by game count
+
+All methods share one AnalysisContext: the TSV is parsed once at the lowest
+threshold (higher thresholds are nested subsets of it), one full-data fit
+warm-starts every other fit, and methods that resample the same players fit
+the same bootstrap replicates. Independent threshold and fraction jobs run in
+parallel processes.
+
+Usage:
+    python analyze_min_games.py [--filepath TSV] [--jobs J]
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from whr import HeadToHeadMatrix, BradleyTerryModel
+from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel, summarize_bootstrap
 from typing import Dict, List, Tuple
 import warnings
 
 warnings.filterwarnings("ignore")
 
+REGULARIZATION = 0.01
+
+
+def _bootstrap_job(task) -> Tuple[BradleyTerryModel, Dict[str, np.ndarray]]:
+    """Bootstrap fit of one threshold or fraction (run in a worker process)."""
+    h2h, x0, bootstrap_kwargs = task
+    model = BradleyTerryModel(h2h)
+    results = model.fit_bootstrap(
+        fit_method="lbfgs",
+        min_games=0,
+        regularization=REGULARIZATION,
+        verbose=False,
+        x0=x0,
+        **bootstrap_kwargs,
+    )
+    return model, results
+
+
+class AnalysisContext:
+    """
+    Computation shared by the analysis methods.
+
+    Holds one parse of the TSV at the lowest threshold, the full-data fit on
+    it (the warm start of every other fit) and one batch of resampled
+    replicates. A threshold's data and replicates are the restriction of these
+    to its players, so every method that bootstraps a threshold fits the same
+    replicates. Fits are cached by player subset: thresholds that select the
+    same players share one fit.
+    """
+
+    def __init__(
+        self,
+        filepath: str = "showdown_tsvs/gen1ou.tsv",
+        min_games: int = 5,
+        n_bootstrap: int = 50,
+        n_jobs: int = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            filepath: Path to TSV file with battle data
+            min_games: Lowest threshold any method uses
+            n_bootstrap: Most bootstrap replicates any method uses
+            n_jobs: Worker processes (default: one per CPU; 1 runs in-process)
+            seed: Random seed of the shared replicates
+        """
+        self.h2h = HeadToHeadMatrix(filepath=filepath, min_games=min_games)
+        self.model = BradleyTerryModel(self.h2h)
+        self.model.fit_logistic(
+            method="lbfgs", min_games=0, regularization=REGULARIZATION, verbose=False
+        )
+        self.samples = self.model.bootstrap_sample_batch(n_bootstrap, seed=seed)
+        self.n_jobs = n_jobs
+        # Subset size (thresholds are nested) -> (model, bootstrap results or None)
+        self._fits = {len(self.h2h.players): (self.model, None)}
+
+    def _indices(self, min_games: int) -> np.ndarray:
+        return np.flatnonzero(self.h2h.total_games >= min_games)
+
+    def _task(self, min_games: int, **bootstrap_kwargs):
+        """Subset data and warm start of a bootstrap job."""
+        idx = self._indices(min_games)
+        return self.h2h.subset(min_games), self.model.params[idx], bootstrap_kwargs
+
+    def _map(self, tasks: List) -> List:
+        if self.n_jobs == 1 or len(tasks) < 2:
+            return [_bootstrap_job(task) for task in tasks]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+            return list(pool.map(_bootstrap_job, tasks))
+
+    def fit(self, min_games: int) -> BradleyTerryModel:
+        """Model fitted on the players with at least `min_games` games."""
+        idx = self._indices(min_games)
+        if len(idx) not in self._fits:
+            model = BradleyTerryModel(self.h2h.subset(min_games))
+            model.fit_logistic(
+                method="lbfgs",
+                min_games=0,
+                regularization=REGULARIZATION,
+                verbose=False,
+                x0=self.model.params[idx],
+            )
+            self._fits[len(idx)] = (model, None)
+        return self._fits[len(idx)][0]
+
+    def bootstrap(
+        self, thresholds: List[int], n_bootstrap: int
+    ) -> Dict[int, Tuple[BradleyTerryModel, Dict[str, np.ndarray]]]:
+        """
+        Resampling bootstrap of several thresholds on the shared replicates.
+
+        Thresholds already bootstrapped with at least `n_bootstrap` replicates
+        are not refit; their first `n_bootstrap` replicates are summarized.
+
+        Returns:
+            Dictionary of threshold -> (model, bootstrap results)
+        """
+        if n_bootstrap > len(self.samples[0]):
+            raise ValueError(
+                f"Context holds {len(self.samples[0])} replicates, {n_bootstrap} requested"
+            )
+
+        def cached(key):
+            results = self._fits.get(key, (None, None))[1]
+            return results is not None and len(results["strengths_samples"]) >= n_bootstrap
+
+        # One job per distinct player subset not bootstrapped yet
+        keys = {t: len(self._indices(t)) for t in thresholds}
+        todo = {keys[t]: t for t in thresholds if not cached(keys[t])}
+        tasks = []
+        for t in todo.values():
+            idx = self._indices(t)
+            samples = tuple(m[:n_bootstrap][:, idx][:, :, idx] for m in self.samples)
+            tasks.append(self._task(t, samples=samples))
+        for key, fit in zip(todo, self._map(tasks)):
+            self._fits[key] = fit
+
+        out = {}
+        for t in thresholds:
+            model, results = self._fits[keys[t]]
+            if len(results["strengths_samples"]) > n_bootstrap:
+                results = summarize_bootstrap(
+                    results["strengths_samples"][:n_bootstrap],
+                    results["log_strengths_samples"][:n_bootstrap],
+                )
+            out[t] = (model, results)
+        return out
+
+    def subsample(
+        self, min_games: int, fractions: List[float], n_bootstrap: int
+    ) -> Dict[float, Tuple[BradleyTerryModel, Dict[str, np.ndarray]]]:
+        """
+        Subsampling bootstrap of one threshold at several fractions of games.
+
+        Returns:
+            Dictionary of fraction -> (model, bootstrap results)
+        """
+        tasks = [
+            self._task(
+                min_games,
+                method="subsample",
+                fraction=fraction,
+                n_bootstrap=n_bootstrap,
+                batch_size=n_bootstrap,
+            )
+            for fraction in fractions
+        ]
+        return dict(zip(fractions, self._map(tasks)))
+
 
 def analyze_uncertainty_vs_games(
-    filepath: str = "showdown_tsvs/gen1ou.tsv",
+    context: AnalysisContext,
     min_games: int = 5,
     n_bootstrap: int = 50,
 ) -> pd.DataFrame:
@@ -42,18 +204,7 @@ def analyze_uncertainty_vs_games(
         f"Fitting model with min_games={min_games}, bootstrap samples={n_bootstrap}..."
     )
 
-    h2h = HeadToHeadMatrix(filepath=filepath, min_games=min_games)
-    bt_model = BradleyTerryModel(h2h)
-
-    # Fit with bootstrap
-    results = bt_model.fit_bootstrap(
-        n_bootstrap=n_bootstrap,
-        method="resample",
-        fit_method="lbfgs",
-        min_games=0,
-        regularization=0.01,
-        verbose=False,
-    )
+    bt_model, results = context.bootstrap([min_games], n_bootstrap)[min_games]
 
     # Get rankings with uncertainty
     rankings = bt_model.get_rankings_with_uncertainty(results)
@@ -85,7 +236,7 @@ def analyze_uncertainty_vs_games(
 
 
 def test_subsampling_stability(
-    filepath: str = "showdown_tsvs/gen1ou.tsv",
+    context: AnalysisContext,
     high_threshold: int = 100,
     fractions: List[float] = [0.2, 0.4, 0.6, 0.8, 1.0],
     n_bootstrap: int = 30,
@@ -103,13 +254,15 @@ def test_subsampling_stability(
     print(f"Using players with >= {high_threshold} games")
     print(f"Testing fractions: {fractions}")
 
-    # Load with high threshold to get reliable players only
-    h2h = HeadToHeadMatrix(filepath=filepath, min_games=high_threshold)
-    bt_model = BradleyTerryModel(h2h)
+    # Players with the high threshold only (a subset of the shared parse)
+    bt_model = context.fit(high_threshold)
+    print(f"Number of players with >= {high_threshold} games: {bt_model.n_players}")
 
-    print(f"Number of players with >= {high_threshold} games: {len(h2h.players)}")
+    # Subsampled fractions run in parallel
+    subsampled = context.subsample(
+        high_threshold, [f for f in fractions if f != 1.0], n_bootstrap
+    )
 
-    # Test each fraction
     results_by_fraction = {}
 
     for fraction in fractions:
@@ -118,25 +271,14 @@ def test_subsampling_stability(
         if fraction == 1.0:
             # Full data without subsampling
             print("  Fitting on full data (no bootstrap)...")
-            bt_model.fit_logistic(
-                method="lbfgs", min_games=0, regularization=0.01, verbose=False
-            )
             rankings = bt_model.get_rankings()
             rankings["Fraction"] = fraction
             rankings["Method"] = "Full"
         else:
             # Subsample bootstrap
             print(f"  Fitting with subsampling ({fraction:.0%} of games)...")
-            boot_results = bt_model.fit_bootstrap(
-                n_bootstrap=n_bootstrap,
-                method="subsample",
-                fraction=fraction,
-                fit_method="lbfgs",
-                min_games=0,
-                regularization=0.01,
-                verbose=False,
-            )
-            rankings = bt_model.get_rankings_with_uncertainty(boot_results)
+            model, boot_results = subsampled[fraction]
+            rankings = model.get_rankings_with_uncertainty(boot_results)
             rankings["Fraction"] = fraction
             rankings["Method"] = "Subsample"
 
@@ -188,7 +330,7 @@ def test_subsampling_stability(
 
 
 def compare_thresholds(
-    filepath: str = "showdown_tsvs/gen1ou.tsv",
+    context: AnalysisContext,
     thresholds: List[int] = [5, 10, 20, 50, 100],
     n_bootstrap: int = 30,
 ) -> Dict[int, pd.DataFrame]:
@@ -203,24 +345,15 @@ def compare_thresholds(
     print("=" * 80)
     print(f"Testing thresholds: {thresholds}")
 
+    # Thresholds run in parallel, each on the shared replicates restricted
+    # to its players
+    fits = context.bootstrap(thresholds, n_bootstrap)
     results_by_threshold = {}
 
     for threshold in thresholds:
         print(f"\n--- Testing min_games = {threshold} ---")
-        h2h = HeadToHeadMatrix(filepath=filepath, min_games=threshold)
-        print(f"  Players included: {len(h2h.players)}")
-
-        bt_model = BradleyTerryModel(h2h)
-
-        # Fit with small bootstrap for uncertainty
-        boot_results = bt_model.fit_bootstrap(
-            n_bootstrap=n_bootstrap,
-            method="resample",
-            fit_method="lbfgs",
-            min_games=0,
-            regularization=0.01,
-            verbose=False,
-        )
+        bt_model, boot_results = fits[threshold]
+        print(f"  Players included: {bt_model.n_players}")
 
         rankings = bt_model.get_rankings_with_uncertainty(boot_results)
         rankings["Min_Games_Threshold"] = threshold
@@ -264,7 +397,7 @@ def compare_thresholds(
 
 
 def analyze_prediction_by_games(
-    filepath: str = "showdown_tsvs/gen1ou.tsv", min_games: int = 5
+    context: AnalysisContext, min_games: int = 5
 ) -> pd.DataFrame:
     """
     Method 4: How does prediction accuracy vary by game count?
@@ -276,14 +409,9 @@ def analyze_prediction_by_games(
     print("METHOD 4: PREDICTION ACCURACY BY GAME COUNT")
     print("=" * 80)
 
-    h2h = HeadToHeadMatrix(filepath=filepath, min_games=min_games)
-    bt_model = BradleyTerryModel(h2h)
-
-    # Fit model
-    print("Fitting model...")
-    bt_model.fit_logistic(
-        method="lbfgs", min_games=0, regularization=0.01, verbose=False
-    )
+    # Reuses the full-data fit of the shared context
+    bt_model = context.fit(min_games)
+    h2h = bt_model.h2h
 
     # Analyze prediction errors by game count
     print("\nAnalyzing prediction errors by game count...")
@@ -291,34 +419,25 @@ def analyze_prediction_by_games(
     game_bins = [0, 20, 50, 100, 200, 500, 10000]
     bin_labels = ["0-20", "20-50", "50-100", "100-200", "200-500", "500+"]
 
-    results = []
-
-    for i in range(len(h2h.players)):
-        total_games_i = np.sum(h2h.wins_matrix[i, :]) + np.sum(h2h.wins_matrix[:, i])
-
-        for j in range(len(h2h.players)):
-            if i != j:
-                total_games_ij = h2h.wins_matrix[i, j] + h2h.wins_matrix[j, i]
-
-                if total_games_ij >= 10:  # Only consider matchups with enough games
-                    wins = h2h.wins_matrix[i, j]
-                    actual_rate = wins / total_games_ij if total_games_ij > 0 else 0.5
-                    pred_prob = bt_model.predict_win_probability(i, j)
-                    error = abs(pred_prob - actual_rate)
-
-                    results.append(
-                        {
-                            "player_i": h2h.players[i]["Username"],
-                            "player_j": h2h.players[j]["Username"],
-                            "total_games_i": total_games_i,
-                            "matchup_games": total_games_ij,
-                            "actual": actual_rate,
-                            "predicted": pred_prob,
-                            "error": error,
-                        }
-                    )
-
-    df = pd.DataFrame(results)
+    # One vectorized pass over the played matchups
+    table = bt_model.matchup_predictions()
+    matchup_games = table["wins"] + table["losses"]
+    keep = matchup_games >= 10  # Only consider matchups with enough games
+    usernames = np.array(h2h.get_usernames())
+    actual = table["wins"][keep] / matchup_games[keep]
+    predicted = table["win_probability"][keep]
+
+    df = pd.DataFrame(
+        {
+            "player_i": usernames[table["i"][keep]],
+            "player_j": usernames[table["j"][keep]],
+            "total_games_i": table["player_games"][keep],
+            "matchup_games": matchup_games[keep],
+            "actual": actual,
+            "predicted": predicted,
+            "error": np.abs(predicted - actual),
+        }
+    )
     df["game_bin"] = pd.cut(df["total_games_i"], bins=game_bins, labels=bin_labels)
 
     print("\nPrediction error by player game count:")
@@ -424,6 +543,13 @@ def generate_recommendations(
 
 def main():
     """Run all analyses."""
+    parser = argparse.ArgumentParser(description="Minimum games threshold analysis")
+    parser.add_argument("--filepath", default="showdown_tsvs/gen1ou.tsv")
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    args = parser.parse_args()
+
     print("=" * 80)
     print("MINIMUM GAMES THRESHOLD ANALYSIS")
     print("=" * 80)
@@ -431,18 +557,28 @@ def main():
     print("to have a reliable Bradley-Terry ranking estimate.")
     print()
 
-    filepath = "showdown_tsvs/gen1ou.tsv"
+    start = time.perf_counter()
+    thresholds = [5, 10, 20, 50, 100]
+
+    # One parse, one full-data fit and one set of replicates for all methods
+    print("Preparing shared data (one parse, one full fit, shared replicates)...")
+    context = AnalysisContext(
+        filepath=args.filepath,
+        min_games=min(thresholds),
+        n_bootstrap=50,
+        n_jobs=args.jobs,
+    )
 
     # Method 1: Uncertainty vs games
     print("\nRunning Method 1: Direct uncertainty analysis...")
     uncertainty_df = analyze_uncertainty_vs_games(
-        filepath=filepath, min_games=5, n_bootstrap=50
+        context, min_games=5, n_bootstrap=50
     )
 
     # Method 2: Subsampling stability (user's suggestion!)
     print("\nRunning Method 2: Subsampling stability test...")
     subsample_results = test_subsampling_stability(
-        filepath=filepath,
+        context,
         high_threshold=100,
         fractions=[0.2, 0.4, 0.6, 0.8, 1.0],
         n_bootstrap=30,
@@ -451,12 +587,12 @@ def main():
     # Method 3: Compare thresholds
     print("\nRunning Method 3: Threshold comparison...")
     threshold_results = compare_thresholds(
-        filepath=filepath, thresholds=[5, 10, 20, 50, 100], n_bootstrap=30
+        context, thresholds=thresholds, n_bootstrap=30
     )
 
     # Method 4: Prediction accuracy
     print("\nRunning Method 4: Prediction accuracy by games...")
-    prediction_df = analyze_prediction_by_games(filepath=filepath, min_games=5)
+    prediction_df = analyze_prediction_by_games(context, min_games=5)
 
     # Generate recommendations
     generate_recommendations(uncertainty_df, threshold_results)
@@ -480,7 +616,7 @@ def main():
     print("✓ Saved threshold comparison to: min_games_analysis_thresholds.csv")
 
     print("\n" + "=" * 80)
-    print("ANALYSIS COMPLETE!")
+    print(f"ANALYSIS COMPLETE! ({time.perf_counter() - start:.1f}s)")
     print("=" * 80)
 
 
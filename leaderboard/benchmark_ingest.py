@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check ingest_battles.py on synthetic Showdown replays.
+
+Writes --battles replays shaped like replay.pokemonshowdown.com JSON (with a
+turn-by-turn log of about --log-bytes) to a scratch directory: mostly as
+.jsonl files, some as single .json files and raw .log files, with a fraction
+of duplicates across files, ties, forfeits, unfinished battles and usernames
+differing only in case and punctuation. The ingestor's counts are checked
+against the generator's ground truth and its throughput is reported.
+
+Usage:
+    python benchmark_ingest.py [--battles 200000] [--players 300] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ingest_battles import ingest_battles
+from leaderboard.ladder_history import h2h_key
+
+START_TIME = 1_756_684_800  # 2025-09-01 UTC
+TURN_LINES = [
+    "|move|p1a: Gholdengo|Make It Rain|p2a: Great Tusk",
+    "|-damage|p2a: Great Tusk|41/100",
+    "|-unboost|p1a: Gholdengo|spa|1",
+    "|move|p2a: Great Tusk|Headlong Rush|p1a: Gholdengo",
+    "|-supereffective|p1a: Gholdengo",
+    "|-damage|p1a: Gholdengo|12/100",
+    "|-enditem|p2a: Great Tusk|Booster Energy",
+    "|upkeep",
+]
+
+
+def battle_log(p1: str, p2: str, turns: int, ending: str, timestamp: int, size: int) -> str:
+    lines = [
+        "|j|☆" + p1,
+        "|j|☆" + p2,
+        "|t:|%d" % timestamp,
+        "|gametype|singles",
+        "|player|p1|%s|lucas|1500" % p1,
+        "|player|p2|%s|dawn|1500" % p2,
+        "|tier|[Gen 9] OU",
+        "|rated|",
+        "|start",
+    ]
+    per_turn = max(1, size // (turns * 40))
+    for turn in range(1, turns + 1):
+        lines.append("|turn|%d" % turn)
+        lines.extend(TURN_LINES[k % len(TURN_LINES)] for k in range(per_turn))
+    lines.append(ending)
+    return "\n".join(lines)
+
+
+def generate(args, out_dir: Path) -> Tuple[Dict[Tuple[str, str], list], int]:
+    """Write the synthetic replays; returns the expected records by key pair."""
+    rng = random.Random(0)
+    players = [f"PAC-Agent {k}" for k in range(args.players)]
+    expected: Dict[Tuple[str, str], list] = {}
+    replays = []
+    for k in range(args.battles):
+        p1, p2 = rng.sample(players, 2)
+        timestamp = START_TIME + rng.randrange(30 * 86400)
+        turns = rng.randint(5, 60)
+        outcome = rng.random()
+        if outcome < 0.02:
+            ending, result = "|tie", "t"
+        elif outcome < 0.04:
+            ending, result = "", None  # Unfinished
+        else:
+            winner = p1 if outcome < 0.52 else p2
+            if rng.random() < 0.1:
+                ending = "|-message|%s forfeited.\n|win|%s" % (
+                    p2 if winner == p1 else p1,
+                    winner,
+                )
+            else:
+                ending = "|win|" + winner
+            result = "w" if winner == p1 else "l"
+        # Same player, different spelling: normalized to the same key
+        shown = p1.upper() if rng.random() < 0.05 else p1
+        replays.append(
+            {
+                "id": f"gen9ou-{2_000_000 + k}",
+                "format": "[Gen 9] OU",
+                "players": [shown, p2],
+                "log": battle_log(shown, p2, turns, ending, timestamp, args.log_bytes),
+                "uploadtime": timestamp,
+                "views": rng.randrange(100),
+            }
+        )
+        if result:
+            key = (h2h_key(p1), h2h_key(p2))
+            record = expected.setdefault(key, [0, 0, 0])
+            record["wlt".index(result)] += 1
+
+    n_files = 0
+    jsonl = [replays[k :: 8] for k in range(8)]
+    singles, raw_logs = jsonl.pop(), jsonl.pop()
+    # 2% duplicates, re-uploaded into another file
+    written = [replay for batch in jsonl[1:] for replay in batch]
+    jsonl[0] = jsonl[0] + rng.sample(written, len(replays) // 50)
+    for k, batch in enumerate(jsonl):
+        with open(out_dir / f"replays_{k}.jsonl", "w") as f:
+            for replay in batch:
+                f.write(json.dumps(replay) + "\n")
+        n_files += 1
+    for replay in singles[:2000]:
+        (out_dir / f"{replay['id']}.json").write_text(json.dumps(replay))
+    for replay in raw_logs[:2000]:
+        (out_dir / f"{replay['id']}.log").write_text(replay["log"])
+    n_files += min(len(singles), 2000) + min(len(raw_logs), 2000)
+
+    # Battles of the single-file batches beyond the first 2000 are not written
+    for replay in singles[2000:] + raw_logs[2000:]:
+        _discount(expected, replay)
+    return expected, n_files
+
+
+def _discount(expected, replay) -> None:
+    log = replay["log"]
+    p1, p2 = (h2h_key(p) for p in replay["players"])
+    last = log.rsplit("\n", 1)[-1]
+    if last == "|tie":
+        expected[(p1, p2)][2] -= 1
+    elif last.startswith("|win|"):
+        winner = h2h_key(last[5:])
+        expected[(p1, p2)][0 if winner == p1 else 1] -= 1
+
+
+def _by_sorted_pair(records) -> Dict[Tuple[str, str], tuple]:
+    """(a, b, w, l, t) records summed per pair a < b, from a's side."""
+    totals: Dict[Tuple[str, str], np.ndarray] = {}
+    for a, b, w, l, t in records:
+        if a > b:
+            a, b, w, l = b, a, l, w
+        totals.setdefault((a, b), np.zeros(3, dtype=int))[:] += (w, l, t)
+    return {pair: tuple(r) for pair, r in totals.items() if r.any()}
+
+
+def check(counts, expected) -> bool:
+    """Whether the ingested counts equal the generator's records."""
+    keys = [str(k) for k in counts["keys"]]
+    got = _by_sorted_pair(
+        (keys[i], keys[j], w, l, t)
+        for i, j, w, l, t in zip(
+            counts["i"], counts["j"], counts["w"], counts["l"], counts["t"]
+        )
+    )
+    return got == _by_sorted_pair((a, b, *r) for (a, b), r in expected.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the battle log ingestor")
+    parser.add_argument("--battles", type=int, default=200_000)
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--log-bytes", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--keep", default=None, help="Write the replays here and keep them")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BATTLE LOG INGESTION BENCHMARK")
+    print("=" * 70)
+
+    out_dir = Path(args.keep or tempfile.mkdtemp(prefix="replays_"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        start = time.perf_counter()
+        expected, n_files = generate(args, out_dir)
+        size = sum(p.stat().st_size for p in out_dir.iterdir())
+        print(
+            f"✓ Generated {args.battles:,} battles in {n_files:,} files "
+            f"({size / 1e6:,.0f} MB) in {time.perf_counter() - start:.1f}s"
+        )
+
+        start = time.perf_counter()
+        counts = ingest_battles([str(out_dir)], workers=args.workers)
+        elapsed = time.perf_counter() - start
+        read = sum(int(counts[k]) for k in ("battles", "duplicates", "skipped"))
+        print(
+            f"✓ Ingested {read:,} records in {elapsed:.2f}s with "
+            f"{args.workers or os.cpu_count()} worker(s): "
+            f"{read / elapsed * 60:,.0f} records/min, {size / 1e6 / elapsed:,.0f} MB/s"
+        )
+        print(
+            f"  - {int(counts['battles']):,} battles, {int(counts['duplicates']):,} "
+            f"duplicates, {int(counts['skipped']):,} unfinished"
+        )
+    finally:
+        if not args.keep:
+            shutil.rmtree(out_dir)
+
+    if not check(counts, expected):
+        print("\n❌ Ingested counts differ from the generated battles")
+        return False
+    print("\n✅ Counts match the generated battles")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
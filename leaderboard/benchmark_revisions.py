@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Track WHR performance across git revisions (airspeed-velocity style).
+
+For every requested revision the `leaderboard/` tree is exported from git into a
+scratch directory and a fixed set of scenarios is run against it, each in its
+own subprocess so that wall time and peak memory are measured in isolation.
+All revisions are benchmarked on the same input data (the TSVs and track1.json
+of the current working tree), so differences come from code changes only.
+
+Results are stored in a local JSON database (default: .benchmarks/results.json
+at the repository root). Revisions whose time or peak memory regresses past a
+threshold relative to the previous revision are flagged, and a static HTML
+report with per-scenario trends is written next to the database.
+
+Usage:
+    python benchmark_revisions.py [--revisions REV ...] [--last N] [--report-only]
+
+Example:
+    python benchmark_revisions.py --last 10
+    python benchmark_revisions.py --revisions HEAD~5..HEAD --scenarios fit_gen1ou
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+
+LEADERBOARD_DIR = Path(__file__).resolve().parent
+REPO_ROOT = LEADERBOARD_DIR.parent
+DEFAULT_DB = REPO_ROOT / ".benchmarks" / "results.json"
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+# Each scenario has an untimed setup and a timed body. Both run inside the
+# child process with the exported revision on sys.path and the scratch data
+# directory as the working directory.
+
+
+def _setup_h2h(tsv: str, min_games: int = 10):
+    from leaderboard.whr import HeadToHeadMatrix
+
+    return HeadToHeadMatrix(filepath=tsv, min_games=min_games)
+
+
+def _setup_model(tsv: str, min_games: int = 10):
+    from leaderboard.whr import BradleyTerryModel
+
+    return BradleyTerryModel(_setup_h2h(tsv, min_games))
+
+
+def _load(tsv: str):
+    def body(_):
+        _setup_h2h(tsv)
+
+    return None, body
+
+
+def _fit(tsv: str):
+    def body(bt_model):
+        bt_model.fit_logistic(
+            method="lbfgs",
+            min_games=0,
+            regularization=0.01,
+            verbose=False,
+            normalize_matchups="sqrt",
+        )
+
+    return (lambda: _setup_model(tsv)), body
+
+
+def _bootstrap(tsv: str, n_bootstrap: int):
+    def body(bt_model):
+        bt_model.fit_bootstrap(
+            n_bootstrap=n_bootstrap,
+            method="resample",
+            fit_method="lbfgs",
+            min_games=0,
+            regularization=0.01,
+            verbose=False,
+            normalize_matchups="sqrt",
+        )
+
+    return (lambda: _setup_model(tsv)), body
+
+
+def _pipeline(min_games: int, n_bootstrap: int):
+    def setup():
+        from leaderboard import compute_whr_rankings
+
+        return compute_whr_rankings
+
+    def body(module):
+        argv = sys.argv
+        sys.argv = ["compute_whr_rankings.py", str(min_games), str(n_bootstrap)]
+        try:
+            module.main()
+        finally:
+            sys.argv = argv
+
+    return setup, body
+
+
+def _startup(code: str):
+    def body(_):
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    return None, body
+
+
+SCENARIOS = {
+    "startup_validate": lambda: _startup(
+        "import leaderboard.validate_whr_consistency"
+    ),
+    "load_gen1ou": lambda: _load("showdown_tsvs/gen1ou.tsv"),
+    "load_gen9ou": lambda: _load("showdown_tsvs/gen9ou.tsv"),
+    "fit_gen1ou": lambda: _fit("showdown_tsvs/gen1ou.tsv"),
+    "fit_gen9ou": lambda: _fit("showdown_tsvs/gen9ou.tsv"),
+    "bootstrap100_gen1ou": lambda: _bootstrap("showdown_tsvs/gen1ou.tsv", 100),
+    "pipeline_150_200": lambda: _pipeline(150, 200),
+}
+
+
+def run_scenario_in_child(name: str, tree: str, repeat: int) -> Dict:
+    """Entry point of the child process: run one scenario and measure it."""
+    sys.path[:0] = [tree, os.path.join(tree, "leaderboard")]
+    os.environ["PYTHONPATH"] = tree  # for scenarios that spawn interpreters
+    setup, body = SCENARIOS[name]()
+
+    timings = []
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        for _ in range(repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            body(state)
+            timings.append(time.perf_counter() - start)
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+
+    timings.sort()
+    return {
+        "time": timings[len(timings) // 2],
+        "time_min": timings[0],
+        "peak_mem_kb": int(peak),
+        "repeat": repeat,
+    }
+
+
+# =============================================================================
+# REVISIONS AND EXECUTION
+# =============================================================================
+
+
+def git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def resolve_revisions(revisions: Optional[List[str]], last: int) -> List[str]:
+    """Resolve revision specs to full hashes, oldest first."""
+    if not revisions:
+        return git("rev-list", "--reverse", f"--max-count={last}", "HEAD").split()
+
+    hashes = []
+    for spec in revisions:
+        if ".." in spec:
+            hashes.extend(git("rev-list", "--reverse", spec).split())
+        else:
+            hashes.append(git("rev-parse", spec))
+    return list(dict.fromkeys(hashes))
+
+
+def export_revision(sha: str, dest: Path) -> None:
+    """Export the leaderboard/ tree of a revision without touching the worktree."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", sha, "leaderboard"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+
+
+def prepare_data_dir(dest: Path) -> None:
+    """Copy the fixed benchmark inputs into a scratch working directory."""
+    shutil.copytree(LEADERBOARD_DIR / "showdown_tsvs", dest / "showdown_tsvs")
+    shutil.copy(LEADERBOARD_DIR / "track1.json", dest / "track1.json")
+
+
+def benchmark_revision(
+    sha: str, scenarios: List[str], repeat: int, timeout: int
+) -> Dict[str, Dict]:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="whr-bench-") as tmp:
+        tree = Path(tmp) / "tree"
+        tree.mkdir()
+        export_revision(sha, tree)
+
+        for name in scenarios:
+            data_dir = Path(tmp) / f"data-{name}"
+            prepare_data_dir(data_dir)
+            cmd = [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--child",
+                name,
+                "--tree",
+                str(tree),
+                "--repeat",
+                str(repeat),
+            ]
+            try:
+                proc = subprocess.run(
+                    cmd, cwd=data_dir, capture_output=True, text=True, timeout=timeout
+                )
+            except subprocess.TimeoutExpired:
+                results[name] = {"error": f"timed out after {timeout}s"}
+                print(f"  ⚠️  {name}: timed out")
+                continue
+
+            if proc.returncode != 0:
+                last_line = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+                results[name] = {"error": last_line}
+                print(f"  ⚠️  {name}: {last_line}")
+                continue
+
+            results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"  ✓ {name:<22} {results[name]['time']:>9.3f}s "
+                f"{results[name]['peak_mem_kb'] / 1024:>8.1f} MB"
+            )
+    return results
+
+
+# =============================================================================
+# DATABASE, REGRESSIONS AND REPORT
+# =============================================================================
+
+
+def load_db(path: Path) -> Dict:
+    if path.exists():
+        with open(path, "r") as f:
+            return json.load(f)
+    return {"machine": {}, "revisions": {}}
+
+
+def save_db(db: Dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(db, f, indent=2)
+    os.replace(tmp, path)
+
+
+def ordered_revisions(db: Dict) -> List[str]:
+    """Benchmarked revisions in commit order (by stored position)."""
+    return sorted(db["revisions"], key=lambda sha: db["revisions"][sha]["order"])
+
+
+def find_regressions(
+    db: Dict, time_threshold: float, mem_threshold: float
+) -> List[Dict]:
+    """
+    Compare every revision to the previous successful one, per scenario.
+
+    A revision is flagged when its time grows by more than `time_threshold`
+    (relative) or its peak memory by more than `mem_threshold`.
+    """
+    flagged = []
+    previous: Dict[str, Dict] = {}
+    for sha in ordered_revisions(db):
+        for name, result in db["revisions"][sha]["scenarios"].items():
+            if "error" in result:
+                continue
+            before = previous.get(name)
+            if before is not None:
+                for metric, threshold in (
+                    ("time", time_threshold),
+                    ("peak_mem_kb", mem_threshold),
+                ):
+                    ratio = result[metric] / max(before["result"][metric], 1e-12)
+                    if ratio > 1 + threshold:
+                        flagged.append(
+                            {
+                                "revision": sha,
+                                "baseline": before["revision"],
+                                "scenario": name,
+                                "metric": metric,
+                                "ratio": ratio,
+                            }
+                        )
+            previous[name] = {"revision": sha, "result": result}
+    return flagged
+
+
+def _svg_trend(points: List[Optional[float]], flagged: List[bool], unit: str) -> str:
+    width, height, pad = 640, 160, 30
+    values = [p for p in points if p is not None]
+    if not values:
+        return "<p>No successful runs.</p>"
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or max(hi, 1e-12)
+    step = (width - 2 * pad) / max(len(points) - 1, 1)
+
+    def xy(k, v):
+        return pad + k * step, height - pad - (v - lo) / span * (height - 2 * pad)
+
+    coords = [xy(k, v) for k, v in enumerate(points) if v is not None]
+    line = " ".join(f"{x:.1f},{y:.1f}" for x, y in coords)
+    dots = []
+    for k, v in enumerate(points):
+        if v is None:
+            continue
+        x, y = xy(k, v)
+        color = "#d62728" if flagged[k] else "#1f77b4"
+        dots.append(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}">'
+            f"<title>{v:.4g} {unit}</title></circle>"
+        )
+    return (
+        f'<svg width="{width}" height="{height}">'
+        f'<text x="2" y="14" font-size="11">{hi:.4g} {unit}</text>'
+        f'<text x="2" y="{height - 4}" font-size="11">{lo:.4g} {unit}</text>'
+        f'<polyline fill="none" stroke="#1f77b4" stroke-width="2" points="{line}"/>'
+        f"{''.join(dots)}</svg>"
+    )
+
+
+def write_report(db: Dict, regressions: List[Dict], path: Path) -> None:
+    revisions = ordered_revisions(db)
+    scenarios = sorted(
+        {name for sha in revisions for name in db["revisions"][sha]["scenarios"]}
+    )
+    flagged = {(r["revision"], r["scenario"], r["metric"]) for r in regressions}
+
+    sections = []
+    for name in scenarios:
+        rows, charts = [], []
+        for metric, unit, scale in (("time", "s", 1.0), ("peak_mem_kb", "MB", 1024.0)):
+            points = []
+            marks = []
+            for sha in revisions:
+                result = db["revisions"][sha]["scenarios"].get(name, {})
+                points.append(result[metric] / scale if metric in result else None)
+                marks.append((sha, name, metric) in flagged)
+            charts.append(f"<h4>{metric}</h4>{_svg_trend(points, marks, unit)}")
+
+        for sha in revisions:
+            info = db["revisions"][sha]
+            result = info["scenarios"].get(name)
+            if result is None:
+                continue
+            if "error" in result:
+                cells = f'<td colspan="2">error: {escape(result["error"])}</td>'
+            else:
+                cells = "".join(
+                    f'<td class="{"bad" if (sha, name, m) in flagged else ""}">{v}</td>'
+                    for m, v in (
+                        ("time", f"{result['time']:.3f} s"),
+                        ("peak_mem_kb", f"{result['peak_mem_kb'] / 1024:.1f} MB"),
+                    )
+                )
+            rows.append(
+                f"<tr><td><code>{sha[:10]}</code></td>"
+                f"<td>{escape(info['subject'])}</td>{cells}</tr>"
+            )
+
+        sections.append(
+            f"<h2>{escape(name)}</h2>{''.join(charts)}"
+            "<table><tr><th>Revision</th><th>Subject</th><th>Time</th>"
+            f"<th>Peak memory</th></tr>{''.join(rows)}</table>"
+        )
+
+    summary = "".join(
+        f"<li><code>{r['revision'][:10]}</code> {escape(r['scenario'])} "
+        f"{r['metric']} ×{r['ratio']:.2f} vs <code>{r['baseline'][:10]}</code></li>"
+        for r in regressions
+    )
+    html = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WHR benchmark history</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+td.bad {{ background: #fdd; }}
+</style></head><body>
+<h1>WHR benchmark history</h1>
+<p>Generated {datetime.now(timezone.utc).isoformat()} on {escape(db["machine"].get("node", "unknown"))}.</p>
+<h3>Flagged regressions ({len(regressions)})</h3><ul>{summary or "<li>None</li>"}</ul>
+{''.join(sections)}
+</body></html>
+"""
+    with open(path, "w") as f:
+        f.write(html)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark WHR scenarios across git revisions"
+    )
+    parser.add_argument(
+        "--revisions",
+        nargs="+",
+        help="Revisions or ranges (A..B) to benchmark (default: last N commits)",
+    )
+    parser.add_argument(
+        "--last", type=int, default=5, help="Number of recent commits (default: 5)"
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=list(SCENARIOS),
+        choices=list(SCENARIOS),
+        help="Scenarios to run (default: all)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per scenario (default: 3)"
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=1800, help="Per-scenario timeout in seconds"
+    )
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown that flags a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--mem-threshold",
+        type=float,
+        default=0.1,
+        help="Relative peak memory growth that flags a regression (default: 0.1)",
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument(
+        "--force", action="store_true", help="Re-run revisions already in the database"
+    )
+    parser.add_argument(
+        "--report-only", action="store_true", help="Only rebuild the HTML report"
+    )
+    # Internal: executed in the per-scenario child process
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--tree", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario_in_child(args.child, args.tree, args.repeat)))
+        return
+
+    db = load_db(args.db)
+    db["machine"] = {
+        "node": platform.node(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    if not args.report_only:
+        revisions = resolve_revisions(args.revisions, args.last)
+        print("=" * 70)
+        print("WHR BENCHMARK HISTORY")
+        print("=" * 70)
+        print(f"Revisions: {len(revisions)}")
+        print(f"Scenarios: {', '.join(args.scenarios)}")
+        print(f"Database: {args.db}")
+
+        for sha in revisions:
+            entry = db["revisions"].get(sha)
+            todo = [
+                s
+                for s in args.scenarios
+                if args.force or entry is None or s not in entry["scenarios"]
+            ]
+            subject = git("log", "-1", "--format=%s", sha)
+            print(f"\n{sha[:10]} {subject}")
+            if not todo:
+                print("  (already benchmarked)")
+                continue
+
+            results = benchmark_revision(sha, todo, args.repeat, args.timeout)
+            entry = entry or {"scenarios": {}}
+            entry.update(
+                {
+                    "subject": subject,
+                    "order": int(git("rev-list", "--count", sha)),
+                    "date": git("log", "-1", "--format=%cI", sha),
+                }
+            )
+            entry["scenarios"].update(results)
+            db["revisions"][sha] = entry
+            save_db(db, args.db)
+
+    regressions = find_regressions(db, args.time_threshold, args.mem_threshold)
+    report_path = args.db.with_name("report.html")
+    write_report(db, regressions, report_path)
+    save_db(db, args.db)
+
+    print("\n" + "=" * 70)
+    if regressions:
+        print(f"⚠️  {len(regressions)} regression(s) flagged:")
+        for r in regressions:
+            print(
+                f"  {r['revision'][:10]} {r['scenario']:<22} {r['metric']:<12} "
+                f"×{r['ratio']:.2f} vs {r['baseline'][:10]}"
+            )
+    else:
+        print("✅ No regressions flagged")
+    print(f"Report: {report_path}")
+
+    if regressions and not args.report_only:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Check fetch_ladders.py against the stand-in ladder server.
+
+Serves a copy of showdown_tsvs/ with ladder_server.py (with --latency added
+to every response) and fetches it into a scratch directory, checking that:
+
+- the first refresh downloads every format gzip-compressed and stores it as
+  <format>.tsv.gz with the server's content;
+- a second refresh gets a 304 for every format, over the same connections;
+- after one ladder changes on the server, only that ladder is downloaded;
+- a locally modified TSV is downloaded again in full;
+- refresh(load=True) parses the downloads like the TSV loader does, and
+  the stored .tsv.gz files parse like the plain TSVs;
+- plain storage, and a server storing the ladders gzip-compressed, give
+  the same content;
+- a refresh of all formats takes about one round trip, against one round
+  trip per format over a single connection.
+
+Usage:
+    python check_fetch_ladders.py [--latency MS] [--tsv-dir showdown_tsvs]
+"""
+
+import argparse
+import asyncio
+import gzip
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.fetch_ladders import LadderFetcher
+from leaderboard.ladder_files import convert_ladder, ladder_paths, read_ladder_bytes
+from leaderboard.ladder_server import StandInLadderServer
+from leaderboard.parse_tsv_ladders import parse_tsv_file
+from leaderboard.whr import HeadToHeadMatrix
+
+
+def report(ok: bool, message: str) -> bool:
+    print(f"  {'✓' if ok else '❌'} {message}")
+    return ok
+
+
+def statuses(results) -> dict:
+    return {f: r.get("status", r.get("error")) for f, r in results.items()}
+
+
+def same_ladders(left: Path, right: Path, formats) -> bool:
+    """Whether two directories hold the same decompressed ladders."""
+    return all(
+        read_ladder_bytes(left / f"{f}.tsv") == read_ladder_bytes(right / f"{f}.tsv")
+        for f in formats
+    )
+
+
+def same_matrix(h2h: HeadToHeadMatrix, expected: HeadToHeadMatrix) -> bool:
+    return (
+        h2h.get_usernames() == expected.get_usernames()
+        and np.array_equal(h2h.wins_matrix, expected.wins_matrix)
+        and np.array_equal(h2h.games_matrix, expected.games_matrix)
+    )
+
+
+async def timed_refresh(fetcher: LadderFetcher, **kwargs):
+    start = time.perf_counter()
+    results = await fetcher.refresh(**kwargs)
+    return results, time.perf_counter() - start
+
+
+async def run_checks(source_dir: Path, scratch: Path, latency: float) -> bool:
+    remote, local = scratch / "remote", scratch / "local"
+    shutil.copytree(source_dir, remote)
+    formats = sorted(p.stem for p in remote.glob("*.tsv"))
+    ok = True
+
+    async with StandInLadderServer(remote, latency=latency) as server:
+        fetcher = LadderFetcher(
+            server.base_url, local, formats=formats, connections=len(formats)
+        )
+        try:
+            results, first = await timed_refresh(fetcher)
+            ok &= report(
+                all(r.get("status") == 200 for r in results.values())
+                and same_ladders(local, remote, formats),
+                f"First refresh downloaded {len(formats)} ladders identically "
+                f"({first * 1000:.0f} ms, {statuses(results)})",
+            )
+            plain = sum((remote / f"{f}.tsv").stat().st_size for f in formats)
+            sent = sum(r.get("bytes", 0) for r in results.values())
+            stored = ladder_paths(local)
+            ok &= report(
+                all(r.get("encoding") == "gzip" for r in results.values())
+                and sorted(stored) == formats
+                and all(p.name.endswith(".tsv.gz") for p in stored.values()),
+                f"Transferred and stored gzip-compressed: {plain:,} bytes of TSV "
+                f"sent as {sent:,} ({plain / sent:.1f}x)",
+            )
+
+            opened = fetcher.pool.opened
+            results, second = await timed_refresh(fetcher)
+            ok &= report(
+                all(r.get("status") == 304 and r["bytes"] == 0 for r in results.values()),
+                f"Second refresh: every ladder unchanged (304) in {second * 1000:.0f} ms",
+            )
+            ok &= report(
+                fetcher.pool.opened == opened
+                and all(r["reused"] for r in results.values()),
+                f"Connections reused ({fetcher.pool.opened} opened, "
+                f"{server.connections} accepted by the server)",
+            )
+            # One round trip with every format in flight, well under two
+            ok &= report(
+                second < 2 * latency,
+                f"All formats refreshed in one round trip "
+                f"({second * 1000:.0f} ms for a {latency * 1000:.0f} ms latency)",
+            )
+
+            changed = formats[0]
+            with open(remote / f"{changed}.tsv", "a") as f:
+                f.write("\n")
+            results, _ = await timed_refresh(fetcher)
+            downloaded = [f for f, r in results.items() if r.get("status") == 200]
+            ok &= report(
+                downloaded == [changed] and same_ladders(local, remote, [changed]),
+                f"Only the changed ladder was downloaded ({downloaded})",
+            )
+
+            edited = formats[-1]
+            (local / f"{edited}.tsv.gz").write_bytes(gzip.compress(b"corrupted"))
+            results, _ = await timed_refresh(fetcher)
+            downloaded = [f for f, r in results.items() if r.get("status") == 200]
+            ok &= report(
+                downloaded == [edited] and same_ladders(local, remote, [edited]),
+                f"A locally modified TSV was restored ({downloaded})",
+            )
+
+            readers_agree = all(
+                same_matrix(
+                    HeadToHeadMatrix(str(local / f"{f}.tsv"), min_games=0),
+                    HeadToHeadMatrix(str(remote / f"{f}.tsv"), min_games=0),
+                )
+                and parse_tsv_file(str(local / f"{f}.tsv"), verbose=False)
+                == parse_tsv_file(str(remote / f"{f}.tsv"), verbose=False)
+                for f in formats
+            )
+            ok &= report(
+                readers_agree,
+                "HeadToHeadMatrix and parse_tsv_file read the .tsv.gz files like the TSVs",
+            )
+        finally:
+            fetcher.close()
+
+        fresh = LadderFetcher(
+            server.base_url, scratch / "loaded", formats=formats, connections=len(formats)
+        )
+        try:
+            results, _ = await timed_refresh(fresh, load=True)
+        finally:
+            fresh.close()
+        same = True
+        for format_name, result in results.items():
+            expected = HeadToHeadMatrix(str(remote / f"{format_name}.tsv"), min_games=0)
+            h2h = result.get("matrix")
+            same &= h2h is not None and same_matrix(h2h, expected)
+        ok &= report(same, "refresh(load=True) matrices equal the TSV loader's")
+
+        unpacked = LadderFetcher(
+            server.base_url, scratch / "plain", formats=formats, storage="none"
+        )
+        try:
+            await unpacked.refresh()
+        finally:
+            unpacked.close()
+        ok &= report(
+            same_ladders(scratch / "plain", remote, formats)
+            and all(p.suffix == ".tsv" for p in ladder_paths(scratch / "plain").values()),
+            "--storage none decompresses the gzip responses",
+        )
+
+        # The server now stores the ladders compressed and sends them as stored
+        for path in ladder_paths(remote).values():
+            convert_ladder(path, "gzip")
+        passthrough = LadderFetcher(
+            server.base_url, scratch / "passthrough", formats=formats
+        )
+        try:
+            results = await passthrough.refresh()
+        finally:
+            passthrough.close()
+        ok &= report(
+            same_ladders(scratch / "passthrough", remote, formats)
+            and all(
+                (scratch / "passthrough" / f"{f}.tsv.gz").read_bytes()
+                == (remote / f"{f}.tsv.gz").read_bytes()
+                for f in formats
+            ),
+            "Ladders stored compressed on the server are stored as received",
+        )
+
+        sequential = LadderFetcher(
+            server.base_url, scratch / "sequential", formats=formats, connections=1
+        )
+        try:
+            _, serial = await timed_refresh(sequential)
+        finally:
+            sequential.close()
+        print(
+            f"  - Over one connection the first refresh takes {serial * 1000:.0f} ms "
+            f"against {first * 1000:.0f} ms concurrently"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the ladder fetcher against a local stand-in server"
+    )
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=50.0,
+        help="Milliseconds the stand-in server adds to every response",
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LADDER FETCH CHECK")
+    print("=" * 70)
+    if not list(Path(args.tsv_dir).glob("*.tsv")):
+        print(f"❌ No TSV in {args.tsv_dir}")
+        return False
+
+    scratch = Path(tempfile.mkdtemp(prefix="fetch_ladders_"))
+    try:
+        ok = asyncio.run(run_checks(Path(args.tsv_dir), scratch, args.latency / 1000))
+    finally:
+        shutil.rmtree(scratch)
+
+    print()
+    if not ok:
+        print("❌ Fetch check failed")
+        return False
+    print("✅ Fetcher checks passed")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Guard the startup time of lightweight leaderboard commands.
+
+Each probe is run in a fresh interpreter several times. A probe fails if it
+imports any heavy dependency (numpy, pandas, scipy) or if its median wall time
+exceeds the bare interpreter startup by more than the budget.
+
+Usage:
+    python check_startup_time.py [--budget-ms MS] [--runs N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["numpy", "pandas", "scipy"]
+
+# name -> Python code run with the repository root on sys.path
+PROBES = {
+    "import leaderboard": "import leaderboard",
+    "import bt": "import bt",
+    "import compute_whr_rankings": "import leaderboard.compute_whr_rankings",
+    "import validate_whr_consistency": "import leaderboard.validate_whr_consistency",
+    "import parse_tsv_ladders": "import leaderboard.parse_tsv_ladders",
+    "run_bt_analysis help": (
+        "import sys, runpy, contextlib, io\n"
+        "sys.argv = ['run_bt_analysis.py', 'help']\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    runpy.run_path('leaderboard/run_bt_analysis.py', run_name='__main__')"
+    ),
+}
+
+_REPORT_HEAVY = (
+    "\nimport json as _json, sys as _sys\n"
+    f"print(_json.dumps([m for m in {HEAVY_MODULES!r} if m in _sys.modules]))"
+)
+
+
+def time_code(code: str, runs: int):
+    """Median wall time (seconds) of running `code` in a fresh interpreter."""
+    timings = []
+    output = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+        output = proc.stdout
+    return statistics.median(timings), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check command startup time")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="Allowed overhead over bare interpreter startup (default: 50 ms)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=7, help="Runs per probe (default: 7)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("STARTUP TIME CHECK")
+    print("=" * 70)
+
+    baseline, _ = time_code("pass", args.runs)
+    print(f"Bare interpreter: {baseline * 1000:.1f} ms")
+    print(f"Budget: +{args.budget_ms:.0f} ms, no {', '.join(HEAVY_MODULES)}\n")
+
+    failures = 0
+    for name, code in PROBES.items():
+        elapsed, output = time_code(code + _REPORT_HEAVY, args.runs)
+        heavy = json.loads(output.strip().splitlines()[-1])
+        overhead_ms = (elapsed - baseline) * 1000
+        ok = not heavy and overhead_ms <= args.budget_ms
+        failures += not ok
+        status = "✓" if ok else "❌"
+        note = f"  imports {', '.join(heavy)}" if heavy else ""
+        print(
+            f"  {status} {name:<34} {elapsed * 1000:>7.1f} ms "
+            f"(+{overhead_ms:.1f}){note}"
+        )
+
+    print()
+    if failures:
+        print(f"❌ {failures} probe(s) over budget")
+        return False
+    print("✅ All probes within budget")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Check the Whole History Rating adapters against a direct MAP fit.
+
+Simulates a ladder whose players' skills drift as a random walk, with one day
+of games between snapshots, and checks that:
+
+- LadderHistory.whole_history_rating, fed by the cumulative ladder ingested
+  after every day, recovers every day's games from the snapshot intervals;
+- add_matchup_counts, fed the same games as battle-log matchup counts (one
+  bucket per day, written with write_matchup_counts), gives the same ratings;
+- both agree with a direct L-BFGS maximization of the WHR log-posterior over
+  every player-period at once.
+
+Also reports how far the current WHR ratings and a static fit of all games
+are from the final simulated skills.
+
+Usage:
+    python check_whole_history_rating.py [--players 30] [--days 20] [--w2 30]
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from scipy.optimize import minimize
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ingest_battles import write_matchup_counts
+from leaderboard.ladder_history import LadderHistory, h2h_key
+from leaderboard.whole_history_rating import LN10, WholeHistoryRating
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TIE_RATE = 0.02
+MAP_TOLERANCE = 1e-3  # Natural-log units (0.17 Elo)
+
+
+def report(ok: bool, message: str) -> bool:
+    print(f"  {'✓' if ok else '❌'} {message}")
+    return ok
+
+
+def simulate(n_players: int, n_days: int, w2: float, seed: int):
+    """
+    Games of a ladder with drifting skills.
+
+    Returns:
+        (usernames, games, final skills): games is a list of (day, i, j,
+        wins of i, wins of j, ties) with i < j
+    """
+    rng = np.random.default_rng(seed)
+    usernames = [f"PAC-Sim-{k:02d}" for k in range(n_players)]
+    skills = rng.normal(0, 1, n_players)
+    drift = np.sqrt(w2) * LN10 / 400
+    games = []
+    for day in range(n_days):
+        skills = skills + rng.normal(0, drift, n_players)
+        for i in range(n_players):
+            for j in range(i + 1, n_players):
+                if rng.random() > 0.3:
+                    continue
+                played = 1 + rng.poisson(8)
+                ties = rng.binomial(played, TIE_RATE)
+                p = 1 / (1 + np.exp(skills[j] - skills[i]))
+                wins = rng.binomial(played - ties, p)
+                games.append((day, i, j, wins, played - ties - wins, ties))
+    return usernames, games, skills
+
+
+def write_ladder(path: Path, usernames, records) -> None:
+    """Write a cumulative ladder TSV (records[i][j] = [w, l, t] of i vs j)."""
+    lines = ["Username\tElo\tGlicko\tRating_Deviation\tH2H_Data"]
+    for i, username in enumerate(usernames):
+        h2h = {
+            h2h_key(usernames[j]): {"w": w, "l": l, "t": t}
+            for j, (w, l, t) in sorted(records[i].items())
+        }
+        lines.append(f"{username}\t1500\t1500\t50\t{json.dumps(h2h)}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def build_history(db_path: Path, tsv_path: Path, usernames, games, n_days: int):
+    """Ingest the cumulative ladder after every simulated day."""
+    records = [dict() for _ in usernames]
+    history = LadderHistory(str(db_path))
+    for day in range(n_days):
+        for d, i, j, w, l, t in games:
+            if d != day:
+                continue
+            for a, b, wins, losses in ((i, j, w, l), (j, i, l, w)):
+                total = records[a].setdefault(b, [0, 0, 0])
+                total[0] += wins
+                total[1] += losses
+                total[2] += t
+        write_ladder(tsv_path, usernames, records)
+        taken_at = (START + timedelta(days=day + 1)).isoformat()
+        history.ingest("gen9ou", tsv_path, taken_at=taken_at)
+    return history
+
+
+def matchup_counts(usernames, games):
+    """The simulated games as ingest_battles.py matchup counts, daily buckets."""
+    day, i, j, w, l, t = (np.array(column) for column in zip(*games))
+    zeros = np.zeros(len(games), dtype=np.int64)
+    return {
+        "usernames": np.array(usernames, dtype=str),
+        "keys": np.array([h2h_key(u) for u in usernames], dtype=str),
+        "i": i,
+        "j": j,
+        "time": int(START.timestamp()) + 86400 * day,
+        "w": w,
+        "l": l,
+        "t": t,
+        "turns": zeros,
+        "forfeits": zeros,
+        "bucket_seconds": np.int64(86400),
+        "battles": np.int64(int((w + l + t).sum())),
+        "duplicates": np.int64(0),
+        "skipped": np.int64(0),
+    }
+
+
+def direct_map(usernames, games, w2: float, prior_elo_std: float = 400.0):
+    """
+    Maximize the WHR log-posterior over all player-periods with L-BFGS.
+
+    Returns:
+        Dict username -> (days played, ratings on the natural-log scale)
+    """
+    to_natural = LN10 / 400
+    w2, prior_var = w2 * to_natural**2, (prior_elo_std * to_natural) ** 2
+
+    days = {u: set() for u in usernames}
+    for day, i, j, *_ in games:
+        days[usernames[i]].add(day)
+        days[usernames[j]].add(day)
+    days = {u: sorted(d) for u, d in days.items()}
+    offsets, index = {}, {}
+    for u in usernames:
+        offsets[u] = len(index)
+        for day in days[u]:
+            index[(u, day)] = len(index)
+    first = np.array([offsets[u] for u in usernames if days[u]])
+    chain = [
+        (index[(u, a)], index[(u, b)], b - a)
+        for u in usernames
+        for a, b in zip(days[u], days[u][1:])
+    ]
+    prev, nxt, gap = (np.array(c) for c in zip(*chain)) if chain else ([], [], [])
+    row = np.array([index[(usernames[g[1]], g[0])] for g in games])
+    col = np.array([index[(usernames[g[2]], g[0])] for g in games])
+    wins = np.array([g[3] + g[5] / 2 for g in games])
+    losses = np.array([g[4] + g[5] / 2 for g in games])
+
+    def objective(r):
+        diff = r[row] - r[col]
+        log_p, log_q = -np.logaddexp(0, -diff), -np.logaddexp(0, diff)
+        p = np.exp(log_p)
+        step = (r[nxt] - r[prev]) / (w2 * gap)
+        value = -(wins @ log_p + losses @ log_q)
+        value += (r[first] ** 2).sum() / (2 * prior_var)
+        value += ((r[nxt] - r[prev]) * step).sum() / 2
+        coef = -(wins - (wins + losses) * p)
+        grad = np.bincount(row, coef, len(r)) - np.bincount(col, coef, len(r))
+        grad[first] += r[first] / prior_var
+        grad += np.bincount(nxt, step, len(r)) - np.bincount(prev, step, len(r))
+        return value, grad
+
+    result = minimize(
+        objective,
+        np.zeros(len(index)),
+        jac=True,
+        method="L-BFGS-B",
+        options={"maxiter": 10000, "ftol": 1e-15, "gtol": 1e-10},
+    )
+    return {u: (days[u], result.x[[index[(u, d)] for d in days[u]]]) for u in usernames}
+
+
+def max_difference(whr: WholeHistoryRating, expected, day_of) -> float:
+    """Largest rating difference over all player-periods (natural-log scale)."""
+    worst = 0.0
+    for username, (days, ratings) in expected.items():
+        if not days:
+            continue
+        history = whr.get_history(username)
+        if [day_of(t) for t in history["time"]] != days:
+            return np.inf
+        worst = max(worst, float(np.max(np.abs(history["rating"] - ratings))))
+    return worst
+
+
+def rms_error(ratings, usernames, skills) -> float:
+    """RMS distance to the true skills in Elo, both centered."""
+    fitted = np.array([ratings[u]["whr_elo"] for u in usernames])
+    truth = 400 * skills / LN10
+    return float(np.sqrt(np.mean(((fitted - fitted.mean()) - (truth - truth.mean())) ** 2)))
+
+
+def run_checks(scratch: Path, args) -> bool:
+    usernames, games, skills = simulate(args.players, args.days, args.w2, args.seed)
+    print(
+        f"Simulated {sum(g[3] + g[4] + g[5] for g in games):,} games between "
+        f"{args.players} players over {args.days} days (w2 = {args.w2:g} Elo²/day)"
+    )
+    ok = True
+
+    history = build_history(
+        scratch / "history.db", scratch / "gen9ou.tsv", usernames, games, args.days
+    )
+    try:
+        from_history = history.whole_history_rating("gen9ou", w2=args.w2)
+        played = history.interval_games("gen9ou")
+    finally:
+        history.close()
+    start_day = START.timestamp() / 86400
+    # Intervals are dated at the snapshot closing them, buckets at their middle
+    history_day = lambda t: round(t - start_day) - 1  # noqa: E731
+    bucket_day = lambda t: round(t - start_day - 0.5)  # noqa: E731
+
+    simulated = {
+        (d, usernames[i], h2h_key(usernames[j])): (w, l, t) for d, i, j, w, l, t in games
+    }
+    recovered = {}
+    for row in played.itertuples():
+        if h2h_key(row.player) < row.opponent:
+            day = (datetime.fromisoformat(row.taken_at) - START).days - 1
+            recovered[(day, row.player, row.opponent)] = (row.wins, row.losses, row.ties)
+    ok &= report(
+        recovered == simulated,
+        f"Snapshot intervals recover the {len(simulated):,} daily matchups",
+    )
+
+    counts_path = scratch / "battles.npz"
+    write_matchup_counts(matchup_counts(usernames, games), counts_path)
+    from_counts = WholeHistoryRating(w2=args.w2)
+    from_counts.add_matchup_counts(counts_path)
+
+    sweeps = [whr.fit(max_iter=1000, tol=1e-10) for whr in (from_history, from_counts)]
+    expected = direct_map(usernames, games, args.w2)
+    history_error = max_difference(from_history, expected, history_day)
+    counts_error = max_difference(from_counts, expected, bucket_day)
+    periods = sum(len(days) for days, _ in expected.values())
+    ok &= report(
+        history_error < MAP_TOLERANCE,
+        f"Ladder history WHR matches the direct MAP fit over {periods} "
+        f"player-periods (max |Δr| = {history_error:.1e}, {sweeps[0]} sweeps)",
+    )
+    ok &= report(
+        counts_error < MAP_TOLERANCE,
+        f"Matchup-count WHR matches the direct MAP fit "
+        f"(max |Δr| = {counts_error:.1e}, {sweeps[1]} sweeps)",
+    )
+
+    # All games in one bucket: a static Bradley-Terry fit with the same prior
+    static = WholeHistoryRating(w2=args.w2)
+    counts = matchup_counts(usernames, games)
+    static.add_matchup_counts({**counts, "time": np.zeros_like(counts["time"])})
+    static.fit(max_iter=1000, tol=1e-10)
+    current = rms_error(from_history.get_current_ratings(), usernames, skills)
+    fixed = rms_error(static.get_current_ratings(), usernames, skills)
+    print(
+        f"  - Distance to the final skills: {current:.0f} Elo for the current "
+        f"WHR ratings, {fixed:.0f} Elo for one static fit of all games"
+    )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the Whole History Rating adapters against a direct MAP fit"
+    )
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--w2", type=float, default=30.0, help="Elo² per day")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("WHOLE HISTORY RATING CHECK")
+    print("=" * 70)
+
+    scratch = Path(tempfile.mkdtemp(prefix="whole_history_rating_"))
+    try:
+        ok = run_checks(scratch, args)
+    finally:
+        shutil.rmtree(scratch)
+
+    print()
+    if not ok:
+        print("❌ Whole History Rating check failed")
+        return False
+    print("✅ Whole History Rating checks passed")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
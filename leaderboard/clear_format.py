@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 import json
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard.shard_track1 import write_leaderboard
+
 if len(sys.argv) < 2:
     print("Usage: python3 clear_format.py gen1ou|gen9ou|both")
     sys.exit(1)
@@ -25,5 +30,5 @@ else:
     print("Invalid format. Use: gen1ou, gen9ou, or both")
     sys.exit(1)
 
-with open('track1_qualifying.json', 'w') as f:
-    json.dump(data, f, indent=2)
+# The page loads the track1_qualifying/ shards, so they are rewritten too
+write_leaderboard(data, 'track1_qualifying.json', indent=2)
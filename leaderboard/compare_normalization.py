@@ -10,8 +10,13 @@ The sqrt method balances informativeness (high-volume matchups provide signal)
 with preventing domination (prevents a few high-volume matchups from overwhelming
 the model).
 
+It then sweeps the power normalization (weight = total games ** α), which
+runs from equal weight (α = 0) through sqrt (α = 0.5) to all games (α = 1).
+Matchup weights are smooth in α, so each fit is warm-started from the previous
+one and a fine sweep costs a few fits.
+
 Usage:
-    python compare_normalization.py [--min-games MIN_GAMES] [--n-bootstrap N]
+    python compare_normalization.py [--min-games MIN_GAMES] [--n-bootstrap N] [--powers A ...]
     
 Example:
     python compare_normalization.py --min-games 100 --n-bootstrap 50
@@ -27,11 +32,66 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
 
 
+def sweep_matchup_power(
+    h2h: HeadToHeadMatrix,
+    powers,
+    regularization: float = 0.01,
+) -> pd.DataFrame:
+    """
+    Fit the power normalization over a grid of exponents α.
+
+    Fits run from the largest α down, each warm-started from the previous
+    one. Rankings are compared with those of the largest α (all games when
+    the grid includes 1).
+
+    Args:
+        h2h: HeadToHeadMatrix to fit
+        powers: Exponents α of weight = total games ** α
+        regularization: L2 regularization parameter
+
+    Returns:
+        DataFrame with one row per α: rank correlation with the reference,
+        Elo spread, top player and optimizer iterations
+    """
+    model = BradleyTerryModel(h2h)
+    usernames = np.array(h2h.get_usernames())
+    rows = []
+    x_prev = None
+    reference = None
+    for alpha in sorted(powers, reverse=True):
+        model.fit_logistic(
+            method='lbfgs',
+            min_games=0,
+            regularization=regularization,
+            verbose=False,
+            normalize_matchups='power',
+            matchup_power=alpha,
+            x0=x_prev,
+        )
+        x_prev = model.params
+        ranks = pd.Series(model.log_strengths).rank(ascending=False)
+        if reference is None:
+            reference = ranks
+        elo = model.strengths_to_elo()
+        rows.append(
+            {
+                'Power': alpha,
+                'Rank_Corr': ranks.corr(reference, method='spearman'),
+                'Mean_Rank_Change': float(np.abs(ranks - reference).mean()),
+                'Elo_Spread': float(elo.max() - elo.min()),
+                'Top_Player': usernames[np.argmax(model.log_strengths)],
+                'Iterations': model.fit_info['iterations'],
+            }
+        )
+    return pd.DataFrame(rows)
+
+
 def compare_normalization_methods(
     filepath: str = 'showdown_tsvs/gen1ou.tsv',
     min_games: int = 100,
     n_bootstrap: int = 0,
     regularization: float = 0.01,
+    powers=(0.0, 0.25, 0.5, 0.75, 1.0),
 ):
     """
     Compare BT model with and without normalization.
@@ -41,6 +101,7 @@ def compare_normalization_methods(
         min_games: Minimum games for player inclusion
         n_bootstrap: Number of bootstrap samples (0 to skip)
         regularization: L2 regularization parameter
+        powers: Exponents α of the power normalization sweep (empty to skip)
     """
     print("=" * 80)
     print("NORMALIZATION COMPARISON")
@@ -194,6 +255,14 @@ def compare_normalization_methods(
         print("\nPlayers with largest uncertainty DECREASE from sqrt:")
         print(unc_compare.nsmallest(5, 'Std_Diff')[['Username', 'Std_NoNorm', 'Std_Sqrt', 'Std_Diff']].to_string(index=False))
     
+    if len(powers) > 0:
+        print("\n" + "=" * 80)
+        print("POWER NORMALIZATION SWEEP (weight = total games ** α)")
+        print("=" * 80)
+        sweep = sweep_matchup_power(h2h, powers, regularization=regularization)
+        print(f"\nRanks compared with α = {sweep['Power'].iloc[0]:g}:")
+        print(sweep.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
     print("\n" + "=" * 80)
     print("CONCLUSION")
     print("=" * 80)
@@ -225,6 +294,13 @@ if __name__ == "__main__":
         default=0.01,
         help='L2 regularization parameter (default: 0.01)'
     )
+    parser.add_argument(
+        '--powers',
+        type=float,
+        nargs='*',
+        default=[0.0, 0.25, 0.5, 0.75, 1.0],
+        help='Exponents α of the power normalization sweep (none to skip)'
+    )
     parser.add_argument(
         '--filepath',
         type=str,
@@ -239,4 +315,5 @@ if __name__ == "__main__":
         min_games=args.min_games,
         n_bootstrap=args.n_bootstrap,
         regularization=args.regularization,
+        powers=args.powers,
     )
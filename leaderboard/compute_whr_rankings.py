@@ -1,22 +1,114 @@
 #!/usr/bin/env python3
 """
 Compute Whole History Rating (WHR) using Bradley-Terry model with bootstrap.
-Updates track1.json with BT Elo ratings and uncertainty estimates.
+Updates track1.json with BT Elo ratings and uncertainty estimates, and writes
+its per-format shards (track1/index.json, track1/<format>.json) and the delta
+from the previous version (track1/deltas/<N>_to_<N+1>.json).
 
 Uses sqrt normalization by default: weights matchup contributions by the square root
 of total games played, balancing informativeness with preventing high-volume matchups
 from dominating the model.
+
+Tied games are modelled with the Davidson tie extension of Bradley-Terry; the
+fitted tie parameter of each format is recorded in the track1.json metadata.
+
+Each connected component of the comparison graph is fit on its own; players
+outside the largest component are marked with whr_comparable = false.
 """
 
+import copy
 import json
 import sys
 from pathlib import Path
-from whr import HeadToHeadMatrix, BradleyTerryModel
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import resolve_ladder
+from leaderboard.shard_track1 import shard_dir, write_leaderboard
+from leaderboard.track1_delta import diff_track1, document_version, write_delta
+
+# Formats rated with WHR, and their ladder TSVs
+WHR_FORMATS = {
+    "gen1ou": "showdown_tsvs/gen1ou.tsv",
+    "gen2ou": "showdown_tsvs/gen2ou.tsv",
+    "gen3ou": "showdown_tsvs/gen3ou.tsv",
+    "gen9ou": "showdown_tsvs/gen9ou.tsv",
+}
+
+
+def rankings_to_whr_data(rankings, min_games: int, component_report=None) -> dict:
+    """
+    Convert a rankings DataFrame (get_rankings_with_elo_uncertainty) into the
+    username -> WHR data mapping stored in track1.json.
+
+    With a component_report (BradleyTerryModel.component_report), each entry
+    also records its comparison-graph component and whether its rating is
+    comparable with the rest of the ladder.
+    """
+    # Whole columns to Python scalars at once, then one dict per player
+    columns = {
+        "bt_strength": rankings["BT_Strength"].to_numpy(dtype=float).tolist(),
+        "bt_std": rankings["BT_Std"].to_numpy(dtype=float).tolist(),
+        "whr_elo": rankings["BT_Elo"].to_numpy(dtype=float).tolist(),
+        "whr_std": rankings["Elo_Std"].to_numpy(dtype=float).tolist(),
+        "whr_ci_lower": rankings["Elo_CI_Lower"].to_numpy(dtype=float).tolist(),
+        "whr_ci_upper": rankings["Elo_CI_Upper"].to_numpy(dtype=float).tolist(),
+        "whr_rank": rankings["Rank"].to_numpy(dtype=int).tolist(),
+        "games_played": (rankings["Total_Wins"] + rankings["Total_Losses"])
+        .to_numpy(dtype=int)
+        .tolist(),
+    }
+    if component_report is not None:
+        report = component_report.set_index("Username").reindex(rankings["Username"])
+        present = report["Component"].notna().to_numpy()
+        components = report["Component"].to_numpy()
+        comparable = report["Comparable"].to_numpy()
+
+    names = list(columns)
+    whr_data = {}
+    for k, (username, *values) in enumerate(
+        zip(rankings["Username"].tolist(), *columns.values())
+    ):
+        entry = dict(zip(names, values))
+        entry["min_games_threshold"] = min_games
+        if component_report is not None and present[k]:
+            entry["whr_component"] = int(components[k])
+            entry["whr_comparable"] = bool(comparable[k])
+        whr_data[username] = entry
+
+    print(f"✓ Computed WHR for {len(whr_data)} players")
+    print(
+        f"  WHR range: [{rankings['BT_Elo'].min():.1f}, {rankings['BT_Elo'].max():.1f}]"
+    )
+    print(f"  Mean uncertainty: {rankings['Elo_Std'].mean():.1f} Elo points")
+
+    return whr_data
+
+
+def tie_summary(ties: str, tie_parameter: float, tie_samples) -> dict:
+    """Format-level tie parameter with its 95% bootstrap interval."""
+    import numpy as np
+
+    lower, upper = np.percentile(tie_samples, [2.5, 97.5])
+    print(f"  Tie parameter ({ties}): {tie_parameter:.4f} [{lower:.4f}, {upper:.4f}]")
+    return {
+        "tie_model": ties,
+        "tie_parameter": tie_parameter,
+        "tie_parameter_ci": [float(lower), float(upper)],
+    }
 
 
 def compute_whr_for_format(
-    tsv_path: str, format_name: str, min_games: int, n_bootstrap: int = 100
+    tsv_path: str,
+    format_name: str,
+    min_games: int,
+    n_bootstrap: int = 100,
+    ties: str = "davidson",
+    summary: dict = None,
+    regularization: float = 0.01,
+    normalize_matchups: str = "sqrt",
+    warm_start: dict = None,
+    h2h=None,
 ):
     """
     Compute WHR (BT Elo) ratings for a specific format.
@@ -26,6 +118,17 @@ def compute_whr_for_format(
         format_name: Format name (e.g., 'gen1ou')
         min_games: Minimum games required for WHR rating
         n_bootstrap: Number of bootstrap samples
+        ties: Tie model passed to the fitter (None, 'davidson', 'rao-kupper')
+        summary: Optional dict filled with format-level fit results
+            (tie model and fitted tie parameter with its bootstrap interval)
+        regularization: L2 regularization of the fit
+        normalize_matchups: Matchup weighting (see BradleyTerryModel.fit_logistic);
+            cross_validate.py recommends both per format
+        warm_start: Optional dict with the 'usernames' and 'params' of a
+            previous fit of the format, used as starting point of every fit
+            and replaced by this fit's (e.g. kept across runs by watch mode)
+        h2h: Optional HeadToHeadMatrix of tsv_path already loaded with a lower
+            min_games; it is subset instead of parsing the file again
 
     Returns:
         Dictionary mapping username to WHR data, or None if insufficient data
@@ -37,9 +140,15 @@ def compute_whr_for_format(
     print(f"Minimum games: {min_games}")
     print(f"Bootstrap samples: {n_bootstrap}")
 
+    # Imported here so that JSON-only callers (update_track1_json) stay cheap
+    from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
+
     try:
         # Load data with min_games filter
-        h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=min_games)
+        if h2h is not None:
+            h2h = h2h.subset(min_games)
+        else:
+            h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=min_games)
 
         if len(h2h.players) < 3:
             print(
@@ -50,20 +159,56 @@ def compute_whr_for_format(
         print(f"✓ Loaded {len(h2h.players)} players with >= {min_games} games")
 
         # Fit Bradley-Terry model with bootstrap
-        print("Fitting Bradley-Terry model with bootstrap (sqrt normalization)...")
+        print(
+            f"Fitting Bradley-Terry model with bootstrap "
+            f"({normalize_matchups} normalization, regularization={regularization})..."
+        )
         bt_model = BradleyTerryModel(h2h)
+        x0 = None
+        if warm_start:
+            x0 = bt_model.warm_start_params(
+                warm_start["usernames"], warm_start["params"]
+            )
 
         bootstrap_results = bt_model.fit_bootstrap(
             n_bootstrap=n_bootstrap,
             method="resample",
             fit_method="lbfgs",
             min_games=0,  # Already filtered in HeadToHeadMatrix
-            regularization=0.01,
+            regularization=regularization,
             verbose=False,
-            normalize_matchups="sqrt",  # Use sqrt normalization by default
+            normalize_matchups=normalize_matchups,
+            ties=ties,
+            decompose=True,  # Fit each connected component on its own
+            x0=x0,
         )
 
         print("✓ Model fitted successfully")
+        if warm_start is not None:
+            warm_start["usernames"] = h2h.get_usernames()
+            warm_start["params"] = bt_model.params.copy()
+        if summary is not None:
+            summary["regularization"] = regularization
+            summary["normalize_matchups"] = normalize_matchups
+        component_report = bt_model.component_report()
+        n_components = component_report["Component"].nunique()
+        if n_components > 1:
+            print(
+                f"⚠️  Comparison graph has {n_components} components; "
+                f"{(~component_report['Comparable']).sum()} players are only "
+                f"comparable within their component"
+            )
+        if component_report["Separated"].any():
+            print(
+                f"⚠️  {component_report['Separated'].sum()} players are perfectly "
+                f"separated; their rating gaps rest on the ridge term"
+            )
+        if ties:
+            tie_info = tie_summary(
+                ties, bt_model.tie_parameter, bootstrap_results["tie_parameter_samples"]
+            )
+            if summary is not None:
+                summary.update(tie_info)
 
         # Get rankings with Elo uncertainty
         print("Converting to Elo scale with uncertainty...")
@@ -73,28 +218,7 @@ def compute_whr_for_format(
 
         print("✓ Conversion complete")
 
-        # Create username -> WHR data mapping
-        whr_data = {}
-        for _, row in rankings.iterrows():
-            whr_data[row["Username"]] = {
-                "bt_strength": float(row["BT_Strength"]),
-                "bt_std": float(row["BT_Std"]),
-                "whr_elo": float(row["BT_Elo"]),
-                "whr_std": float(row["Elo_Std"]),
-                "whr_ci_lower": float(row["Elo_CI_Lower"]),
-                "whr_ci_upper": float(row["Elo_CI_Upper"]),
-                "whr_rank": int(row["Rank"]),
-                "games_played": int(row["Total_Wins"] + row["Total_Losses"]),
-                "min_games_threshold": min_games,
-            }
-
-        print(f"✓ Computed WHR for {len(whr_data)} players")
-        print(
-            f"  WHR range: [{rankings['BT_Elo'].min():.1f}, {rankings['BT_Elo'].max():.1f}]"
-        )
-        print(f"  Mean uncertainty: {rankings['Elo_Std'].mean():.1f} Elo points")
-
-        return whr_data
+        return rankings_to_whr_data(rankings, min_games, component_report)
 
     except Exception as e:
         print(f"❌ Error computing WHR for {format_name}: {e}")
@@ -104,32 +228,115 @@ def compute_whr_for_format(
         return None
 
 
-def update_track1_json(track1_path: str, whr_data_by_format: dict, min_games: int):
+def compute_whr_joint(
+    formats: dict,
+    min_games: int,
+    n_bootstrap: int = 100,
+    ties: str = "davidson",
+    summaries_by_format: dict = None,
+):
     """
-    Update track1.json with WHR data.
+    Compute WHR ratings for all formats with the joint multi-format model.
+
+    Players in sparse formats borrow strength from the skill their agent shows
+    in the other formats (see joint_model.JointBradleyTerryModel).
 
     Args:
-        track1_path: Path to track1.json
-        whr_data_by_format: Dict mapping format name to WHR data dict
-        min_games: Minimum games threshold (for metadata)
+        formats: Dict mapping format name to TSV path
+        min_games: Minimum games required for WHR rating
+        n_bootstrap: Number of joint bootstrap samples
+        ties: Tie model (None, 'davidson', 'rao-kupper')
+        summaries_by_format: Optional dict filled with format-level fit results
+
+    Returns:
+        Dict mapping format name to username -> WHR data
     """
     print(f"\n{'='*70}")
-    print("UPDATING track1.json")
+    print("Computing joint WHR across formats")
     print(f"{'='*70}")
+    print(f"Minimum games: {min_games}")
+    print(f"Bootstrap samples: {n_bootstrap}")
 
-    # Load existing track1.json
-    try:
-        with open(track1_path, "r") as f:
-            track1_data = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ {track1_path} not found")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing {track1_path}: {e}")
-        return False
+    from leaderboard.whr import HeadToHeadMatrix
+    from leaderboard.joint_model import JointBradleyTerryModel
 
-    print(f"✓ Loaded {track1_path}")
+    h2h_by_format = {}
+    for format_name, tsv_path in formats.items():
+        if not resolve_ladder(tsv_path).exists():
+            print(f"⚠️  {tsv_path} not found, skipping {format_name}")
+            continue
+        h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=min_games)
+        if len(h2h.players) < 3:
+            print(
+                f"⚠️  Only {len(h2h.players)} players with >= {min_games} games. Skipping {format_name}."
+            )
+            continue
+        print(f"✓ {format_name}: {len(h2h.players)} players with >= {min_games} games")
+        h2h_by_format[format_name] = h2h
+
+    if not h2h_by_format:
+        return {}
+
+    joint = JointBradleyTerryModel(h2h_by_format)
+    print(
+        f"✓ {joint.n_agents} agents across {joint.n_entries} player-format entries"
+    )
+    print("Fitting joint Bradley-Terry model with bootstrap (sqrt normalization)...")
+    bootstrap_by_format = joint.fit_bootstrap(
+        n_bootstrap=n_bootstrap,
+        method="resample",
+        verbose=False,
+        regularization=0.01,
+        normalize_matchups="sqrt",
+        ties=ties,
+    )
+    print("✓ Model fitted successfully")
+
+    whr_data_by_format = {}
+    for format_name, bootstrap_results in bootstrap_by_format.items():
+        print(f"\n{format_name.upper()}")
+        model = joint.models[format_name]
+        summary = {"joint_model": True}
+        if ties:
+            summary.update(
+                tie_summary(
+                    ties,
+                    model.tie_parameter,
+                    bootstrap_results["tie_parameter_samples"],
+                )
+            )
+        rankings = model.get_rankings_with_elo_uncertainty(
+            bootstrap_results=bootstrap_results, center=1500.0, scale=400.0
+        )
+        whr_data_by_format[format_name] = rankings_to_whr_data(rankings, min_games)
+        if summaries_by_format is not None:
+            summaries_by_format[format_name] = summary
+
+    return whr_data_by_format
 
+
+def apply_whr_data(
+    track1_data: dict,
+    whr_data_by_format: dict,
+    min_games: int,
+    summaries_by_format: dict = None,
+    formats: list = None,
+):
+    """
+    Write WHR data into a parsed track1.json document, in place.
+
+    Args:
+        track1_data: Parsed track1.json document
+        whr_data_by_format: Dict mapping format name to WHR data dict
+        min_games: Minimum games threshold (for metadata)
+        summaries_by_format: Optional dict mapping format name to format-level
+            fit results (e.g. tie parameter), stored under metadata.whr_formats
+        formats: Formats to update (default: every format of the document);
+            the others keep their WHR data and fit summaries
+
+    Returns:
+        (players updated, players whose WHR data was cleared)
+    """
     # Add WHR metadata
     if "metadata" not in track1_data:
         track1_data["metadata"] = {}
@@ -139,12 +346,21 @@ def update_track1_json(track1_path: str, whr_data_by_format: dict, min_games: in
     track1_data["metadata"][
         "whr_note"
     ] = f"Whole History Rating (WHR) computed using Bradley-Terry model with bootstrap. Requires {min_games}+ games."
+    if summaries_by_format:
+        if formats is None:
+            track1_data["metadata"]["whr_formats"] = summaries_by_format
+        else:
+            track1_data["metadata"].setdefault("whr_formats", {}).update(
+                summaries_by_format
+            )
 
     # Update each format
     updates_count = 0
     clears_count = 0
 
     for format_name, format_data in track1_data.get("formats", {}).items():
+        if formats is not None and format_name not in formats:
+            continue
         whr_data = whr_data_by_format.get(format_name, {})
 
         print(f"\nUpdating {format_name}...")
@@ -174,11 +390,86 @@ def update_track1_json(track1_path: str, whr_data_by_format: dict, min_games: in
                 f"  ⚠️  No WHR data computed (insufficient players with {min_games}+ games)"
             )
 
+    return updates_count, clears_count
+
+
+def publish_track1(track1_data: dict, previous_data: dict, track1_path: str) -> dict:
+    """
+    Publish a new version of track1.json with its shards and delta.
+
+    Bumps metadata.version, then writes the delta from `previous_data`, the
+    per-format shards and track1.json itself, each file atomically (a reader
+    sees the old or the new file, never a partial one).
+
+    Args:
+        track1_data: Updated document
+        previous_data: Document as it was before the update
+        track1_path: Path to track1.json
+
+    Returns:
+        The delta (see track1_delta.diff_track1)
+    """
+    track1_data.setdefault("metadata", {})["version"] = (
+        document_version(previous_data) + 1
+    )
+    delta = diff_track1(previous_data, track1_data)
+    delta_path = write_delta(delta, shard_dir(track1_path) / "deltas")
+    shard_sizes = write_leaderboard(track1_data, track1_path, indent=2)
+
+    print(f"\n✓ Successfully updated {track1_path}")
+    print(
+        f"  - Wrote {len(shard_sizes) - 1} format shard(s) and index to "
+        f"{shard_dir(track1_path)}/"
+    )
+    n_changed = sum(len(d["whr"]) for d in delta["formats"].values())
+    print(
+        f"  - Version {delta['to_version']}: {n_changed} player(s) changed, "
+        f"delta in {delta_path}"
+    )
+    return delta
+
+
+def update_track1_json(
+    track1_path: str,
+    whr_data_by_format: dict,
+    min_games: int,
+    summaries_by_format: dict = None,
+):
+    """
+    Update track1.json with WHR data.
+
+    Args:
+        track1_path: Path to track1.json
+        whr_data_by_format: Dict mapping format name to WHR data dict
+        min_games: Minimum games threshold (for metadata)
+        summaries_by_format: Optional dict mapping format name to format-level
+            fit results (e.g. tie parameter), stored under metadata.whr_formats
+    """
+    print(f"\n{'='*70}")
+    print("UPDATING track1.json")
+    print(f"{'='*70}")
+
+    # Load existing track1.json
+    try:
+        with open(track1_path, "r") as f:
+            track1_data = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ {track1_path} not found")
+        return False
+    except json.JSONDecodeError as e:
+        print(f"❌ Error parsing {track1_path}: {e}")
+        return False
+
+    print(f"✓ Loaded {track1_path}")
+    previous_data = copy.deepcopy(track1_data)
+
+    updates_count, clears_count = apply_whr_data(
+        track1_data, whr_data_by_format, min_games, summaries_by_format
+    )
+
     # Save updated track1.json
     try:
-        with open(track1_path, "w") as f:
-            json.dump(track1_data, f, indent=2)
-        print(f"\n✓ Successfully updated {track1_path}")
+        publish_track1(track1_data, previous_data, track1_path)
         print(f"  - Added/updated WHR for {updates_count} player entries")
         if clears_count > 0:
             print(f"  - Cleared WHR for {clears_count} players (insufficient games)")
@@ -191,46 +482,79 @@ def update_track1_json(track1_path: str, whr_data_by_format: dict, min_games: in
 def main():
     """Main function."""
     # Parse command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python3 compute_whr_rankings.py <min_games> [n_bootstrap]")
+    args = sys.argv[1:]
+    joint = "--joint" in args
+    if joint:
+        args.remove("--joint")
+    settings = {}
+    if "--settings" in args:
+        # Per-format settings recommended by cross_validate.py
+        idx = args.index("--settings")
+        with open(args[idx + 1]) as f:
+            settings = json.load(f)
+        del args[idx : idx + 2]
+    if joint and settings:
+        # The joint model is fitted once across formats with its own weighting
+        print("❌ --settings applies to per-format fits and cannot be used with --joint")
+        sys.exit(1)
+    if len(args) < 1:
+        print(
+            "Usage: python3 compute_whr_rankings.py <min_games> [n_bootstrap] "
+            "[--joint] [--settings cv_settings.json]"
+        )
         print("\nExample:")
         print("  python3 compute_whr_rankings.py 150")
         print("  python3 compute_whr_rankings.py 150 200")
+        print("  python3 compute_whr_rankings.py 150 200 --joint")
+        print("  python3 compute_whr_rankings.py 150 200 --settings cv_settings.json")
         sys.exit(1)
 
-    min_games = int(sys.argv[1])
-    n_bootstrap = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    min_games = int(args[0])
+    n_bootstrap = int(args[1]) if len(args) > 1 else 100
 
     print("=" * 70)
     print("WHOLE HISTORY RATING (WHR) COMPUTATION")
     print("=" * 70)
     print(f"Minimum games required: {min_games}")
     print(f"Bootstrap samples: {n_bootstrap}")
+    print(f"Model: {'joint multi-format' if joint else 'per-format'}")
     print()
 
-    # Define formats to process
-    formats = {
-        "gen1ou": "showdown_tsvs/gen1ou.tsv",
-        "gen2ou": "showdown_tsvs/gen2ou.tsv",
-        "gen3ou": "showdown_tsvs/gen3ou.tsv",
-        "gen9ou": "showdown_tsvs/gen9ou.tsv",
-    }
+    formats = WHR_FORMATS
 
     # Compute WHR for each format
     whr_data_by_format = {}
+    summaries_by_format = {}
 
-    for format_name, tsv_path in formats.items():
-        if Path(tsv_path).exists():
-            whr_data = compute_whr_for_format(
-                tsv_path=tsv_path,
-                format_name=format_name,
-                min_games=min_games,
-                n_bootstrap=n_bootstrap,
-            )
-            if whr_data:
-                whr_data_by_format[format_name] = whr_data
-        else:
-            print(f"\n⚠️  {tsv_path} not found, skipping {format_name}")
+    if joint:
+        whr_data_by_format = compute_whr_joint(
+            formats,
+            min_games=min_games,
+            n_bootstrap=n_bootstrap,
+            summaries_by_format=summaries_by_format,
+        )
+    else:
+        for format_name, tsv_path in formats.items():
+            if resolve_ladder(tsv_path).exists():
+                summary = {}
+                fit_settings = {
+                    key: settings[format_name][key]
+                    for key in ("regularization", "normalize_matchups", "ties")
+                    if key in settings.get(format_name, {})
+                }
+                whr_data = compute_whr_for_format(
+                    tsv_path=tsv_path,
+                    format_name=format_name,
+                    min_games=min_games,
+                    n_bootstrap=n_bootstrap,
+                    summary=summary,
+                    **fit_settings,
+                )
+                if whr_data:
+                    whr_data_by_format[format_name] = whr_data
+                    summaries_by_format[format_name] = summary
+            else:
+                print(f"\n⚠️  {tsv_path} not found, skipping {format_name}")
 
     # Update track1.json
     if whr_data_by_format:
@@ -238,6 +562,7 @@ def main():
             track1_path="track1.json",
             whr_data_by_format=whr_data_by_format,
             min_games=min_games,
+            summaries_by_format=summaries_by_format,
         )
 
         if success:
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+K-fold cross-validation of Bradley-Terry fitting settings.
+
+Games (not players) are split into k folds by binomial thinning of the matchup
+counts: every game of every matchup lands in one fold uniformly at random. For
+each fold, models are fit on the other k-1 folds over a grid of
+regularization x normalization settings and scored on the held-out games by
+log-loss and Brier score. Within a fold, each normalization walks the
+regularization grid from strong to weak, warm-starting every fit from the
+previous one; folds run in parallel processes.
+
+The setting with the lowest mean held-out log-loss is recommended per format
+and written to a JSON file that compute_whr_rankings.py can read with
+--settings.
+
+Usage:
+    python cross_validate.py [--min-games N] [--folds K] [--jobs J] [--output FILE]
+"""
+
+import argparse
+import copy
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import resolve_ladder
+from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
+
+FORMATS = {
+    "gen1ou": "showdown_tsvs/gen1ou.tsv",
+    "gen2ou": "showdown_tsvs/gen2ou.tsv",
+    "gen3ou": "showdown_tsvs/gen3ou.tsv",
+    "gen9ou": "showdown_tsvs/gen9ou.tsv",
+}
+
+DEFAULT_REGULARIZATIONS = [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0]
+DEFAULT_NORMALIZATIONS = [None, "sqrt", "equal_weight"]
+
+
+def split_games(
+    h2h: HeadToHeadMatrix, n_folds: int, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split the games of every matchup into folds by binomial thinning.
+
+    Each unordered pair is split once, so a game is a win for one side and a
+    loss for the other in the same fold.
+
+    Returns:
+        (wins, ties) arrays of shape (n_folds, n, n)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(h2h.players)
+    i_idx, j_idx = np.triu_indices(n, k=1)
+    uniform = np.full(n_folds, 1.0 / n_folds)
+
+    def thin(counts):
+        return rng.multinomial(counts, uniform).T  # (n_folds, n_pairs)
+
+    wins = np.zeros((n_folds, n, n), dtype=int)
+    ties = np.zeros((n_folds, n, n), dtype=int)
+    wins[:, i_idx, j_idx] = thin(h2h.wins_matrix[i_idx, j_idx])
+    wins[:, j_idx, i_idx] = thin(h2h.wins_matrix[j_idx, i_idx])
+    tied = thin(h2h.ties_matrix[i_idx, j_idx])
+    ties[:, i_idx, j_idx] = tied
+    ties[:, j_idx, i_idx] = tied
+    return wins, ties
+
+
+def held_out_scores(
+    model: BradleyTerryModel, wins: np.ndarray, ties: np.ndarray
+) -> Dict[str, float]:
+    """
+    Per-game log-loss and Brier score of a fitted model on held-out games.
+
+    Without a tie model, a tied game counts as half a win and half a loss.
+
+    Args:
+        model: Fitted BradleyTerryModel
+        wins: Held-out wins matrix
+        ties: Held-out ties matrix
+
+    Returns:
+        Dictionary with 'log_loss', 'brier' and 'n_games'
+    """
+    scores = model.evaluate_predictions(min_games=0, wins=wins, ties=ties)
+    return {
+        "log_loss": scores["log_loss"],
+        "brier": scores["brier"],
+        "n_games": int(scores["n_games"]),
+    }
+
+
+def _run_fold(task) -> List[Dict[str, object]]:
+    """Fit and score the whole grid on one fold (run in a worker process)."""
+    h2h, train, test, regularizations, normalizations, fit_kwargs = task
+    h2h = copy.copy(h2h)
+    h2h.wins_matrix, h2h.ties_matrix = train
+    model = BradleyTerryModel(h2h)
+
+    rows = []
+    for normalization in normalizations:
+        x_prev = None
+        for reg in sorted(regularizations, reverse=True):
+            model.fit_logistic(
+                regularization=reg,
+                normalize_matchups=normalization,
+                verbose=False,
+                x0=x_prev,
+                **fit_kwargs,
+            )
+            x_prev = model.params
+            rows.append(
+                {
+                    "normalize_matchups": normalization,
+                    "regularization": reg,
+                    **held_out_scores(model, *test),
+                }
+            )
+    return rows
+
+
+def cross_validate(
+    h2h: HeadToHeadMatrix,
+    n_folds: int = 5,
+    regularizations: Optional[List[float]] = None,
+    normalizations: Optional[List[Optional[str]]] = None,
+    n_jobs: int = None,
+    seed: int = 0,
+    **fit_kwargs,
+) -> Dict[str, object]:
+    """
+    Cross-validate regularization x normalization settings on one format.
+
+    Args:
+        h2h: HeadToHeadMatrix of the format
+        n_folds: Number of folds
+        regularizations: Regularization grid
+        normalizations: normalize_matchups grid (None for no normalization)
+        n_jobs: Worker processes (default: one per CPU; 1 runs in-process)
+        seed: Random seed of the fold split
+        **fit_kwargs: Other fit_logistic arguments (method, ties, ...)
+
+    Returns:
+        Dictionary with 'grid' (mean/std of the scores per setting, sorted by
+        log-loss) and 'recommended' (the best setting)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    regularizations = regularizations or DEFAULT_REGULARIZATIONS
+    normalizations = normalizations or DEFAULT_NORMALIZATIONS
+
+    fold_wins, fold_ties = split_games(h2h, n_folds, seed)
+    total_wins, total_ties = fold_wins.sum(axis=0), fold_ties.sum(axis=0)
+    tasks = [
+        (
+            h2h,
+            (total_wins - fold_wins[k], total_ties - fold_ties[k]),
+            (fold_wins[k], fold_ties[k]),
+            regularizations,
+            normalizations,
+            fit_kwargs,
+        )
+        for k in range(n_folds)
+    ]
+
+    if n_jobs == 1:
+        fold_rows = [_run_fold(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            fold_rows = list(pool.map(_run_fold, tasks))
+
+    # Same grid order in every fold: average setting by setting, weighting
+    # folds by their number of held-out games (small ladders can have empty folds)
+    n_games = np.array([rows[0]["n_games"] for rows in fold_rows])
+    if n_games.sum() == 0:
+        raise ValueError("No games to cross-validate")
+    scored = n_games > 0
+    grid = []
+    for rows in zip(*fold_rows):
+        log_loss = np.array([r["log_loss"] for r in rows])[scored]
+        brier = np.array([r["brier"] for r in rows])[scored]
+        weights = n_games[scored]
+        grid.append(
+            {
+                "normalize_matchups": rows[0]["normalize_matchups"],
+                "regularization": rows[0]["regularization"],
+                "log_loss": float(np.average(log_loss, weights=weights)),
+                "log_loss_std": float(log_loss.std()),
+                "brier": float(np.average(brier, weights=weights)),
+                "brier_std": float(brier.std()),
+            }
+        )
+    grid.sort(key=lambda r: r["log_loss"])
+
+    best = grid[0]
+    return {
+        "grid": grid,
+        "recommended": {
+            "regularization": best["regularization"],
+            "normalize_matchups": best["normalize_matchups"],
+        },
+        "n_folds": n_folds,
+        "n_games": int(n_games.sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cross-validate regularization and normalization per format"
+    )
+    parser.add_argument("--min-games", type=int, default=150)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--regularizations",
+        type=float,
+        nargs="+",
+        default=DEFAULT_REGULARIZATIONS,
+    )
+    parser.add_argument(
+        "--normalizations",
+        nargs="+",
+        default=["none", "sqrt", "equal_weight"],
+        help="normalize_matchups values ('none' for no normalization)",
+    )
+    parser.add_argument(
+        "--ties", default="davidson", help="Tie model ('none' to ignore ties)"
+    )
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="cv_settings.json")
+    args = parser.parse_args()
+
+    normalizations = [None if v == "none" else v for v in args.normalizations]
+    ties = None if args.ties == "none" else args.ties
+
+    print("=" * 70)
+    print("CROSS-VALIDATION OF FITTING SETTINGS")
+    print("=" * 70)
+    print(f"Folds: {args.folds}, minimum games: {args.min_games}, ties: {ties}")
+    print(f"Regularizations: {args.regularizations}")
+    print(f"Normalizations: {args.normalizations}")
+
+    settings = {}
+    for format_name in args.formats:
+        tsv_path = FORMATS.get(format_name, f"showdown_tsvs/{format_name}.tsv")
+        if not resolve_ladder(tsv_path).exists():
+            print(f"\n⚠️  {tsv_path} not found, skipping {format_name}")
+            continue
+
+        print(f"\n{'='*70}")
+        print(f"{format_name.upper()}")
+        print(f"{'='*70}")
+        h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=args.min_games)
+        if len(h2h.players) < 3 or h2h.wins_matrix.sum() < args.folds:
+            print(
+                f"⚠️  Only {len(h2h.players)} players / {h2h.wins_matrix.sum()} "
+                f"decisive games. Skipping {format_name}."
+            )
+            continue
+
+        result = cross_validate(
+            h2h,
+            n_folds=args.folds,
+            regularizations=args.regularizations,
+            normalizations=normalizations,
+            n_jobs=args.jobs,
+            seed=args.seed,
+            ties=ties,
+        )
+
+        print(f"{'Normalization':<15} {'Reg':>8} {'LogLoss':>16} {'Brier':>16}")
+        for row in result["grid"][:10]:
+            print(
+                f"{str(row['normalize_matchups']):<15} {row['regularization']:>8g} "
+                f"{row['log_loss']:>9.5f} ±{row['log_loss_std']:.4f} "
+                f"{row['brier']:>9.5f} ±{row['brier_std']:.4f}"
+            )
+        best = result["recommended"]
+        print(
+            f"✓ Recommended: normalize_matchups={best['normalize_matchups']}, "
+            f"regularization={best['regularization']:g}"
+        )
+        settings[format_name] = {**best, "ties": ties, "cv": result["grid"]}
+
+    if not settings:
+        print("\n⚠️  No format had enough players to cross-validate")
+        return False
+
+    with open(args.output, "w") as f:
+        json.dump(settings, f, indent=2)
+    print(f"\n✅ Saved recommended settings for {len(settings)} format(s) to {args.output}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Export the head-to-head page data (h2h_<format>.json) in a compact format.
+
+The page used to download, for every player, a dict of opponent key ->
+{w, l, t}, so every matchup was stored twice under string keys. This exporter
+parses the ladder TSV once into a HeadToHeadMatrix, keeps the players the page
+shows (Glicko-1 deviation <= max_deviation, sorted by Elo) and writes:
+
+- a columnar player table (username, display_name, elo, glicko,
+  rating_deviation, is_org_baseline), row k being player index k;
+- the played matchups as upper-triangle sparse COO arrays: for every pair
+  i < j with at least one game, the row player's wins, losses and ties
+  against the column player. The (j, i) record is the mirror image.
+
+With --binary the COO arrays go to a little-endian typed-array sidecar
+(h2h_<format>.bin: i, j, w, l, t back to back) and the JSON only keeps the
+player table and the sidecar layout.
+
+Usage:
+    python export_h2h.py [--formats F ...] [--max-deviation D] [--binary]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import resolve_ladder
+from leaderboard.whr import HeadToHeadMatrix
+from leaderboard.parse_tsv_ladders import format_username
+from leaderboard.shard_track1 import write_json_atomic
+
+FORMATS = {
+    "gen1ou": "showdown_tsvs/gen1ou.tsv",
+    "gen9ou": "showdown_tsvs/gen9ou.tsv",
+}
+
+MAX_DEVIATION = 80  # Matches the main leaderboard and headToHeadMatrix.js
+COO_FIELDS = ["i", "j", "w", "l", "t"]
+
+# Username prefix -> display prefix, as usernameToDisplay() in headToHeadMatrix.js
+DISPLAY_PREFIXES = [
+    ("PAC-MM-", "Metamon-"),
+    ("PAC-BH-", "Heuristic-"),
+    ("PAC-LLM-", "LLM-"),
+    ("PAC-PC-", "PokéChamp-"),
+    ("PAC-", ""),
+]
+
+
+def display_name(username: str) -> str:
+    """
+    Display name of a player on the head-to-head page.
+
+    Unlike format_username(), generation suffixes are kept: PAC-MM-Kadabra
+    and PAC-MM-Kadabra-9 are different players of the same ladder.
+    """
+    for prefix, replacement in DISPLAY_PREFIXES:
+        if username.startswith(prefix):
+            return replacement + username[len(prefix):]
+    return username
+
+
+def is_org_baseline(username: str) -> bool:
+    """Organizer baselines: starter kits and the PAC-LLM- agents."""
+    return format_username(username)["is_starter_kit"] or username.startswith(
+        "PAC-LLM-"
+    )
+
+
+def build_compact_h2h(
+    h2h: HeadToHeadMatrix, format_name: str, max_deviation: float = MAX_DEVIATION
+) -> Dict[str, object]:
+    """
+    Build the compact head-to-head export of one format.
+
+    Args:
+        h2h: HeadToHeadMatrix of the format (players sorted by Elo)
+        format_name: Format name stored in the export
+        max_deviation: Maximum Glicko-1 rating deviation of exported players
+
+    Returns:
+        Dictionary with the player table and the COO arrays (numpy, under
+        'pairs')
+    """
+    keep = np.flatnonzero(
+        np.array([p["Rating_Deviation"] <= max_deviation for p in h2h.players])
+    )
+    players = [h2h.players[k] for k in keep]
+    idx = np.ix_(keep, keep)
+    games = h2h.games_matrix[idx]
+    wins = h2h.wins_matrix[idx]
+    ties = h2h.ties_matrix[idx]
+    losses = games - wins - ties
+
+    # Records are read from the row player's H2H_Data, so the lower triangle
+    # mirrors the upper one and only i < j needs to be stored
+    i_idx, j_idx = np.triu_indices(len(players), k=1)
+    played = (games + games.T)[i_idx, j_idx] > 0
+    i_idx, j_idx = i_idx[played], j_idx[played]
+
+    return {
+        "format": format_name,
+        "max_deviation": max_deviation,
+        "total_players": len(players),
+        "players": {
+            "username": [p["Username"] for p in players],
+            "display_name": [display_name(p["Username"]) for p in players],
+            "elo": [float(p["Elo"]) for p in players],
+            "glicko": [float(p["Glicko"]) for p in players],
+            "rating_deviation": [float(p["Rating_Deviation"]) for p in players],
+            "is_org_baseline": [is_org_baseline(p["Username"]) for p in players],
+        },
+        "pairs": {
+            "i": i_idx,
+            "j": j_idx,
+            "w": wins[i_idx, j_idx],
+            "l": losses[i_idx, j_idx],
+            "t": ties[i_idx, j_idx],
+        },
+    }
+
+
+def write_compact_h2h(
+    data: Dict[str, object], path: str, binary_path: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Write a compact export as minified JSON, optionally with a binary sidecar.
+
+    Both files are written atomically (temporary file and rename).
+
+    Args:
+        data: Output of build_compact_h2h
+        path: JSON output path
+        binary_path: Sidecar path; the COO arrays are written there as
+            consecutive little-endian arrays instead of inline JSON lists
+
+    Returns:
+        Dictionary with the 'json_bytes' and 'binary_bytes' written
+    """
+    pairs = data["pairs"]
+    count = len(pairs["i"])
+    out = {"encoding": "coo-upper", **data}
+
+    binary_bytes = 0
+    if binary_path is None:
+        out["pairs"] = {"count": count, **{f: pairs[f].tolist() for f in COO_FIELDS}}
+    else:
+        largest = max(int(pairs[f].max()) for f in COO_FIELDS) if count else 0
+        dtype = np.dtype("<u2") if largest <= np.iinfo(np.uint16).max else np.dtype("<u4")
+        blob = b"".join(pairs[f].astype(dtype).tobytes() for f in COO_FIELDS)
+        tmp = Path(binary_path).with_name(f".{Path(binary_path).name}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, binary_path)
+        binary_bytes = len(blob)
+        out["pairs"] = {
+            "count": count,
+            "binary": Path(binary_path).name,
+            "dtype": "uint16" if dtype.itemsize == 2 else "uint32",
+            "fields": COO_FIELDS,
+        }
+
+    # The sidecar is in place before the JSON that points to it
+    json_bytes = write_json_atomic(path, out, separators=(",", ":"))
+    return {"json_bytes": json_bytes, "binary_bytes": binary_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export compact head-to-head data for the H2H page"
+    )
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS))
+    parser.add_argument("--max-deviation", type=float, default=MAX_DEVIATION)
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Write the matchup arrays to an h2h_<format>.bin sidecar",
+    )
+    parser.add_argument("--output-dir", default=".")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("HEAD-TO-HEAD EXPORT")
+    print("=" * 70)
+
+    exported = 0
+    for format_name in args.formats:
+        tsv_path = FORMATS.get(format_name, f"showdown_tsvs/{format_name}.tsv")
+        if not resolve_ladder(tsv_path).exists():
+            print(f"⚠️  {tsv_path} not found, skipping {format_name}")
+            continue
+
+        h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=0)
+        data = build_compact_h2h(h2h, format_name, args.max_deviation)
+
+        out_dir = Path(args.output_dir)
+        json_path = out_dir / f"h2h_{format_name}.json"
+        binary_path = out_dir / f"h2h_{format_name}.bin" if args.binary else None
+        sizes = write_compact_h2h(data, json_path, binary_path)
+
+        print(
+            f"✓ {format_name}: {data['total_players']} players, "
+            f"{len(data['pairs']['i'])} matchups -> {json_path} "
+            f"({sizes['json_bytes']:,} bytes"
+            + (f" + {sizes['binary_bytes']:,} binary)" if binary_path else ")")
+        )
+        exported += 1
+
+    if not exported:
+        print("\n⚠️  No format exported")
+        return False
+    print(f"\n✅ Exported {exported} format(s)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
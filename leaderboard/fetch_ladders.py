@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Download the ladder TSVs of all formats concurrently, skipping unchanged ones.
+
+Every format is requested at once over a small pool of keep-alive HTTP/1.1
+connections (stdlib asyncio, plain HTTP or HTTPS), so refreshing all formats
+costs about one round trip instead of one per format, and the connections
+stay open between refreshes with --interval.
+
+The ETag and Last-Modified validators of each download are kept in
+<tsv-dir>/.fetch_state.json and sent back as If-None-Match and
+If-Modified-Since: a ladder that did not change on the server costs a 304
+with no body. A changed ladder is streamed to a temporary file next to its
+TSV and renamed over it once complete, so readers (watch_ladders.py,
+rating_service.py, which poll the directory) never see a partial file and
+an interrupted download leaves the previous TSV in place.
+
+Ladders are requested with Accept-Encoding: gzip (and zstd when the
+zstandard package is installed) and stored compressed, as <format>.tsv.gz by
+default (--storage, see ladder_files.py): a gzip response is written as
+received, and every reader of the pipeline decompresses while parsing. The
+H2H_Data JSON compresses about 8-9x on the larger ladders, on the wire and
+on disk.
+
+In code, LadderFetcher.refresh(load=True) also returns a HeadToHeadMatrix
+of every downloaded ladder, parsed from the bytes already in memory.
+
+The URL of a format is <base-url>/<format>.tsv. ladder_server.py serves a
+local directory the same way, for trying this out without the real server.
+
+Usage:
+    python fetch_ladders.py --base-url URL [--formats F ...] [--tsv-dir showdown_tsvs]
+                            [--connections 6] [--interval SECONDS]
+                            [--storage gzip|zstd|none]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import ssl
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.compute_whr_rankings import WHR_FORMATS
+from leaderboard.ladder_files import CODECS, compressor, decompressor, ladder_file
+from leaderboard.parse_tsv_ladders import LADDER_FILES
+from leaderboard.shard_track1 import write_json_atomic
+
+STATE_FILE = ".fetch_state.json"
+CHUNK_BYTES = 64 * 1024
+# Content-Encoding -> ladder_files codec
+CONTENT_CODINGS = {
+    "": "none",
+    "identity": "none",
+    "gzip": "gzip",
+    "x-gzip": "gzip",
+    "zstd": "zstd",
+}
+
+
+class FetchError(Exception):
+    """A ladder could not be downloaded."""
+
+
+class ConnectionPool:
+    """At most `size` keep-alive connections to one host, reused across requests."""
+
+    def __init__(self, base_url: str, size: int = 6):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.host_header = parts.netloc
+        self.slots = asyncio.Semaphore(size)
+        self.idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.opened = 0
+
+    async def acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """An idle connection if there is one, else a new one; plus whether it was reused."""
+        await self.slots.acquire()
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl
+            )
+        except BaseException:
+            self.slots.release()
+            raise
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, reader, writer, reusable: bool) -> None:
+        if reusable:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+        self.slots.release()
+
+    def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+async def read_head(reader) -> Tuple[int, Dict[str, str]]:
+    """Status code and lower-cased headers of a response."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Connection closed before the response")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def iter_body(reader, headers: Dict[str, str]):
+    """Yield the response body in chunks (Content-Length, chunked or until close)."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Trailers
+                return
+            remaining = size
+            while remaining:
+                chunk = await reader.readexactly(min(remaining, CHUNK_BYTES))
+                remaining -= len(chunk)
+                yield chunk
+            await reader.readline()
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, CHUNK_BYTES))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        while True:
+            chunk = await reader.read(CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+class LadderFetcher:
+    """Conditional, concurrent downloads of the ladder TSVs into a directory."""
+
+    def __init__(
+        self,
+        base_url: str,
+        tsv_dir: str = "showdown_tsvs",
+        formats: Optional[List[str]] = None,
+        connections: int = 6,
+        timeout: float = 60.0,
+        storage: str = "gzip",
+    ):
+        """
+        Args:
+            base_url: URL under which <format>.tsv is served
+            tsv_dir: Directory the TSVs (and the validator state) are kept in
+            formats: Formats to fetch (default: the parsed and WHR formats)
+            connections: Maximum number of concurrent connections
+            timeout: Seconds allowed for one download
+            storage: Codec the TSVs are stored with ('gzip', 'zstd' or 'none')
+        """
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlsplit(self.base_url).path
+        self.tsv_dir = Path(tsv_dir)
+        self.formats = formats or list(dict.fromkeys([*LADDER_FILES, *WHR_FORMATS]))
+        self.connections = connections
+        self.timeout = timeout
+        self.state_path = self.tsv_dir / STATE_FILE
+        self.pool: Optional[ConnectionPool] = None
+        if storage not in CODECS:
+            raise ValueError(f"Unknown storage codec: {storage}")
+        compressor(storage)  # Fails now if zstd is asked for but not installed
+        self.storage = storage
+        self.accept_encoding = (
+            "zstd, gzip" if importlib.util.find_spec("zstandard") else "gzip"
+        )
+
+    def target(self, format_name: str) -> Path:
+        """Where a format's ladder is stored."""
+        return ladder_file(self.tsv_dir, format_name, self.storage)
+
+    def load_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def conditional_headers(self, format_name: str, state: Dict[str, dict]) -> Dict[str, str]:
+        """
+        Validators of the last download, if the local TSV is still that download.
+
+        A TSV that is missing or was modified locally since is downloaded in
+        full, since a 304 would leave it as it is.
+        """
+        entry = state.get(format_name)
+        path = self.target(format_name)
+        if not entry or not path.exists():
+            return {}
+        stat = path.stat()
+        if [stat.st_mtime_ns, stat.st_size] != entry.get("stat"):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def fetch(
+        self, format_name: str, state: Dict[str, dict], load: bool = False
+    ) -> dict:
+        """
+        Download one ladder unless the server reports it unchanged.
+
+        A request failing on a reused connection (closed by the server while
+        idle) is retried once on a new connection.
+
+        Returns:
+            Dictionary with the 'status' (200 or 304), 'bytes' transferred,
+            'seconds' taken, whether the connection was 'reused' and, for a
+            200, the 'encoding' it was transferred with and, with load=True,
+            the decompressed 'body'
+        """
+        start = time.perf_counter()
+        path = f"{self.base_path}/{format_name}.tsv"
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {self.pool.host_header}\r\n"
+            "User-Agent: pokeagent-fetch-ladders\r\nConnection: keep-alive\r\n"
+            f"Accept-Encoding: {self.accept_encoding}\r\n"
+        )
+        for key, value in self.conditional_headers(format_name, state).items():
+            request += f"{key}: {value}\r\n"
+        request = (request + "\r\n").encode()
+
+        for attempt in range(2):
+            reader, writer, reused = await self.pool.acquire()
+            reusable = False
+            try:
+                writer.write(request)
+                await writer.drain()
+                try:
+                    status, headers = await read_head(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if reused and attempt == 0:
+                        continue  # Stale keep-alive connection
+                    raise
+                result = await self._receive(format_name, status, headers, reader, load)
+                reusable = headers.get("connection", "").lower() != "close" and (
+                    "content-length" in headers
+                    or headers.get("transfer-encoding", "").lower() == "chunked"
+                    or status == 304
+                )
+            finally:
+                self.pool.release(reader, writer, reusable)
+
+            if status == 304:
+                # The validators may be refreshed on a 304, keep the stored ones otherwise
+                entry = state.setdefault(format_name, {})
+                entry["etag"] = headers.get("etag", entry.get("etag"))
+                entry["last_modified"] = headers.get(
+                    "last-modified", entry.get("last_modified")
+                )
+            else:
+                stat = self.target(format_name).stat()
+                state[format_name] = {
+                    "etag": headers.get("etag"),
+                    "last_modified": headers.get("last-modified"),
+                    "stat": [stat.st_mtime_ns, stat.st_size],
+                }
+            result.update(
+                status=status, seconds=time.perf_counter() - start, reused=reused
+            )
+            return result
+        raise FetchError("Connection closed twice")  # Not reached
+
+    async def _receive(self, format_name, status, headers, reader, load) -> dict:
+        """
+        Stream a 200 body into the stored ladder (atomically); nothing to read
+        for a 304.
+
+        A body transferred with the storage codec is written as received;
+        otherwise it is decompressed and recompressed chunk by chunk. The
+        other variants of the format are removed once the new file is in
+        place, so a single file holds each ladder.
+        """
+        if status == 304:
+            return {"bytes": 0}
+        encoding = CONTENT_CODINGS.get(headers.get("content-encoding", "").lower())
+        if status != 200 or encoding is None:
+            async for _ in iter_body(reader, headers):
+                pass  # Drain so the connection can be reused
+            if status != 200:
+                raise FetchError(f"HTTP {status}")
+            raise FetchError(f"Unsupported encoding {headers['content-encoding']}")
+
+        target = self.target(format_name)
+        tmp = target.with_name(f".{target.name}.tmp")
+        passthrough = encoding == self.storage
+        decoder = decompressor(encoding)
+        encoder = compressor(self.storage)
+        chunks = [] if load else None
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                async for chunk in iter_body(reader, headers):
+                    size += len(chunk)
+                    if passthrough and not load:
+                        f.write(chunk)
+                        continue
+                    plain = decoder.decompress(chunk)
+                    f.write(chunk if passthrough else encoder.compress(plain))
+                    if load:
+                        chunks.append(plain)
+                if not passthrough:
+                    f.write(encoder.compress(decoder.flush()) + encoder.flush())
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        for codec in CODECS:
+            if codec != self.storage:
+                ladder_file(self.tsv_dir, format_name, codec).unlink(missing_ok=True)
+
+        result = {"bytes": size, "encoding": encoding}
+        if load:
+            result["body"] = b"".join(chunks)
+        return result
+
+    async def refresh(self, load: bool = False) -> Dict[str, dict]:
+        """
+        Fetch every format concurrently.
+
+        Args:
+            load: Also parse every downloaded ladder into a HeadToHeadMatrix
+                (min_games=0), returned under 'matrix'
+
+        Returns:
+            Format -> fetch result (see fetch), or {'error': message} for the
+            formats that failed; the other formats are still updated
+        """
+        if self.pool is None:
+            self.pool = ConnectionPool(self.base_url, self.connections)
+        self.tsv_dir.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+
+        async def fetch_one(format_name):
+            try:
+                return await asyncio.wait_for(
+                    self.fetch(format_name, state, load), self.timeout
+                )
+            except Exception as e:
+                # A broken ladder (HTTP error, corrupt body...) does not stop the others
+                return {"error": str(e) or type(e).__name__}
+
+        results = dict(
+            zip(
+                self.formats,
+                await asyncio.gather(*(fetch_one(f) for f in self.formats)),
+            )
+        )
+        write_json_atomic(self.state_path, state, indent=2)
+
+        if load:
+            import io
+
+            from leaderboard.whr import HeadToHeadMatrix
+
+            for format_name, result in results.items():
+                if "body" in result:
+                    h2h = HeadToHeadMatrix(filepath=io.BytesIO(result.pop("body")), min_games=0)
+                    h2h.filepath = str(self.target(format_name))
+                    result["matrix"] = h2h
+        return results
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+
+def print_results(results: Dict[str, dict], elapsed: float) -> Tuple[int, int, int]:
+    """Print one line per format; returns the (downloaded, unchanged, failed) counts."""
+    downloaded = unchanged = failed = 0
+    for format_name, result in results.items():
+        if "error" in result:
+            failed += 1
+            print(f"  ❌ {format_name:<18} {result['error']}")
+        elif result["status"] == 304:
+            unchanged += 1
+            print(f"  ✓ {format_name:<18} unchanged (304) {result['seconds'] * 1000:>8.1f} ms")
+        else:
+            downloaded += 1
+            print(
+                f"  ✓ {format_name:<18} {result['bytes']:>10,} bytes "
+                f"({result['encoding']:<4}) {result['seconds'] * 1000:>8.1f} ms"
+            )
+    print(
+        f"  {downloaded} downloaded, {unchanged} unchanged, {failed} failed "
+        f"in {elapsed * 1000:.0f} ms"
+    )
+    return downloaded, unchanged, failed
+
+
+async def run(args) -> bool:
+    fetcher = LadderFetcher(
+        base_url=args.base_url,
+        tsv_dir=args.tsv_dir,
+        formats=args.formats,
+        connections=args.connections,
+        timeout=args.timeout,
+        storage=args.storage,
+    )
+    try:
+        while True:
+            start = time.perf_counter()
+            results = await fetcher.refresh()
+            print(f"\n{time.strftime('%H:%M:%S')} refresh of {len(results)} format(s):")
+            _, _, failed = print_results(results, time.perf_counter() - start)
+            if not args.interval:
+                return not failed
+            await asyncio.sleep(args.interval)
+    finally:
+        fetcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the ladder TSVs")
+    parser.add_argument(
+        "--base-url",
+        required=True,
+        help="URL under which <format>.tsv is served",
+    )
+    parser.add_argument("--formats", nargs="+", default=None)
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=6,
+        help="Maximum concurrent connections (default: 6)",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--storage",
+        choices=list(CODECS),
+        default="gzip",
+        help="Store the TSVs compressed (default: gzip; zstd needs zstandard)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.0,
+        help="Refresh every SECONDS, reusing the connections (default: once)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LADDER FETCH")
+    print("=" * 70)
+    print(f"Source: {args.base_url.rstrip('/')}/<format>.tsv -> {args.tsv_dir}/")
+    try:
+        ok = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+        return True
+    except ImportError as e:
+        print(f"❌ {e}")
+        return False
+    if not ok:
+        print("\n⚠️  Some ladders could not be downloaded")
+        return False
+    print("\n✅ Ladders up to date")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Stream locally stored Showdown battle logs into timestamped matchup counts.
+
+The ladder TSVs only carry cumulative per-opponent records (H2H_Data); replays
+also carry when each battle was played, how many turns it lasted and whether
+it ended in a forfeit. This ingestor reads:
+
+- *.jsonl: one replay JSON object per line (as served by
+  replay.pokemonshowdown.com/<id>.json), split into byte ranges;
+- *.json: one replay object (or a list of them) per file;
+- *.log: one raw battle log per file, the battle ID being the file name;
+
+and parses them in parallel chunks. Only the fields the counts need are
+located in the raw bytes (battle ID, players, |win| / |tie|, last |turn|,
+"forfeited.", upload time or first |t:| line); a record the fast path cannot
+read is decoded with json. Battles are deduplicated by ID with a set of
+64-bit hashes held as sorted numpy runs (8 bytes per battle), and usernames
+are normalized like HeadToHeadMatrix._username_to_h2h_key.
+
+The output (.npz) holds, per player pair i < j and time bucket, the wins of
+i, wins of j, ties, total turns and forfeits, plus the player table.
+HeadToHeadMatrix.from_matchup_counts loads it directly, with the buckets
+attached as intervals for fit_logistic(half_life=...).
+
+Usage:
+    python ingest_battles.py <path> [<path> ...] [--output battles.npz]
+                             [--bucket 86400] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_history import h2h_key
+
+CHUNK_BYTES = 16 * 1024 * 1024  # Byte range of a .jsonl file per task
+FILES_PER_CHUNK = 512  # .json/.log files per task
+SUFFIXES = (".jsonl", ".json", ".log")
+
+# Result of a battle, from the first player's side
+P1_WIN, P2_WIN, TIE = 1, 2, 0
+
+_ID = re.compile(rb'"id"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_PLAYERS = re.compile(
+    rb'"players"\s*:\s*\[\s*"((?:[^"\\]|\\.)*)"\s*,\s*"((?:[^"\\]|\\.)*)"'
+)
+_UPLOADTIME = re.compile(rb'"uploadtime"\s*:\s*(\d+)')
+_PLAYER_LINE = re.compile(rb"\|player\|p([12])\|([^|]+)\|")
+_TIMESTAMP_LINE = re.compile(rb"\|t:\|(\d+)")
+# A log line ends at a newline, at an escaped newline inside a JSON string
+# or at the end of that string
+_LINE_END = re.compile(rb'\\n|\n|"')
+
+# Usernames repeat across battles: normalize each one once per process
+_key = lru_cache(maxsize=1 << 16)(h2h_key)
+
+
+def _text(fragment: bytes) -> str:
+    """Decode a fragment that may hold JSON string escapes."""
+    if b"\\" in fragment:
+        return json.loads(b'"' + fragment + b'"')
+    return fragment.decode("utf-8", "replace")
+
+
+def _line_value(raw: bytes, marker: bytes) -> Optional[bytes]:
+    """Value following the last `marker` in a log, up to the end of its line."""
+    start = raw.rfind(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    end = _LINE_END.search(raw, start)
+    return raw[start : end.start() if end else len(raw)]
+
+
+def battle_id_hash(battle_id: bytes) -> int:
+    """64-bit hash of a battle ID, stable across processes."""
+    return int.from_bytes(hashlib.blake2b(battle_id, digest_size=8).digest(), "little")
+
+
+def parse_battle(raw: bytes, default_id: Optional[bytes] = None):
+    """
+    Extract the fields of one battle from a replay JSON object or a raw log.
+
+    Args:
+        raw: Replay JSON object or raw battle log
+        default_id: Battle ID to use when the record has none (raw logs)
+
+    Returns:
+        (battle ID, p1, p2, result, turns, forfeit, unix time) or None if the
+        battle has no two players or no result
+    """
+    match = _ID.search(raw)
+    battle_id = match.group(1) if match else default_id
+
+    match = _PLAYERS.search(raw)
+    if match:
+        p1, p2 = _text(match.group(1)), _text(match.group(2))
+    else:
+        names = {}
+        for side, name in _PLAYER_LINE.findall(raw):
+            names.setdefault(side, _text(name))
+        p1, p2 = names.get(b"1"), names.get(b"2")
+
+    if battle_id is None or not p1 or not p2:
+        if raw.lstrip()[:1] != b"{":
+            return None
+        # Not the layout the fast path expects: decode the whole object
+        try:
+            replay = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        players = replay.get("players") or [replay.get("p1"), replay.get("p2")]
+        log = replay.get("log", "").encode()
+        if not replay.get("id") or len(players) < 2 or not all(players[:2]):
+            return None
+        merged = json.dumps({"id": replay["id"], "players": players[:2]}).encode()
+        if replay.get("uploadtime"):
+            log += b'\n|t:|%d' % int(replay["uploadtime"])
+        return parse_battle(merged + b"\n" + log)
+
+    winner = _line_value(raw, b"|win|")
+    # The last "|tie" is a tie line only if nothing follows it ("|tier|...")
+    tie = _line_value(raw, b"|tie")
+    if winner is not None:
+        winner = _key(_text(winner))
+        if winner == _key(p1):
+            result = P1_WIN
+        elif winner == _key(p2):
+            result = P2_WIN
+        else:
+            return None
+    elif tie is not None and tie[:1] in (b"", b"|"):
+        result = TIE
+    else:
+        return None  # Unfinished battle
+
+    turns = _line_value(raw, b"|turn|")
+    match = _UPLOADTIME.search(raw) or _TIMESTAMP_LINE.search(raw)
+    return (
+        battle_id,
+        p1,
+        p2,
+        result,
+        int(turns) if turns and turns.isdigit() else 0,
+        b" forfeited." in raw,
+        int(match.group(1)) if match else 0,
+    )
+
+
+def _chunk_records(task) -> Iterator[Tuple[bytes, Optional[bytes]]]:
+    """(raw record, default battle ID) of a task of iter_tasks."""
+    kind, payload = task
+    if kind == "lines":
+        path, start, end = payload
+        with open(path, "rb") as f:
+            # The line running into `start` belongs to the previous range
+            if start:
+                f.seek(start - 1)
+                f.readline()
+            pos = f.tell()
+            while pos < end:
+                line = f.readline()
+                if not line:
+                    break
+                pos += len(line)
+                if line.strip():
+                    yield line, None
+        return
+
+    for path in payload:
+        raw = Path(path).read_bytes()
+        if path.endswith(".json") and raw.lstrip()[:1] == b"[":
+            for replay in json.loads(raw):
+                yield json.dumps(replay).encode(), None
+        else:
+            yield raw, Path(path).stem.encode()
+
+
+def parse_chunk(task) -> Dict[str, object]:
+    """
+    Parse the battles of one task into compact arrays (run in a worker).
+
+    Returns:
+        Dictionary with 'keys' and 'names' (local player table, normalized
+        key and first seen username) and per-battle arrays 'hash', 'p1',
+        'p2' (local player indices), 'result', 'turns', 'forfeit', 'time',
+        plus the number of 'skipped' records
+    """
+    local: Dict[str, int] = {}
+    names: List[str] = []
+    keys: List[str] = []
+    rows = []
+    skipped = 0
+
+    def player_index(username: str) -> int:
+        key = _key(username)
+        idx = local.get(key)
+        if idx is None:
+            idx = local[key] = len(keys)
+            keys.append(key)
+            names.append(username)
+        return idx
+
+    for raw, default_id in _chunk_records(task):
+        battle = parse_battle(raw, default_id)
+        if battle is None:
+            skipped += 1
+            continue
+        battle_id, p1, p2, result, turns, forfeit, timestamp = battle
+        rows.append(
+            (
+                battle_id_hash(battle_id),
+                player_index(p1),
+                player_index(p2),
+                result,
+                turns,
+                forfeit,
+                timestamp,
+            )
+        )
+
+    columns = list(zip(*rows)) or [()] * 7
+    dtypes = [np.uint64, np.int32, np.int32, np.int8, np.int32, bool, np.int64]
+    arrays = [np.array(c, dtype=d) for c, d in zip(columns, dtypes)]
+    return {
+        "keys": keys,
+        "names": names,
+        **dict(zip(["hash", "p1", "p2", "result", "turns", "forfeit", "time"], arrays)),
+        "skipped": skipped,
+    }
+
+
+def iter_tasks(paths: List[str], chunk_bytes: int = CHUNK_BYTES) -> Iterator[tuple]:
+    """Split the input files into tasks for parse_chunk."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in SUFFIXES))
+        else:
+            files.append(path)
+
+    batch = []
+    for path in files:
+        if path.suffix == ".jsonl":
+            size = path.stat().st_size
+            for start in range(0, size, chunk_bytes):
+                yield "lines", (str(path), start, min(start + chunk_bytes, size))
+        else:
+            batch.append(str(path))
+            if len(batch) == FILES_PER_CHUNK:
+                yield "files", batch
+                batch = []
+    if batch:
+        yield "files", batch
+
+
+class BattleIdSet:
+    """
+    Set of 64-bit battle ID hashes stored as sorted numpy runs.
+
+    New runs are merged with the previous one while it is not more than
+    twice as large, so there are O(log n) runs and every hash is merged
+    O(log n) times.
+    """
+
+    def __init__(self):
+        self.runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self.runs)
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add hashes; returns the mask of those not seen before (for repeated
+        hashes within `hashes`, only the first occurrence is new).
+        """
+        new = np.zeros(len(hashes), dtype=bool)
+        _, first = np.unique(hashes, return_index=True)
+        new[first] = True
+        for run in self.runs:
+            pos = np.searchsorted(run, hashes[new])
+            found = run[np.minimum(pos, len(run) - 1)] == hashes[new]
+            new[np.flatnonzero(new)[found]] = False
+
+        run = np.sort(hashes[new])
+        while self.runs and len(self.runs[-1]) <= 2 * len(run):
+            run = np.concatenate([self.runs.pop(), run])
+            run.sort(kind="stable")
+        if len(run):
+            self.runs.append(run)
+        return new
+
+
+class MatchupCounter:
+    """Accumulates parsed chunks into deduplicated, bucketed matchup counts."""
+
+    FIELDS = ["w", "l", "t", "turns", "forfeits"]
+
+    def __init__(self, bucket_seconds: int = 86400):
+        self.bucket_seconds = bucket_seconds
+        self.index: Dict[str, int] = {}
+        self.usernames: List[str] = []
+        self.seen = BattleIdSet()
+        self.parts: List[Dict[str, np.ndarray]] = []
+        self.battles = 0
+        self.duplicates = 0
+        self.skipped = 0
+
+    def _global_indices(self, keys: List[str], names: List[str]) -> np.ndarray:
+        indices = np.empty(len(keys), dtype=np.int64)
+        for k, (key, name) in enumerate(zip(keys, names)):
+            idx = self.index.get(key)
+            if idx is None:
+                idx = self.index[key] = len(self.usernames)
+                self.usernames.append(name)
+            indices[k] = idx
+        return indices
+
+    @staticmethod
+    def _reduce(i, j, bucket, values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Sum the values of rows with the same (i, j, bucket)."""
+        keys = np.stack([i, j, bucket], axis=1)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        reduced = {"i": unique[:, 0], "j": unique[:, 1], "time": unique[:, 2]}
+        for name, value in values.items():
+            reduced[name] = np.bincount(
+                inverse, weights=value, minlength=len(unique)
+            ).astype(np.int64)
+        return reduced
+
+    def add(self, chunk: Dict[str, object]) -> None:
+        self.skipped += chunk["skipped"]
+        new = self.seen.add_new(chunk["hash"])
+        self.duplicates += int((~new).sum())
+
+        players = self._global_indices(chunk["keys"], chunk["names"])
+        p1, p2 = players[chunk["p1"][new]], players[chunk["p2"][new]]
+        result = chunk["result"][new]
+        keep = p1 != p2  # Self-play says nothing about strength
+        p1, p2, result = p1[keep], p2[keep], result[keep]
+        self.battles += len(p1)
+        if not len(p1):
+            return
+
+        # Canonical orientation i < j; w/l are the wins of i/j
+        swap = p1 > p2
+        i, j = np.where(swap, p2, p1), np.where(swap, p1, p2)
+        i_won = np.where(swap, result == P2_WIN, result == P1_WIN)
+        j_won = np.where(swap, result == P1_WIN, result == P2_WIN)
+        timestamps = chunk["time"][new][keep]
+        bucket = timestamps // self.bucket_seconds * self.bucket_seconds
+        self.parts.append(
+            self._reduce(
+                i,
+                j,
+                bucket,
+                {
+                    "w": i_won,
+                    "l": j_won,
+                    "t": result == TIE,
+                    "turns": chunk["turns"][new][keep],
+                    "forfeits": chunk["forfeit"][new][keep],
+                },
+            )
+        )
+        if len(self.parts) >= 64:
+            self.parts = [self._merge_parts()]
+
+    def _merge_parts(self) -> Dict[str, np.ndarray]:
+        if not self.parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return {name: empty for name in ["i", "j", "time", *self.FIELDS]}
+        merged = {k: np.concatenate([p[k] for p in self.parts]) for k in self.parts[0]}
+        return self._reduce(
+            merged["i"],
+            merged["j"],
+            merged["time"],
+            {name: merged[name] for name in self.FIELDS},
+        )
+
+    def result(self) -> Dict[str, np.ndarray]:
+        """The counts, as written by write_matchup_counts."""
+        counts = self._merge_parts()
+        return {
+            "usernames": np.array(self.usernames, dtype=str),
+            "keys": np.array(list(self.index), dtype=str),
+            **counts,
+            "bucket_seconds": np.int64(self.bucket_seconds),
+            "battles": np.int64(self.battles),
+            "duplicates": np.int64(self.duplicates),
+            "skipped": np.int64(self.skipped),
+        }
+
+
+def ingest_battles(
+    paths: List[str],
+    bucket_seconds: int = 86400,
+    workers: Optional[int] = None,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> Dict[str, np.ndarray]:
+    """
+    Ingest battle logs into matchup counts.
+
+    Args:
+        paths: Files or directories (searched recursively for *.jsonl,
+            *.json and *.log)
+        bucket_seconds: Width of the time buckets of the counts
+        workers: Worker processes (default: one per CPU; 1 parses inline)
+        chunk_bytes: Byte range of a .jsonl file parsed per task
+
+    Returns:
+        Dictionary of arrays (see write_matchup_counts)
+    """
+    workers = workers or os.cpu_count() or 1
+    counter = MatchupCounter(bucket_seconds)
+    tasks = iter_tasks(paths, chunk_bytes)
+    if workers == 1:
+        for task in tasks:
+            counter.add(parse_chunk(task))
+        return counter.result()
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # At most two tasks per worker in flight, so memory stays bounded however
+    # large the input is; chunks are merged in input order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(parse_chunk, task))
+            if len(pending) >= 2 * workers:
+                counter.add(pending.popleft().result())
+        while pending:
+            counter.add(pending.popleft().result())
+    return counter.result()
+
+
+def write_matchup_counts(counts: Dict[str, np.ndarray], path: str) -> int:
+    """
+    Write matchup counts to an .npz file, atomically.
+
+    Arrays: usernames and keys (player table, normalized keys), and per
+    (i, j, time bucket) row with i < j: w (wins of i), l (wins of j), t
+    (ties), turns (total turns) and forfeits; scalars bucket_seconds,
+    battles, duplicates and skipped.
+
+    Returns:
+        Number of bytes written
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **counts)
+    os.replace(tmp, path)
+    return path.stat().st_size
+
+
+def load_matchup_counts(path: str) -> Dict[str, np.ndarray]:
+    """Read an .npz written by write_matchup_counts."""
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest Showdown battle logs into timestamped matchup counts"
+    )
+    parser.add_argument("paths", nargs="+", help="Files or directories of logs")
+    parser.add_argument("--output", default="battles.npz")
+    parser.add_argument(
+        "--bucket", type=int, default=86400, help="Time bucket in seconds"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BATTLE LOG INGESTION")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    counts = ingest_battles(args.paths, args.bucket, args.workers)
+    elapsed = time.perf_counter() - start
+    size = write_matchup_counts(counts, args.output)
+
+    battles = int(counts["battles"])
+    read = battles + int(counts["duplicates"]) + int(counts["skipped"])
+    print(f"✓ Read {read:,} records in {elapsed:.1f}s ({read / elapsed * 60:,.0f}/min)")
+    print(f"  - {battles:,} battles between {len(counts['usernames']):,} players")
+    print(f"  - {int(counts['duplicates']):,} duplicates, {int(counts['skipped']):,} skipped")
+    print(f"✓ Wrote {len(counts['i']):,} matchup buckets to {args.output} ({size:,} bytes)")
+    if not battles:
+        print("\n⚠️  No battle ingested")
+        return False
+    print("\n✅ Ingestion complete")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
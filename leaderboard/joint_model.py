@@ -0,0 +1,404 @@
+"""
+Joint Bradley-Terry model across formats with a shared agent skill.
+
+Each player p in format f gets the log-strength
+
+    θ_{f,p} = u_{a(p)} + δ_{f,p}
+
+where u_a is a latent skill shared by every account of agent a (across gen1ou,
+gen2ou, ...) and δ_{f,p} is a format-specific deviation. Both terms get ridge
+penalties, so a player in a sparse format (e.g. gen2ou) is shrunk towards the
+skill its agent shows in the data-rich formats instead of towards the format
+mean.
+
+All formats are fit as one problem over a sparse design matrix with one row per
+ordered matchup and one column per skill/deviation parameter.
+
+Agents are identified by their display name (see parse_tsv_ladders.format_username),
+which strips the generation suffixes of starter-kit accounts, e.g. PAC-MM-Kadabra
+and PAC-MM-Kadabra-9 both map to Metamon-Kadabra.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from leaderboard.parse_tsv_ladders import format_username
+from leaderboard.whr import (
+    TIE_MODELS,
+    BradleyTerryModel,
+    HeadToHeadMatrix,
+    _outcome_kernels,
+    summarize_bootstrap,
+)
+
+
+def default_agent_key(username: str) -> str:
+    """Agent identity of a username: its display name, or the username itself."""
+    formatted = format_username(username)
+    return formatted["display"] if formatted else username
+
+
+class JointBradleyTerryModel:
+    """
+    Bradley-Terry model fit jointly over several formats.
+
+    After fitting, `models[format_name]` is a BradleyTerryModel holding that
+    format's strengths, so the usual ranking helpers (get_rankings_with_elo,
+    get_rankings_with_elo_uncertainty, ...) work per format.
+    """
+
+    def __init__(
+        self,
+        h2h_by_format: Dict[str, HeadToHeadMatrix],
+        agent_key: Callable[[str], str] = default_agent_key,
+    ):
+        """
+        Initialize the joint model.
+
+        Args:
+            h2h_by_format: Dict mapping format name to HeadToHeadMatrix
+            agent_key: Maps a username to the agent it belongs to
+        """
+        self.formats = list(h2h_by_format)
+        self.models = {f: BradleyTerryModel(h2h) for f, h2h in h2h_by_format.items()}
+
+        # Global player-format index: players of format k occupy
+        # offsets[k]:offsets[k + 1]
+        sizes = [self.models[f].n_players for f in self.formats]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        self.n_entries = int(self.offsets[-1])
+
+        agent_index: Dict[str, int] = {}
+        agent_of = []
+        for f in self.formats:
+            for username in h2h_by_format[f].get_usernames():
+                agent = agent_key(username)
+                agent_of.append(agent_index.setdefault(agent, len(agent_index)))
+        self.agents: List[str] = list(agent_index)
+        self.agent_of = np.asarray(agent_of, dtype=int)
+        self.n_agents = len(self.agents)
+
+        self.skills = None
+        self.tie_model = None
+        self._x = None
+
+    def _build_problem(
+        self,
+        min_games: int,
+        normalize_matchups: Optional[str],
+        max_games_per_matchup: Optional[int],
+        ties: Optional[str],
+        matchup_power: Optional[float] = None,
+    ) -> Dict[str, object]:
+        """
+        Stack the matchups of every format into one sparse design.
+
+        Returns:
+            Dictionary with the design matrix 'X' (rows: ordered matchups,
+            columns: agent skills then player-format deviations), the outcome
+            'counts' and the format index of each row ('format')
+        """
+        from scipy import sparse
+
+        gi, gj, counts, row_format = [], [], [], []
+        for k, f in enumerate(self.formats):
+            rows = self.models[f]._build_matchups(
+                min_games,
+                normalize_matchups,
+                max_games_per_matchup,
+                ties,
+                matchup_power=matchup_power,
+            )
+            gi.append(rows["i"] + self.offsets[k])
+            gj.append(rows["j"] + self.offsets[k])
+            counts.append(rows["counts"])
+            row_format.append(np.full(len(rows["i"]), k))
+        gi = np.concatenate(gi)
+        gj = np.concatenate(gj)
+        m = len(gi)
+
+        # d = θ_i - θ_j with θ = u[agent] + δ; duplicate entries are summed, so
+        # two accounts of the same agent only differ by their deviations
+        row = np.tile(np.arange(m), 4)
+        col = np.concatenate(
+            [
+                self.agent_of[gi],
+                self.agent_of[gj],
+                self.n_agents + gi,
+                self.n_agents + gj,
+            ]
+        )
+        data = np.concatenate([np.ones(m), -np.ones(m), np.ones(m), -np.ones(m)])
+        X = sparse.csr_matrix(
+            (data, (row, col)), shape=(m, self.n_agents + self.n_entries)
+        )
+        return {
+            "X": X,
+            "XT": X.T.tocsr(),
+            "counts": np.concatenate(counts, axis=1),
+            "format": np.concatenate(row_format),
+        }
+
+    def _initial_params(self, problem: Dict[str, object], ties: Optional[str]):
+        n_params = self.n_agents + self.n_entries
+        x0 = np.zeros(n_params + (len(self.formats) if ties else 0))
+        if ties:
+            for k in range(len(self.formats)):
+                x0[n_params + k] = BradleyTerryModel._initial_tie_log_param(
+                    problem["counts"][:, problem["format"] == k], ties
+                )
+        return x0
+
+    def _log_likelihood_terms(
+        self,
+        x: np.ndarray,
+        problem: Dict[str, object],
+        skill_reg: float,
+        deviation_reg: float,
+        ties: Optional[str],
+    ):
+        """Penalized joint log-likelihood and its gradient."""
+        n_params = self.n_agents + self.n_entries
+        z = x[:n_params]
+        u, delta = z[: self.n_agents], z[self.n_agents :]
+        counts, row_format = problem["counts"], problem["format"]
+        s = x[n_params:][row_format] if ties else 0.0
+
+        log_p, dlog_dd, dlog_ds = _outcome_kernels(problem["X"] @ z, s, ties)
+        loglik = (
+            np.sum(counts * log_p)
+            - 0.5 * skill_reg * np.sum(u**2)
+            - 0.5 * deviation_reg * np.sum(delta**2)
+        )
+
+        grad = np.zeros_like(x)
+        grad[:n_params] = problem["XT"] @ np.sum(counts * dlog_dd, axis=0)
+        grad[: self.n_agents] -= skill_reg * u
+        grad[self.n_agents : n_params] -= deviation_reg * delta
+        if ties:
+            grad[n_params:] = np.bincount(
+                row_format,
+                weights=np.sum(counts * dlog_ds, axis=0),
+                minlength=len(self.formats),
+            )
+        return loglik, grad
+
+    def fit(
+        self,
+        min_games: int = 0,
+        regularization: float = 0.01,
+        deviation_regularization: float = 1.0,
+        normalize_matchups: str = None,
+        max_games_per_matchup: int = None,
+        matchup_power: float = None,
+        ties: str = None,
+        verbose: bool = True,
+        x0: np.ndarray = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Fit all formats jointly with L-BFGS.
+
+        Args:
+            min_games: Minimum games required to include a matchup
+            regularization: L2 penalty on the shared agent skills
+            deviation_regularization: L2 penalty on the format-specific
+                deviations; larger values borrow more strength across formats
+            normalize_matchups: Matchup weighting, as in BradleyTerryModel.fit_logistic
+            max_games_per_matchup: Cap used with normalize_matchups='cap'
+            matchup_power: Exponent used with normalize_matchups='power'
+            ties: Tie model (None, 'davidson', 'rao-kupper'); each format
+                gets its own tie parameter
+            verbose: Whether to print progress
+            x0: Optional starting parameters (e.g. a previous fit, see `params`)
+
+        Returns:
+            Dict mapping format name to its strength parameters (π values)
+        """
+        from scipy.optimize import minimize
+
+        vprint = print if verbose else lambda *a, **k: None
+        if ties not in TIE_MODELS:
+            raise ValueError(f"Unknown tie model: {ties}. Use one of {TIE_MODELS}")
+
+        problem = self._build_problem(
+            min_games, normalize_matchups, max_games_per_matchup, ties, matchup_power
+        )
+        vprint(
+            f"Joint fit over {len(self.formats)} formats: {self.n_agents} agents, "
+            f"{self.n_entries} player-format entries, "
+            f"{problem['X'].shape[0]:,} matchups"
+        )
+
+        def objective(x):
+            loglik, grad = self._log_likelihood_terms(
+                x, problem, regularization, deviation_regularization, ties
+            )
+            return -loglik, -grad
+
+        result = minimize(
+            objective,
+            self._initial_params(problem, ties) if x0 is None else x0,
+            method="L-BFGS-B",
+            jac=True,
+            options={"maxiter": 1000, "disp": False},
+        )
+        if result.success:
+            vprint(f"L-BFGS converged in {result.nit} iterations")
+        else:
+            vprint(f"L-BFGS did not converge: {result.message}")
+
+        self._set_params(result.x, ties)
+        return {f: self.models[f].strengths for f in self.formats}
+
+    @property
+    def params(self) -> Optional[np.ndarray]:
+        """Raw parameter vector of the last fit (agent skills, deviations, tie parameters)."""
+        return self._x
+
+    def _set_params(self, x: np.ndarray, ties: Optional[str]) -> None:
+        """Distribute the joint parameters to the per-format models."""
+        n_params = self.n_agents + self.n_entries
+        self._x = x
+        self.tie_model = ties
+        self.skills = x[: self.n_agents]
+        theta = self.skills[self.agent_of] + x[self.n_agents : n_params]
+
+        for k, f in enumerate(self.formats):
+            model = self.models[f]
+            strengths = np.exp(theta[self.offsets[k] : self.offsets[k + 1]])
+            model.strengths = strengths * model.n_players / np.sum(strengths)
+            model.log_strengths = np.log(model.strengths)
+            model.params = theta[self.offsets[k] : self.offsets[k + 1]]
+            if ties:
+                model.params = np.append(model.params, x[n_params + k])
+            model.tie_model = ties
+            model.tie_parameter = (
+                BradleyTerryModel._tie_parameter(x[n_params + k], ties)
+                if ties
+                else None
+            )
+
+    def get_agent_skills(self, center: float = 1500.0, scale: float = 400.0):
+        """
+        Shared agent skills on the Elo scale.
+
+        Args:
+            center: Elo value of skill 0
+            scale: Elo scale factor
+
+        Returns:
+            DataFrame with Agent, Skill, Skill_Elo and the formats each agent plays
+        """
+        import pandas as pd
+
+        if self.skills is None:
+            raise ValueError("Model not fitted yet")
+
+        formats_of = [[] for _ in range(self.n_agents)]
+        for k, f in enumerate(self.formats):
+            for a in np.unique(self.agent_of[self.offsets[k] : self.offsets[k + 1]]):
+                formats_of[a].append(f)
+
+        df = pd.DataFrame(
+            {
+                "Agent": self.agents,
+                "Skill": self.skills,
+                "Skill_Elo": center + scale / np.log(10) * self.skills,
+                "Formats": [",".join(fs) for fs in formats_of],
+                "N_Formats": [len(fs) for fs in formats_of],
+            }
+        )
+        return df.sort_values("Skill", ascending=False).reset_index(drop=True)
+
+    def fit_bootstrap(
+        self,
+        n_bootstrap: int = 100,
+        method: str = "resample",
+        fraction: float = 1.0,
+        verbose: bool = True,
+        **fit_kwargs,
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Joint bootstrap: every replicate resamples the games of all formats and
+        refits them together, warm-started from the full-data fit.
+
+        Args:
+            n_bootstrap: Number of bootstrap samples
+            method: Resampling method, as in BradleyTerryModel.bootstrap_sample_games
+            fraction: Fraction of games to sample
+            verbose: Whether to print progress
+            **fit_kwargs: Arguments passed to fit()
+
+        Returns:
+            Dict mapping format name to bootstrap results in the format of
+            BradleyTerryModel.fit_bootstrap (usable with
+            get_rankings_with_elo_uncertainty)
+        """
+        vprint = print if verbose else lambda *a, **k: None
+        ties = fit_kwargs.get("ties")
+        fit_kwargs = {**fit_kwargs, "verbose": False}
+
+        vprint(f"Running joint bootstrap with {n_bootstrap} samples...")
+        self.fit(**fit_kwargs)
+        x_full = self._x
+
+        n_formats = len(self.formats)
+        strengths_samples = {
+            f: np.zeros((n_bootstrap, self.models[f].n_players)) for f in self.formats
+        }
+        log_strengths_samples = {
+            f: np.zeros((n_bootstrap, self.models[f].n_players)) for f in self.formats
+        }
+        tie_samples = {f: np.zeros(n_bootstrap) for f in self.formats}
+
+        originals = {
+            f: (self.models[f].h2h.wins_matrix, self.models[f].h2h.ties_matrix)
+            for f in self.formats
+        }
+        try:
+            for b in range(n_bootstrap):
+                if b % 10 == 0:
+                    vprint(f"  Bootstrap sample {b}/{n_bootstrap}...", end="\r")
+
+                for k, f in enumerate(self.formats):
+                    model = self.models[f]
+                    model.h2h.wins_matrix, model.h2h.ties_matrix = originals[f]
+                    # Distinct seed per (replicate, format)
+                    sample = model.bootstrap_sample_games(
+                        method=method,
+                        fraction=fraction,
+                        seed=b * n_formats + k,
+                        include_ties=bool(ties),
+                    )
+                    model.h2h.wins_matrix = sample[0]
+                    if ties:
+                        model.h2h.ties_matrix = sample[2]
+
+                self.fit(x0=x_full, **fit_kwargs)
+
+                for f in self.formats:
+                    strengths_samples[f][b] = self.models[f].strengths
+                    log_strengths_samples[f][b] = self.models[f].log_strengths
+                    if ties:
+                        tie_samples[f][b] = self.models[f].tie_parameter
+        finally:
+            for f in self.formats:
+                h2h = self.models[f].h2h
+                h2h.wins_matrix, h2h.ties_matrix = originals[f]
+
+        vprint(f"  Bootstrap sample {n_bootstrap}/{n_bootstrap}... Done!")
+
+        # Point estimates from the full data
+        self._set_params(x_full, ties)
+
+        return {
+            f: summarize_bootstrap(
+                strengths_samples[f],
+                log_strengths_samples[f],
+                tie_samples[f] if ties else None,
+            )
+            for f in self.formats
+        }
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Ladder TSV files, stored plain or compressed.
+
+A format's ladder is <format>.tsv, <format>.tsv.gz or <format>.tsv.zst. The
+H2H_Data JSON compresses very well (about 8-9x with gzip on the larger
+ladders), so the fetch and storage stages can keep the files compressed and
+every reader decompresses while it parses, without an extra step:
+
+- open_ladder() opens any variant as a stream, decompressing on the fly
+  (gzip from the standard library, zstd with the optional zstandard
+  package);
+- resolve_ladder() maps a configured path such as showdown_tsvs/gen1ou.tsv
+  to the variant that exists, so the format tables of the pipeline keep
+  naming the .tsv files;
+- ladder_paths() lists the ladders of a directory by format.
+
+If several variants of a format exist, the most recently modified one is
+used.
+
+Run as a script, converts the ladders of a directory to another codec:
+
+Usage:
+    python ladder_files.py [--codec gzip|zstd|none] [--tsv-dir showdown_tsvs] [--keep]
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict
+
+# codec -> file suffix
+CODECS = {"none": ".tsv", "gzip": ".tsv.gz", "zstd": ".tsv.zst"}
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+CHUNK_BYTES = 64 * 1024
+
+
+def _zstandard():
+    """The optional zstandard module, with an actionable error if missing."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd-compressed ladders need the zstandard package "
+            "(pip install zstandard), or use gzip instead"
+        ) from None
+    return zstandard
+
+
+def ladder_codec(path) -> str:
+    """Codec of a ladder file from its name ('none', 'gzip' or 'zstd')."""
+    name = Path(path).name
+    for codec, suffix in CODECS.items():
+        if codec != "none" and name.endswith(suffix):
+            return codec
+    return "none"
+
+
+def ladder_format(path) -> str:
+    """Format name of a ladder file: gen9ou for gen9ou.tsv or gen9ou.tsv.gz."""
+    name = Path(path).name
+    for suffix in (CODECS["gzip"], CODECS["zstd"], CODECS["none"]):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return Path(path).stem
+
+
+def ladder_file(tsv_dir, format_name: str, codec: str = "none") -> Path:
+    """Path of a format's ladder stored with a codec."""
+    return Path(tsv_dir) / f"{format_name}{CODECS[codec]}"
+
+
+def _mtime_ns(path: Path):
+    """Modification time of a file, or None if it does not exist (anymore)."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def resolve_ladder(path) -> Path:
+    """
+    The existing variant of a ladder path.
+
+    Args:
+        path: Path of any variant, e.g. showdown_tsvs/gen1ou.tsv
+
+    Returns:
+        The newest existing variant of the same format, or the path itself
+        if none exists
+    """
+    path = Path(path)
+    if path.exists() and ladder_codec(path) != "none":
+        return path
+    newest, newest_mtime = path, None
+    for codec in CODECS:
+        variant = ladder_file(path.parent, ladder_format(path), codec)
+        mtime = _mtime_ns(variant)
+        if mtime is not None and (newest_mtime is None or mtime > newest_mtime):
+            newest, newest_mtime = variant, mtime
+    return newest
+
+
+def ladder_paths(tsv_dir) -> Dict[str, Path]:
+    """
+    Format -> ladder file of every ladder in a directory (newest variant).
+
+    Files removed between the listing and their stat (fetch_ladders.py
+    unlinks the other variants of a format it just replaced) are skipped.
+    """
+    newest: Dict[str, tuple] = {}
+    for path in sorted(Path(tsv_dir).iterdir()) if Path(tsv_dir).is_dir() else []:
+        if path.name.startswith(".") or not any(
+            path.name.endswith(s) for s in CODECS.values()
+        ):
+            continue
+        mtime = _mtime_ns(path)
+        if mtime is None:
+            continue
+        format_name = ladder_format(path)
+        if format_name not in newest or mtime > newest[format_name][0]:
+            newest[format_name] = (mtime, path)
+    return {format_name: path for format_name, (_, path) in newest.items()}
+
+
+def open_ladder(path, mode: str = "rb"):
+    """
+    Open a ladder file, decompressing while reading.
+
+    Args:
+        path: Ladder path, resolved with resolve_ladder
+        mode: 'rb' for bytes, 'r' or 'rt' for UTF-8 text
+
+    Returns:
+        File object to use as a context manager
+    """
+    path = resolve_ladder(path)
+    binary = "b" in mode
+    text = {} if binary else {"encoding": "utf-8"}
+    mode = "rb" if binary else "rt"
+    codec = ladder_codec(path)
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(path, mode, **text)
+    if codec == "zstd":
+        return _zstandard().open(path, mode, **text)
+    return open(path, mode, **text)
+
+
+def read_ladder_bytes(path) -> bytes:
+    """Decompressed content of a ladder file."""
+    with open_ladder(path) as f:
+        return f.read()
+
+
+def ladder_digest(path) -> str:
+    """SHA-256 of a ladder's decompressed content, the same for every codec."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open_ladder(path) as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    decompress = compress
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def compressor(codec: str):
+    """Streaming compressor (compress() / flush()) writing a codec's file format."""
+    if codec == "gzip":
+        import zlib
+
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return _Identity()
+
+
+def decompressor(codec: str):
+    """Streaming decompressor (decompress() / flush()) of a codec's data."""
+    if codec == "gzip":
+        import zlib
+
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if codec == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj()
+    return _Identity()
+
+
+def convert_ladder(path, codec: str, keep: bool = False) -> Path:
+    """
+    Rewrite a ladder with another codec, streaming, next to the original.
+
+    The new file is written to a temporary file and renamed into place;
+    the original is removed unless keep is set.
+
+    Returns:
+        Path of the converted ladder
+    """
+    path = Path(path)
+    target = ladder_file(path.parent, ladder_format(path), codec)
+    if target == path:
+        return path
+    tmp = target.with_name(f".{target.name}.tmp")
+    encoder = compressor(codec)
+    try:
+        with open_ladder(path) as src, open(tmp, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_BYTES), b""):
+                dst.write(encoder.compress(chunk))
+            dst.write(encoder.flush())
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if not keep:
+        path.unlink()
+    return target
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compress or decompress ladder TSVs")
+    parser.add_argument("--codec", choices=list(CODECS), default="gzip")
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument("--formats", nargs="+", default=None)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the original files"
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"LADDER STORAGE ({args.codec.upper()})")
+    print("=" * 70)
+
+    paths = ladder_paths(args.tsv_dir)
+    if args.formats:
+        paths = {f: p for f, p in paths.items() if f in args.formats}
+    if not paths:
+        print(f"⚠️  No ladder found in {args.tsv_dir}")
+        return False
+
+    before = after = 0
+    try:
+        for format_name, path in paths.items():
+            size = path.stat().st_size
+            target = convert_ladder(path, args.codec, keep=args.keep)
+            new_size = target.stat().st_size
+            before, after = before + size, after + new_size
+            print(f"✓ {path.name:<28} {size:>10,} -> {target.name:<28} {new_size:>10,} bytes")
+    except ImportError as e:
+        print(f"❌ {e}")
+        return False
+
+    print(f"\n✅ {before:,} -> {after:,} bytes ({before / max(after, 1):.1f}x)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
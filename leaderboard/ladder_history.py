@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Append-only history of ladder snapshots in a local SQLite database.
+
+The ladder TSVs are overwritten in place, so the only record of how a player
+or a matchup evolved used to be archived copies of the files. This store
+ingests every snapshot of a TSV as normalized rows keyed by the snapshot:
+
+- snapshots: one row per ingested file (format, taken_at, content digest);
+- players:   one row per player of a snapshot (ratings, W/L/T, file order);
+- matchups:  one row per (player, opponent) record of the player's H2H_Data.
+
+Snapshots are never updated or deleted; ingesting a file whose content is
+already stored for its format is a no-op. Indexes cover "player X over time",
+"matchup X-Y over time" and loading one snapshot, and history_matrix rebuilds
+the HeadToHeadMatrix of any snapshot without the TSV.
+
+H2H_Data is cumulative; interval_games differences successive snapshots
+matchup by matchup to recover the games played in each interval. A record
+that went down (the account was reset) restarts from zero. history_matrix
+can attach these intervals to the matrix, so fit_logistic(half_life=...)
+weights recent games more than old ones, and whole_history_rating feeds them
+to WholeHistoryRating as one period per interval.
+
+Usage:
+    python ladder_history.py ingest [--formats F ...] [--taken-at ISO]
+    python ladder_history.py snapshots <format>
+    python ladder_history.py player <format> <username>
+    python ladder_history.py matchup <format> <username> <opponent>
+    python ladder_history.py intervals <format>
+    python ladder_history.py rankings <format> --half-life DAYS [--min-games N]
+    python ladder_history.py whr <format> [--w2 ELO2_PER_DAY] [--min-games N]
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import ladder_paths, read_ladder_bytes, resolve_ladder
+
+DEFAULT_DB = "ladder_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    format TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    UNIQUE (format, digest)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_time ON snapshots (format, taken_at);
+
+CREATE TABLE IF NOT EXISTS players (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    position INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    h2h_key TEXT NOT NULL,
+    elo REAL,
+    glicko REAL,
+    rating_deviation REAL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, position)
+);
+CREATE INDEX IF NOT EXISTS players_by_username ON players (username, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS matchups (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, player, opponent)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS matchups_by_pair ON matchups (player, opponent, snapshot_id);
+"""
+
+
+def h2h_key(username: str) -> str:
+    """H2H_Data key of a username (lowercase alphanumerics)."""
+    return "".join(c for c in username.lower() if c.isalnum())
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _count(value) -> Optional[int]:
+    number = _number(value)
+    return None if number is None else int(number)
+
+
+class LadderHistory:
+    """SQLite store of ladder snapshots (see the module docstring)."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "LadderHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def ingest(
+        self, format_name: str, tsv_path: str, taken_at: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Store one snapshot of a ladder TSV.
+
+        Args:
+            format_name: Format of the ladder (e.g. 'gen9ou')
+            tsv_path: Path to the TSV file (plain, .tsv.gz or .tsv.zst)
+            taken_at: ISO timestamp of the snapshot (default: the file's
+                modification time, UTC)
+
+        Returns:
+            Id of the new snapshot, or None if this content is already stored
+            for the format
+        """
+        import csv
+
+        tsv_path = resolve_ladder(tsv_path)
+        # Hashed decompressed, so recompressing a ladder stores nothing new
+        content = read_ladder_bytes(tsv_path)
+        digest = hashlib.sha256(content).hexdigest()
+        if taken_at is None:
+            taken_at = datetime.fromtimestamp(
+                tsv_path.stat().st_mtime, timezone.utc
+            ).isoformat()
+
+        player_rows, matchup_rows = [], []
+        reader = csv.DictReader(content.decode("utf-8").splitlines(), delimiter="\t")
+        for position, row in enumerate(reader):
+            username = row["Username"]
+            try:
+                records = json.loads(row.get("H2H_Data") or "{}")
+            except json.JSONDecodeError:
+                records = {}
+            totals = [sum(r.get(k, 0) for r in records.values()) for k in "wlt"]
+            # Same W/L/T as HeadToHeadMatrix: the record columns when the
+            # export has them, the H2H totals otherwise
+            record = [_count(row.get(col)) for col in ("W", "L", "T")]
+            if None in record:
+                record = totals
+            player_rows.append(
+                (
+                    position,
+                    username,
+                    h2h_key(username),
+                    _number(row.get("Elo")),
+                    _number(row.get("Glicko")),
+                    _number(row.get("Rating_Deviation")),
+                    *record,
+                )
+            )
+            matchup_rows.extend(
+                (username, opponent, r.get("w", 0), r.get("l", 0), r.get("t", 0))
+                for opponent, r in records.items()
+            )
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO snapshots (format, taken_at, source, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (format_name, taken_at, str(tsv_path), digest),
+            )
+            if not cursor.rowcount:
+                return None
+            snapshot_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(snapshot_id, *row) for row in player_rows],
+            )
+            self.conn.executemany(
+                "INSERT INTO matchups VALUES (?, ?, ?, ?, ?, ?)",
+                [(snapshot_id, *row) for row in matchup_rows],
+            )
+        return snapshot_id
+
+    def snapshots(self, format_name: str) -> List[Dict[str, object]]:
+        """Snapshots of a format, oldest first."""
+        rows = self.conn.execute(
+            "SELECT id, taken_at, source, digest, "
+            "(SELECT COUNT(*) FROM players WHERE snapshot_id = s.id) "
+            "FROM snapshots s WHERE format = ? ORDER BY taken_at, id",
+            (format_name,),
+        )
+        return [
+            {"id": r[0], "taken_at": r[1], "source": r[2], "digest": r[3], "players": r[4]}
+            for r in rows
+        ]
+
+    def snapshot_at(self, format_name: str, taken_at: Optional[str] = None) -> Optional[int]:
+        """Id of the latest snapshot of a format taken at or before `taken_at`."""
+        row = self.conn.execute(
+            "SELECT id FROM snapshots WHERE format = ? AND taken_at <= ? "
+            "ORDER BY taken_at DESC, id DESC LIMIT 1",
+            (format_name, taken_at or "9999"),
+        ).fetchone()
+        return row[0] if row else None
+
+    def player_history(self, format_name: str, username: str) -> List[Dict[str, object]]:
+        """Ratings and record of one player in every snapshot that lists them."""
+        rows = self.conn.execute(
+            "SELECT s.id, s.taken_at, p.elo, p.glicko, p.rating_deviation, "
+            "p.wins, p.losses, p.ties "
+            "FROM players p JOIN snapshots s ON s.id = p.snapshot_id "
+            "WHERE p.username = ? AND s.format = ? ORDER BY s.taken_at, s.id",
+            (username, format_name),
+        )
+        fields = ["snapshot_id", "taken_at", "elo", "glicko", "rating_deviation"]
+        return [
+            {**dict(zip(fields, r[:5])), "wins": r[5], "losses": r[6], "ties": r[7]}
+            for r in rows
+        ]
+
+    def matchup_history(
+        self, format_name: str, username: str, opponent: str
+    ) -> List[Dict[str, object]]:
+        """
+        Record of `username` against `opponent` in every snapshot where they
+        had played, as stored in the first player's H2H_Data.
+        """
+        rows = self.conn.execute(
+            "SELECT s.id, s.taken_at, m.wins, m.losses, m.ties "
+            "FROM matchups m JOIN snapshots s ON s.id = m.snapshot_id "
+            "WHERE m.player = ? AND m.opponent = ? AND s.format = ? "
+            "ORDER BY s.taken_at, s.id",
+            (username, h2h_key(opponent), format_name),
+        )
+        fields = ["snapshot_id", "taken_at", "wins", "losses", "ties"]
+        return [dict(zip(fields, r)) for r in rows]
+
+    def interval_games(self, format_name: str, until: Optional[int] = None):
+        """
+        Games played in each interval between snapshots, per matchup.
+
+        Successive records of the same (player, opponent) are differenced in
+        one vectorized pass over the sorted matchup rows. A pair that skips
+        snapshots is differenced against its last stored record. The first
+        record of a pair counts as played in its first interval, and so does
+        a record where any of wins, losses or ties went down: the account was
+        reset and the counts restarted from zero. Intervals without games are
+        left out.
+
+        Args:
+            format_name: Format of the ladder
+            until: Only use snapshots up to this one (default: all)
+
+        Returns:
+            DataFrame with one row per (interval, player, opponent):
+            snapshot_id and taken_at of the snapshot closing the interval,
+            player, opponent (H2H key), wins, losses, ties of the player in
+            the interval, reset (the record restarted there) and epoch
+            (number of resets of the pair so far)
+        """
+        import numpy as np
+        import pandas as pd
+
+        query = (
+            "SELECT s.id AS snapshot_id, s.taken_at, m.player, m.opponent, "
+            "m.wins, m.losses, m.ties "
+            "FROM matchups m JOIN snapshots s ON s.id = m.snapshot_id "
+            "WHERE s.format = ?"
+        )
+        params = [format_name]
+        if until is not None:
+            (taken_at,) = self.conn.execute(
+                "SELECT taken_at FROM snapshots WHERE id = ?", (until,)
+            ).fetchone()
+            query += " AND (s.taken_at < ? OR (s.taken_at = ? AND s.id <= ?))"
+            params += [taken_at, taken_at, until]
+        rows = pd.read_sql_query(
+            query + " ORDER BY m.player, m.opponent, s.taken_at, s.id",
+            self.conn,
+            params=params,
+        )
+
+        cumulative = rows[["wins", "losses", "ties"]].to_numpy()
+        pair = rows[["player", "opponent"]].to_numpy()
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (pair[1:] != pair[:-1]).any(axis=1)
+        previous = np.roll(cumulative, 1, axis=0)
+        reset = ~first & (cumulative < previous).any(axis=1)
+        restart = first | reset
+        played = np.where(restart[:, None], cumulative, cumulative - previous)
+
+        intervals = rows[["snapshot_id", "taken_at", "player", "opponent"]].copy()
+        intervals[["wins", "losses", "ties"]] = played
+        intervals["reset"] = reset
+        pair_id = np.cumsum(first) - 1
+        resets = np.cumsum(reset)
+        intervals["epoch"] = resets - resets[first][pair_id]
+        return intervals[played.any(axis=1)].reset_index(drop=True)
+
+    def snapshot_frame(self, snapshot_id: int):
+        """
+        Ladder rows of a snapshot, in file order, with the columns
+        HeadToHeadMatrix.from_frame expects (H2H_Data decoded).
+        """
+        import pandas as pd
+
+        players = pd.read_sql_query(
+            "SELECT username AS Username, elo AS Elo, glicko AS Glicko, "
+            "rating_deviation AS Rating_Deviation, wins AS W, losses AS L, ties AS T "
+            "FROM players WHERE snapshot_id = ? ORDER BY position",
+            self.conn,
+            params=(snapshot_id,),
+        )
+        records: Dict[str, dict] = {}
+        for player, opponent, w, l, t in self.conn.execute(
+            "SELECT player, opponent, wins, losses, ties FROM matchups "
+            "WHERE snapshot_id = ?",
+            (snapshot_id,),
+        ):
+            records.setdefault(player, {})[opponent] = {"w": w, "l": l, "t": t}
+        players["H2H_Data"] = [records.get(u, {}) for u in players["Username"]]
+        return players
+
+    def history_matrix(
+        self, snapshot_id: int, min_games: int = 10, intervals: bool = False
+    ):
+        """
+        HeadToHeadMatrix of a stored snapshot (same as loading its TSV).
+
+        Args:
+            snapshot_id: Snapshot to rebuild
+            min_games: Minimum games required to be considered in the rankings
+            intervals: Also attach the per-interval game counts since each
+                pair's last reset (HeadToHeadMatrix.set_intervals), aged in
+                days before the snapshot, for fit_logistic(half_life=...)
+        """
+        import pandas as pd
+        from leaderboard.whr import HeadToHeadMatrix
+
+        h2h = HeadToHeadMatrix.from_frame(
+            self.snapshot_frame(snapshot_id),
+            min_games=min_games,
+            filepath=f"{self.path}#snapshot={snapshot_id}",
+        )
+        if intervals:
+            format_name, taken_at = self.conn.execute(
+                "SELECT format, taken_at FROM snapshots WHERE id = ?", (snapshot_id,)
+            ).fetchone()
+            games = self.interval_games(format_name, until=snapshot_id)
+            # Only the games since the last reset are in the snapshot's record
+            last_epoch = games.groupby(["player", "opponent"])["epoch"].transform("max")
+            games = games[games["epoch"] == last_epoch]
+            ages = (
+                pd.Timestamp(taken_at) - pd.to_datetime(games["taken_at"], format="ISO8601")
+            ).dt.total_seconds() / 86400
+            h2h.set_intervals(
+                games["player"].tolist(),
+                games["opponent"].tolist(),
+                games["wins"].to_numpy(),
+                games["ties"].to_numpy(),
+                ages.to_numpy(),
+            )
+        return h2h
+
+    def whole_history_rating(
+        self, format_name: str, until: Optional[int] = None, **kwargs
+    ):
+        """
+        Whole History Rating of a format with one period per snapshot interval.
+
+        Every game is in the records of both players, so each matchup of an
+        interval is read from one side: the player whose H2H key sorts first,
+        or the only side stored. Opponent keys are mapped back to usernames
+        through the stored players. Periods are timed in days (unix time of
+        the snapshot closing the interval / 86400), so w2 is in Elo² per day;
+        a tie counts as half a win for each player.
+
+        Args:
+            format_name: Format of the ladder
+            until: Only use snapshots up to this one (default: all)
+            **kwargs: WholeHistoryRating arguments (w2, prior_elo_std, ...)
+
+        Returns:
+            WholeHistoryRating with the intervals appended, not yet fitted
+        """
+        import pandas as pd
+        from leaderboard.whole_history_rating import WholeHistoryRating
+
+        games = self.interval_games(format_name, until=until)
+        usernames = dict(
+            self.conn.execute(
+                "SELECT DISTINCT p.h2h_key, p.username "
+                "FROM players p JOIN snapshots s ON s.id = p.snapshot_id "
+                "WHERE s.format = ?",
+                (format_name,),
+            )
+        )
+        player_key = games["player"].map(h2h_key)
+        games["mirrored"] = player_key > games["opponent"]
+        games["low"] = player_key.where(~games["mirrored"], games["opponent"])
+        games["high"] = games["opponent"].where(~games["mirrored"], player_key)
+        games = games.sort_values(["snapshot_id", "low", "high", "mirrored"])
+        games = games.drop_duplicates(["snapshot_id", "low", "high"])
+
+        opponent = games["opponent"].map(usernames).fillna(games["opponent"])
+        half_ties = games["ties"] / 2
+        times = (
+            pd.to_datetime(games["taken_at"], format="ISO8601", utc=True)
+            - pd.Timestamp(0, tz="UTC")
+        ).dt.total_seconds() / 86400
+
+        whr = WholeHistoryRating(**kwargs)
+        periods = pd.DataFrame(
+            {
+                "time": times,
+                "player": games["player"],
+                "opponent": opponent,
+                "wins": games["wins"] + half_ties,
+                "losses": games["losses"] + half_ties,
+            }
+        )
+        for time, period in periods.groupby("time", sort=True):
+            whr.add_period(
+                time,
+                zip(period["player"], period["opponent"], period["wins"], period["losses"]),
+            )
+        return whr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local history of ladder snapshots")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Store the current ladder TSVs")
+    ingest.add_argument("--formats", nargs="+", default=None)
+    ingest.add_argument("--tsv-dir", default="showdown_tsvs")
+    ingest.add_argument("--taken-at", default=None, help="Snapshot time (ISO)")
+
+    snapshots = commands.add_parser("snapshots", help="List snapshots of a format")
+    snapshots.add_argument("format")
+
+    player = commands.add_parser("player", help="Player ratings over time")
+    player.add_argument("format")
+    player.add_argument("username")
+
+    matchup = commands.add_parser("matchup", help="Matchup record over time")
+    matchup.add_argument("format")
+    matchup.add_argument("username")
+    matchup.add_argument("opponent")
+
+    intervals = commands.add_parser("intervals", help="Games per snapshot interval")
+    intervals.add_argument("format")
+
+    rankings = commands.add_parser("rankings", help="Time-decayed BT Elo")
+    rankings.add_argument("format")
+    rankings.add_argument("--half-life", type=float, required=True, help="In days")
+    rankings.add_argument("--min-games", type=int, default=50)
+    rankings.add_argument("--top", type=int, default=20)
+
+    whr = commands.add_parser("whr", help="Time-varying Whole History Rating")
+    whr.add_argument("format")
+    whr.add_argument(
+        "--w2", type=float, default=30.0, help="Rating drift in Elo² per day"
+    )
+    whr.add_argument("--min-games", type=int, default=50)
+    whr.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    with LadderHistory(args.db) as history:
+        if args.command == "ingest":
+            paths = ladder_paths(args.tsv_dir)
+            formats = args.formats or sorted(paths)
+            for format_name in formats:
+                path = paths.get(format_name, Path(args.tsv_dir) / f"{format_name}.tsv")
+                if not path.exists():
+                    print(f"⚠️  {path} not found, skipping {format_name}")
+                    continue
+                snapshot_id = history.ingest(format_name, path, args.taken_at)
+                if snapshot_id is None:
+                    print(f"✓ {format_name}: unchanged since the last snapshot")
+                else:
+                    print(f"✓ {format_name}: stored snapshot {snapshot_id}")
+            return True
+
+        if args.command == "snapshots":
+            rows = history.snapshots(args.format)
+            for row in rows:
+                print(
+                    f"{row['id']:>5}  {row['taken_at']}  {row['players']:>4} players  "
+                    f"{row['digest'][:12]}"
+                )
+        elif args.command == "player":
+            rows = history.player_history(args.format, args.username)
+            print(f"{'Taken at':<33} {'Elo':>8} {'Glicko':>8} {'RD':>6} {'W-L-T':>12}")
+            for row in rows:
+                print(
+                    f"{row['taken_at']:<33} {row['elo'] or 0:>8.1f} "
+                    f"{row['glicko'] or 0:>8.1f} {row['rating_deviation'] or 0:>6.1f} "
+                    f"{row['wins']:>4}-{row['losses']}-{row['ties']}"
+                )
+        elif args.command == "matchup":
+            rows = history.matchup_history(args.format, args.username, args.opponent)
+            print(f"{args.username} vs {args.opponent}")
+            for row in rows:
+                print(f"{row['taken_at']:<33} {row['wins']}-{row['losses']}-{row['ties']}")
+        elif args.command == "intervals":
+            games = history.interval_games(args.format)
+            # Every game is in the records of both players
+            games["games"] = games["wins"] + games["losses"] + games["ties"]
+            rows = games.groupby(["snapshot_id", "taken_at"], sort=False).agg(
+                games=("games", "sum"), matchups=("games", "size"), resets=("reset", "sum")
+            )
+            print(f"{'Interval ending':<33} {'Games':>8} {'Matchups':>9} {'Resets':>7}")
+            for (_, taken_at), row in rows.sort_index(level=1).iterrows():
+                print(
+                    f"{taken_at:<33} {row['games'] // 2:>8} {row['matchups']:>9} "
+                    f"{row['resets']:>7}"
+                )
+            rows = rows.to_dict("records")
+        elif args.command == "whr":
+            rows = history.snapshots(args.format)
+            if rows:
+                print_whole_history_rating(history, args)
+        else:
+            rows = history.snapshots(args.format)
+            if rows:
+                print_decayed_rankings(history, rows[-1]["id"], args)
+
+        if not rows:
+            print("⚠️  No matching snapshots")
+            return False
+    return True
+
+
+def print_decayed_rankings(history: LadderHistory, snapshot_id: int, args) -> None:
+    """Compare the plain and time-decayed BT Elo of the latest snapshot."""
+    from leaderboard.whr import BradleyTerryModel
+
+    h2h = history.history_matrix(snapshot_id, args.min_games, intervals=True)
+    model = BradleyTerryModel(h2h)
+    elo = {}
+    for half_life in (None, args.half_life):
+        model.fit_logistic(
+            regularization=0.01,
+            normalize_matchups="sqrt",
+            ties="davidson",
+            decompose=True,
+            verbose=False,
+            half_life=half_life,
+        )
+        elo[half_life] = model.get_rankings_with_elo().set_index("Username")["BT_Elo"]
+    table = elo[args.half_life].sort_values(ascending=False).head(args.top)
+    print(f"\n{'Player':<28} {'Elo':>8} {'Decayed':>8} {'Change':>8}")
+    for username, decayed in table.items():
+        plain = elo[None][username]
+        print(f"{username:<28} {plain:>8.1f} {decayed:>8.1f} {decayed - plain:>+8.1f}")
+
+
+def print_whole_history_rating(history: LadderHistory, args) -> None:
+    """Current Whole History Rating of the players of a format."""
+    whr = history.whole_history_rating(args.format, w2=args.w2)
+    sweeps = whr.fit()
+    games = history.interval_games(args.format)
+    played = (games["wins"] + games["losses"] + games["ties"]).groupby(
+        games["player"]
+    ).sum()
+    ratings = {
+        username: entry
+        for username, entry in whr.get_current_ratings().items()
+        if played.get(username, 0) >= args.min_games
+    }
+    table = sorted(ratings.items(), key=lambda item: -item[1]["whr_elo"])
+    print(f"WHR fitted in {sweeps} sweeps (w2 = {args.w2:g} Elo²/day)")
+    print(f"\n{'Player':<28} {'WHR Elo':>8} {'Std':>6} {'Periods':>8} {'Last played':>12}")
+    for username, entry in table[: args.top]:
+        last = datetime.fromtimestamp(entry["last_period"] * 86400, timezone.utc)
+        print(
+            f"{username:<28} {entry['whr_elo']:>8.1f} {entry['whr_std']:>6.1f} "
+            f"{entry['n_periods']:>8} {last:%Y-%m-%d}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
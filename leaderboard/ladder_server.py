@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the server publishing the ladder TSVs.
+
+Serves GET /<format>.tsv from a directory over keep-alive HTTP/1.1 with the
+validators a static file server sends: a strong ETag (hash of the content)
+and Last-Modified (file mtime). The ladder may be stored as <format>.tsv,
+.tsv.gz or .tsv.zst; it is sent with Content-Encoding: gzip (or zstd, as
+stored) to clients accepting it, and decompressed for the others.
+Conditional requests are answered with 304 Not Modified when If-None-Match
+matches the ETag or, without If-None-Match, when the file is not newer than
+If-Modified-Since.
+
+--latency delays every response, so a local run shows the round-trip cost a
+remote refresh pays. The server counts the connections and responses it
+served, which fetch checks (check_fetch_ladders.py) use to verify connection
+reuse and 304s.
+
+In code, use it as an async context manager:
+
+    async with StandInLadderServer("showdown_tsvs", latency=0.05) as server:
+        ... fetch from server.base_url ...
+
+Usage:
+    python ladder_server.py [--port 8766] [--tsv-dir showdown_tsvs] [--latency MS]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import sys
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import (
+    ladder_codec,
+    ladder_paths,
+    read_ladder_bytes,
+    resolve_ladder,
+)
+
+REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class StandInLadderServer:
+    """Serves a TSV directory with ETag / Last-Modified validation."""
+
+    def __init__(self, tsv_dir: str = "showdown_tsvs", latency: float = 0.0):
+        """
+        Args:
+            tsv_dir: Directory whose .tsv files are served
+            latency: Seconds every response is delayed by
+        """
+        self.tsv_dir = Path(tsv_dir)
+        self.latency = latency
+        self.connections = 0
+        self.responses: Counter = Counter()  # status -> count
+        self._representations: Dict[Tuple[Path, str], tuple] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.base_url = ""
+
+    def representation(self, path: Path, encoding: str) -> Tuple[str, str, bytes]:
+        """
+        (ETag, Last-Modified, body) of a ladder sent with a content coding.
+
+        The ETag hashes the decompressed ladder, with the coding appended for
+        compressed bodies, so every representation has its own validator.
+        A ladder stored with the requested coding is sent as stored;
+        otherwise it is decompressed and, for gzip, compressed again. Cached
+        until the file's stat changes.
+        """
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._representations.get((path, encoding))
+        if cached is None or cached[0] != key:
+            stored = ladder_codec(path)
+            if encoding == stored:
+                body = path.read_bytes()
+                content = read_ladder_bytes(path) if stored != "none" else body
+            else:
+                content = read_ladder_bytes(path)
+                body = gzip.compress(content, 6) if encoding == "gzip" else content
+            tag = hashlib.sha256(content).hexdigest()[:32]
+            etag = f'"{tag}-{encoding}"' if encoding != "none" else f'"{tag}"'
+            cached = (key, etag, formatdate(stat.st_mtime, usegmt=True), body)
+            self._representations[(path, encoding)] = cached
+        return cached[1], cached[2], cached[3]
+
+    def respond(self, method: str, target: str, headers: Dict[str, str]):
+        """Status, response headers and body of one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {}, b""
+        name = unquote(urlsplit(target).path).lstrip("/")
+        path = resolve_ladder(self.tsv_dir / name)
+        if "/" in name or not name.endswith(".tsv") or not path.is_file():
+            return 404, {}, b""
+
+        accepted = {
+            coding.split(";")[0].strip().lower()
+            for coding in headers.get("accept-encoding", "").split(",")
+            if not coding.replace(" ", "").endswith(";q=0")
+        }
+        stored = ladder_codec(path)
+        if stored != "none" and stored in accepted:
+            encoding = stored
+        else:
+            encoding = "gzip" if "gzip" in accepted else "none"
+        etag, last_modified, body = self.representation(path, encoding)
+
+        fresh = {"ETag": etag, "Last-Modified": last_modified, "Vary": "Accept-Encoding"}
+        if "if-none-match" in headers:
+            tags = [t.strip() for t in headers["if-none-match"].split(",")]
+            if etag in tags or "*" in tags:
+                return 304, fresh, b""
+        elif "if-modified-since" in headers:
+            try:
+                since = parsedate_to_datetime(headers["if-modified-since"])
+                if parsedate_to_datetime(last_modified) <= since:
+                    return 304, fresh, b""
+            except (TypeError, ValueError):
+                pass  # Unparsable dates are ignored, as RFC 9110 requires
+
+        extra = {**fresh, "Content-Type": "text/tab-separated-values"}
+        if encoding != "none":
+            extra["Content-Encoding"] = encoding
+        return 200, extra, body
+
+    async def handle(self, reader, writer) -> None:
+        """Serve one keep-alive HTTP/1.1 connection."""
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                status, extra, body = self.respond(method, target, headers)
+                self.responses[status] += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                for key, value in extra.items():
+                    head += f"{key}: {value}\r\n"
+                head += (
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n"
+                )
+                writer.write(head.encode() + (body if method == "GET" else b""))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening (port 0 picks a free port); returns the base URL."""
+        self._server = await asyncio.start_server(self.handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections end their handlers by closing
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StandInLadderServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+
+async def serve(tsv_dir: str, host: str, port: int, latency: float) -> None:
+    server = StandInLadderServer(tsv_dir, latency)
+    base_url = await server.start(host, port)
+    names = [p.name for p in ladder_paths(tsv_dir).values()]
+    print(f"✓ Serving {len(names)} TSV(s) from {tsv_dir}/ on {base_url}/")
+    print(f"  {', '.join(names)}")
+    await server._server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ladder TSVs locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Milliseconds added to every response",
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("STAND-IN LADDER SERVER")
+    print("=" * 70)
+    if not Path(args.tsv_dir).is_dir():
+        print(f"❌ {args.tsv_dir} not found")
+        return False
+    try:
+        asyncio.run(serve(args.tsv_dir, args.host, args.port, args.latency / 1000))
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Load test of rating_service.py.
+
+Opens --concurrency keep-alive connections and issues a mix of rankings,
+player lookup, single and batch prediction requests for --duration seconds,
+then reports throughput and latency percentiles per request kind. With
+--reload-every, the TSVs of the tested formats are touched periodically so
+the service refits them during the test; any failed request fails the run.
+
+Usage:
+    python load_test_service.py [--spawn] [--concurrency C] [--duration S]
+                                [--reload-every S] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import quote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import resolve_ladder
+
+SERVICE = Path(__file__).resolve().parent / "rating_service.py"
+
+
+async def request(reader, writer, host: str, method: str, path: str, body=None):
+    """One request on a keep-alive connection; returns (status, parsed JSON)."""
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+        ).encode()
+        + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def fetch(host: str, port: int, path: str):
+    """Single request on a fresh connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await request(reader, writer, host, "GET", path)
+    finally:
+        writer.close()
+
+
+async def wait_for_service(host: str, port: int, timeout: float) -> Dict[str, dict]:
+    """Poll /health until at least one format is loaded and none is loading."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, health = await fetch(host, port, "/health")
+            if health["formats"] and not health["reloading"]:
+                return health["formats"]
+        except (OSError, ValueError, IndexError):
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"Service on {host}:{port} not ready after {timeout:.0f}s")
+
+
+def make_requests(players: Dict[str, List[str]], batch_size: int, rng):
+    """Random request of the mix: (kind, method, path, body)."""
+    fmt = rng.choice(list(players))
+    names = players[fmt]
+    kind = rng.choice(["rankings", "player", "predict", "batch"])
+    if kind == "rankings":
+        return kind, "GET", f"/formats/{fmt}/rankings", None
+    if kind == "player":
+        return kind, "GET", f"/formats/{fmt}/players/{quote(rng.choice(names))}", None
+    if kind == "predict":
+        a, b = rng.sample(names, 2)
+        return kind, "GET", f"/formats/{fmt}/predict?a={quote(a)}&b={quote(b)}", None
+    pairs = [rng.sample(names, 2) for _ in range(batch_size)]
+    return kind, "POST", f"/formats/{fmt}/predict", {"pairs": pairs}
+
+
+async def client(host, port, players, batch_size, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            kind, method, path, body = make_requests(players, batch_size, rng)
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, method, path, body)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            if status != 200:
+                errors.append((kind, status, path))
+    finally:
+        writer.close()
+
+
+async def toucher(paths: List[Path], interval: float, deadline: float, touched: List[int]):
+    """Bump the mtime of the TSVs so the service reloads them."""
+    while time.perf_counter() + interval < deadline:
+        await asyncio.sleep(interval)
+        for path in paths:
+            os.utime(path)
+        touched[0] += 1
+
+
+async def run(args) -> Tuple[Dict[str, List[float]], list, float, int]:
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    formats = await wait_for_service(host, port, args.startup_timeout)
+    players = {}
+    for fmt in formats:
+        _, rankings = await fetch(host, port, f"/formats/{fmt}/rankings")
+        if len(rankings["players"]) >= 2:
+            players[fmt] = [row["username"] for row in rankings["players"]]
+    print(f"✓ Service ready: {', '.join(f'{f} ({len(p)})' for f, p in players.items())}")
+
+    latencies, errors, touched = {}, [], [0]
+    start = time.perf_counter()
+    deadline = start + args.duration
+    tasks = [
+        client(host, port, players, args.batch_size, deadline, k, latencies, errors)
+        for k in range(args.concurrency)
+    ]
+    if args.reload_every:
+        tsv_paths = [resolve_ladder(Path(args.tsv_dir) / f"{fmt}.tsv") for fmt in players]
+        tasks.append(toucher(tsv_paths, args.reload_every, deadline, touched))
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - start, touched[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the rating service")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start rating_service.py on --url for the duration of the test",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="Pairs per batch prediction"
+    )
+    parser.add_argument(
+        "--reload-every",
+        type=float,
+        default=0.0,
+        help="Touch the TSVs every S seconds to force reloads (0: never)",
+    )
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RATING SERVICE LOAD TEST")
+    print("=" * 70)
+    print(
+        f"{args.concurrency} connections, {args.duration:g}s, "
+        f"batch size {args.batch_size}, reload every {args.reload_every or '-'}s"
+    )
+
+    service = None
+    if args.spawn:
+        url = urlsplit(args.url)
+        service = subprocess.Popen(
+            [
+                sys.executable,
+                str(SERVICE),
+                "--host",
+                url.hostname,
+                "--port",
+                str(url.port or 80),
+                "--tsv-dir",
+                args.tsv_dir,
+                "--poll-interval",
+                "0.5",
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        latencies, errors, elapsed, reloads = asyncio.run(run(args))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{'Request':<10} {'Count':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for kind, values in sorted(latencies.items()):
+        ms = sorted(v * 1000 for v in values)
+        q = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+        print(
+            f"{kind:<10} {len(ms):>8} {q[49]:>8.2f} {q[94]:>8.2f} {q[98]:>8.2f} {ms[-1]:>8.2f}"
+        )
+    print(f"\nThroughput: {total / elapsed:,.0f} requests/s ({total:,} in {elapsed:.1f}s)")
+    if args.reload_every:
+        print(f"TSV touches during the test: {reloads}")
+
+    if errors:
+        print(f"\n❌ {len(errors)} failed requests, e.g. {errors[:3]}")
+        return False
+    print("\n✅ No failed requests")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
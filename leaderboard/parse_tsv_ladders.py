@@ -11,8 +11,11 @@ import json
 import csv
 import os
 import re
+import sys
 from datetime import datetime, timezone
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 def format_username(username):
     """Format username for display with improved naming conventions."""
@@ -82,16 +85,52 @@ def format_username(username):
     }
 
 
-def parse_tsv_file(filename):
+STARTER_KIT_FAMILIES = {"PAC-MM-": "Metamon", "PAC-BH-": "Heuristic", "PAC-PC-": "PokéChamp"}
+
+
+def agent_family(username):
+    """Return the starter-kit family of a username (e.g. 'Metamon'), or None."""
+    for prefix, family in STARTER_KIT_FAMILIES.items():
+        if username.startswith(prefix):
+            return family
+    return None
+
+
+# Ladder files parsed into track1.json, by format
+LADDER_FILES = {
+    "gen1ou": "gen1ou.tsv",
+    "gen2ou": "gen2ou.tsv",
+    "gen3ou": "gen3ou.tsv",
+    "gen4ou": "gen4ou.tsv",
+    "gen9ou": "gen9ou.tsv",
+}
+
+
+def record_totals(raw_h2h):
+    """Sum wins and losses over a raw H2H_Data JSON string."""
+    try:
+        records = json.loads(raw_h2h) if raw_h2h else {}
+    except json.JSONDecodeError:
+        return "0", "0"
+    wins = sum(r.get("w", 0) for r in records.values())
+    losses = sum(r.get("l", 0) for r in records.values())
+    return str(wins), str(losses)
+
+
+def parse_tsv_file(filename, verbose=True):
     """Parse a TSV file and extract player data."""
+    from leaderboard.ladder_files import open_ladder, resolve_ladder
+
     players = []
 
-    if not os.path.exists(filename):
+    filename = resolve_ladder(filename)
+    if not filename.exists():
         print(f"❌ File not found: {filename}")
         return players
 
     try:
-        with open(filename, "r", encoding="utf-8") as f:
+        # Compressed ladders (.tsv.gz / .tsv.zst) are decompressed while read
+        with open_ladder(filename, "r") as f:
             # Read the TSV file
             reader = csv.DictReader(f, delimiter="\t")
 
@@ -105,8 +144,12 @@ def parse_tsv_file(filename):
 
                 # Extract data from the row
                 elo = row.get("Elo", "").strip()
-                wins = row.get("W", "").strip()
-                losses = row.get("L", "").strip()
+                wins = (row.get("W") or "").strip()
+                losses = (row.get("L") or "").strip()
+                if "W" not in row and row.get("H2H_Data"):
+                    # Some ladder exports (gen1ou, gen9ou) omit the record
+                    # columns; recover them from the per-opponent records
+                    wins, losses = record_totals(row["H2H_Data"])
                 glicko = row.get("Glicko", "").strip()
                 gxe = row.get("GXE", "").strip()
                 rating_deviation = row.get("Rating_Deviation", "").strip()
@@ -127,10 +170,10 @@ def parse_tsv_file(filename):
                 # Format GXE as percentage if needed
                 if gxe and gxe not in ["-", ""]:
                     if not gxe.endswith("%"):
-                    try:
-                        gxe_float = float(gxe)
-                        gxe = f"{gxe_float:.2f}%"
-                    except (ValueError, TypeError):
+                        try:
+                            gxe_float = float(gxe)
+                            gxe = f"{gxe_float:.2f}%"
+                        except (ValueError, TypeError):
                             gxe = "-"
                 else:
                     gxe = "-"
@@ -147,7 +190,8 @@ def parse_tsv_file(filename):
 
                 players.append(player_data)
                 rank += 1
-                print(f"✅ Found: {username} (ELO: {elo})")
+                if verbose:
+                    print(f"✅ Found: {username} (ELO: {elo})")
 
     except Exception as e:
         print(f"❌ Error parsing {filename}: {e}")
@@ -155,22 +199,33 @@ def parse_tsv_file(filename):
     return players
 
 
+def format_players(players):
+    """Turn parse_tsv_file rows into the track1.json display entries."""
+    formatted_players = []
+    for player in players:
+        username_data = format_username(player["username"])
+        if username_data:
+            formatted_players.append(
+                {
+                    "rank": player["rank"],
+                    "username": username_data,
+                    "elo": player["elo"],
+                    "gxe": player["gxe"],
+                    "glicko": player["glicko"],
+                    "wins": player["wins"],
+                    "losses": player["losses"],
+                }
+            )
+    return formatted_players
+
+
 def main():
     """Main function."""
     print("🎯 Parsing real TSV ladder files...")
 
-    # Files to parse (all available formats)
-    files_to_parse = {
-        "gen1ou": "gen1ou.tsv",
-        "gen2ou": "gen2ou.tsv",
-        "gen3ou": "gen3ou.tsv",
-        "gen4ou": "gen4ou.tsv",
-        "gen9ou": "gen9ou.tsv",
-    }
-
     all_data = {}
 
-    for format_name, filename in files_to_parse.items():
+    for format_name, filename in LADDER_FILES.items():
         print(f"\n📊 Parsing {format_name} from {filename}...")
         players = parse_tsv_file(os.path.join("showdown_tsvs", filename))
 
@@ -178,23 +233,7 @@ def main():
             print(f"✅ Found {len(players)} PAC users in {format_name}")
 
             # Format the data for display
-            formatted_players = []
-            for player in players:
-                username_data = format_username(player["username"])
-                if username_data:
-                    formatted_players.append(
-                        {
-                            "rank": player["rank"],
-                            "username": username_data,
-                            "elo": player["elo"],
-                            "gxe": player["gxe"],
-                            "glicko": player["glicko"],
-                            "wins": player["wins"],
-                            "losses": player["losses"],
-                        }
-                    )
-
-            all_data[format_name] = formatted_players
+            all_data[format_name] = format_players(players)
         else:
             print(f"❌ No PAC users found in {format_name}")
             all_data[format_name] = []
@@ -209,8 +248,9 @@ def main():
         "source": "tsv_files",
     }
 
-    with open(output_file, "w") as f:
-        json.dump(output_data, f, indent=2)
+    from leaderboard.shard_track1 import write_leaderboard
+
+    write_leaderboard(output_data, output_file, indent=2)
 
     total_players = sum(len(players) for players in all_data.values())
     print(f"\n💾 Saved {total_players} players to {output_file}")
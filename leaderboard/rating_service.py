@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Local asyncio HTTP service answering rating queries from in-memory models.
+
+Every format in showdown_tsvs/ is fit once with BradleyTerryModel (bootstrap,
+same settings as compute_whr_rankings.py) and kept in memory, so queries cost
+a table lookup or one vectorized prediction instead of a pipeline run.
+
+The directory is polled for changed TSVs. A changed format is refit in a
+worker process, warm-started from its previous parameters, and its snapshot
+is swapped in only once the fit is done: requests keep being answered from
+the previous snapshot meanwhile, and formats that did not change are not
+touched.
+
+Endpoints (JSON):
+    GET  /health                              formats, players, versions
+    GET  /formats/<format>/rankings           ?offset=0&limit=N
+    GET  /formats/<format>/players/<username> one player's rating and CI
+    POST /formats/<format>/players            {"usernames": [...]}
+    GET  /formats/<format>/predict            ?a=<username>&b=<username>
+    POST /formats/<format>/predict            {"pairs": [[a, b], ...], "confidence": 0.95}
+
+Predictions return P(a beats b) with a bootstrap percentile interval.
+
+Usage:
+    python rating_service.py [--port 8765] [--min-games 50] [--n-bootstrap 50]
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import ladder_paths
+
+# Fit settings of compute_whr_rankings.compute_whr_for_format
+FIT_SETTINGS = {
+    "regularization": 0.01,
+    "normalize_matchups": "sqrt",
+    "ties": "davidson",
+    "decompose": True,
+}
+
+# rankings_table column -> response field
+PLAYER_FIELDS = {
+    "Rank": "whr_rank",
+    "Username": "username",
+    "BT_Elo": "whr_elo",
+    "Elo_Std": "whr_std",
+    "Elo_CI_Lower": "whr_ci_lower",
+    "Elo_CI_Upper": "whr_ci_upper",
+    "BT_Strength": "bt_strength",
+    "Total_Wins": "wins",
+    "Total_Losses": "losses",
+    "Win_Rate": "win_rate",
+    "Elo": "elo",
+}
+
+MAX_PAIRS = 100_000  # Per batch prediction request
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def fit_format(
+    tsv_path: str,
+    min_games: int,
+    n_bootstrap: int,
+    warm_start: Optional[Tuple[List[str], object]] = None,
+):
+    """
+    Fit one format with bootstrap (run in a worker process).
+
+    Args:
+        tsv_path: Ladder TSV of the format
+        min_games: Minimum games of rated players
+        n_bootstrap: Bootstrap replicates for the intervals
+        warm_start: (usernames, params) of the previous fit; players still
+            present start from their previous log-strength, new ones from 0
+
+    Returns:
+        (model, bootstrap_results), or None with fewer than 3 players
+    """
+    from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
+
+    h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=min_games)
+    if len(h2h.players) < 3:
+        return None
+
+    model = BradleyTerryModel(h2h)
+    x0 = model.warm_start_params(*warm_start) if warm_start is not None else None
+    results = model.fit_bootstrap(
+        n_bootstrap=n_bootstrap,
+        method="resample",
+        fit_method="lbfgs",
+        verbose=False,
+        batch_size=n_bootstrap,
+        x0=x0,
+        **FIT_SETTINGS,
+    )
+    return model, results
+
+
+class FormatSnapshot:
+    """Fitted state of one format; replaced wholesale on reload."""
+
+    def __init__(self, name: str, mtime: float, version: int, model, results):
+        self.name = name
+        self.mtime = mtime
+        self.version = version
+        self.loaded_at = time.time()
+        self.model = model
+        self.results = results
+
+        table = model.rankings_table(
+            results, columns=list(PLAYER_FIELDS), as_frame=False
+        )
+        fields = list(PLAYER_FIELDS.values())
+        self.rows = [
+            dict(zip(fields, values))
+            for values in zip(*(table[c].tolist() for c in PLAYER_FIELDS))
+        ]
+        self.by_username = {row["username"]: row for row in self.rows}
+        self.rankings_body = json.dumps(
+            {"format": name, "version": version, "players": self.rows}
+        ).encode()
+
+    @property
+    def warm_start(self):
+        return self.model.h2h.get_usernames(), self.model.params
+
+    def player(self, username: str) -> Dict[str, object]:
+        try:
+            return self.by_username[username]
+        except KeyError:
+            raise HTTPError(404, f"Unknown player in {self.name}: {username}")
+
+    def predict(self, pairs, confidence: float = 0.95) -> Dict[str, object]:
+        if len(pairs) > MAX_PAIRS:
+            raise HTTPError(413, f"At most {MAX_PAIRS} pairs per request")
+        try:
+            players_i = [a for a, _ in pairs]
+            players_j = [b for _, b in pairs]
+        except (TypeError, ValueError):
+            raise HTTPError(400, "pairs must be a list of [player, opponent]")
+        if not all(isinstance(name, str) for name in players_i + players_j):
+            raise HTTPError(400, "pairs must be a list of [player, opponent]")
+        for name in players_i + players_j:
+            if name not in self.by_username:
+                raise HTTPError(404, f"Unknown player in {self.name}: {name}")
+        if not 0 < confidence < 1:
+            raise HTTPError(400, "confidence must be in (0, 1)")
+
+        prediction = self.model.predict_win_probabilities(
+            players_i, players_j, self.results, confidence=confidence
+        )
+        return {
+            "format": self.name,
+            "version": self.version,
+            "confidence": confidence,
+            **{key: values.tolist() for key, values in prediction.items()},
+        }
+
+
+class RatingService:
+    """Holds one FormatSnapshot per format and answers HTTP requests."""
+
+    def __init__(
+        self,
+        tsv_dir: str = "showdown_tsvs",
+        min_games: int = 50,
+        n_bootstrap: int = 50,
+        poll_interval: float = 2.0,
+        workers: int = 1,
+    ):
+        self.tsv_dir = Path(tsv_dir)
+        self.min_games = min_games
+        self.n_bootstrap = n_bootstrap
+        self.poll_interval = poll_interval
+        self.snapshots: Dict[str, FormatSnapshot] = {}
+        self.skipped: Dict[str, float] = {}  # Too few players, by mtime
+        self.reloading = set()
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    # ----------------------------------------------------------------- reload
+
+    def _changed_formats(self) -> Dict[str, Tuple[Path, float]]:
+        changed = {}
+        for name, path in ladder_paths(self.tsv_dir).items():
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue  # Replaced by another variant since the listing
+            current = self.snapshots.get(name)
+            # A failed or skipped fit is only retried once the file changes
+            seen = self.skipped.get(name, current.mtime if current else None)
+            if seen != mtime and name not in self.reloading:
+                changed[name] = (path, mtime)
+        return changed
+
+    async def reload(self, name: str, path: Path, mtime: float) -> None:
+        """Refit one format in the pool and swap its snapshot in."""
+        self.reloading.add(name)
+        previous = self.snapshots.get(name)
+        start = time.perf_counter()
+        try:
+            fitted = await asyncio.get_running_loop().run_in_executor(
+                self.pool,
+                fit_format,
+                str(path),
+                self.min_games,
+                self.n_bootstrap,
+                previous.warm_start if previous else None,
+            )
+        except Exception as e:
+            print(f"❌ Reloading {name} failed: {e}")
+            self.skipped[name] = mtime
+            return
+        finally:
+            self.reloading.discard(name)
+
+        if fitted is None:
+            self.snapshots.pop(name, None)
+            self.skipped[name] = mtime
+            print(f"⚠️  {name}: fewer than 3 players with {self.min_games}+ games")
+            return
+        version = previous.version + 1 if previous else 1
+        self.snapshots[name] = FormatSnapshot(name, mtime, version, *fitted)
+        self.skipped.pop(name, None)
+        print(
+            f"✓ {name} v{version}: {len(self.snapshots[name].rows)} players "
+            f"({time.perf_counter() - start:.1f}s"
+            f"{', warm start' if previous else ''})"
+        )
+
+    async def watch(self) -> None:
+        """Poll the TSV directory and reload changed formats."""
+        while True:
+            try:
+                for name, (path, mtime) in self._changed_formats().items():
+                    self.reloading.add(name)
+                    asyncio.ensure_future(self.reload(name, path, mtime))
+            except Exception as e:
+                # Hot reload must survive a bad poll; the next one retries
+                print(f"❌ Polling {self.tsv_dir} failed: {e!r}")
+            await asyncio.sleep(self.poll_interval)
+
+    # ---------------------------------------------------------------- queries
+
+    def _snapshot(self, name: str) -> FormatSnapshot:
+        if name in self.snapshots:
+            return self.snapshots[name]
+        if name in self.reloading:
+            raise HTTPError(503, f"{name} is still loading")
+        raise HTTPError(404, f"Unknown format: {name}")
+
+    def dispatch(self, method: str, target: str, body: bytes):
+        """Route one request; returns (status, JSON-serializable or bytes)."""
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if parts == ["health"]:
+            return 200, {
+                "status": "ok",
+                "formats": {
+                    name: {
+                        "version": s.version,
+                        "players": len(s.rows),
+                        "loaded_at": s.loaded_at,
+                    }
+                    for name, s in self.snapshots.items()
+                },
+                "reloading": sorted(self.reloading),
+            }
+        if len(parts) < 3 or parts[0] != "formats":
+            raise HTTPError(404, f"No route for {url.path}")
+
+        snapshot = self._snapshot(parts[1])
+        resource, rest = parts[2], parts[3:]
+        payload = {}
+        if method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise HTTPError(400, "Body must be JSON")
+            if not isinstance(payload, dict):
+                raise HTTPError(400, "Body must be a JSON object")
+        elif method != "GET":
+            raise HTTPError(405, f"{method} not supported")
+
+        if resource == "rankings" and not rest:
+            if "offset" not in query and "limit" not in query:
+                return 200, snapshot.rankings_body
+            try:
+                offset = int(query.get("offset", 0))
+                limit = int(query.get("limit", len(snapshot.rows)))
+            except ValueError:
+                raise HTTPError(400, "offset and limit must be integers")
+            return 200, {
+                "format": snapshot.name,
+                "version": snapshot.version,
+                "players": snapshot.rows[offset : offset + limit],
+            }
+        if resource == "players" and len(rest) == 1 and method == "GET":
+            return 200, snapshot.player(rest[0])
+        if resource == "players" and not rest and method == "POST":
+            usernames = payload.get("usernames", [])
+            if not isinstance(usernames, list) or not all(
+                isinstance(u, str) for u in usernames
+            ):
+                raise HTTPError(400, "usernames must be a list of strings")
+            return 200, {
+                "format": snapshot.name,
+                "version": snapshot.version,
+                "players": [snapshot.player(u) for u in usernames],
+            }
+        if resource == "predict" and not rest:
+            if method == "GET":
+                if "a" not in query or "b" not in query:
+                    raise HTTPError(400, "predict needs ?a=<player>&b=<opponent>")
+                pairs, confidence = [(query["a"], query["b"])], query.get("confidence")
+            else:
+                pairs, confidence = payload.get("pairs", []), payload.get("confidence")
+                if not isinstance(pairs, list):
+                    raise HTTPError(400, "pairs must be a list of [player, opponent]")
+            try:
+                confidence = float(confidence) if confidence is not None else 0.95
+            except (TypeError, ValueError):
+                raise HTTPError(400, "confidence must be a number")
+            return 200, snapshot.predict(pairs, confidence)
+        raise HTTPError(404, f"No route for {url.path}")
+
+    # ------------------------------------------------------------------- HTTP
+
+    async def handle(self, reader, writer) -> None:
+        """Serve one keep-alive HTTP/1.1 connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0) or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    # Keep-alive clients always get an answer
+                    print(f"❌ {method} {target} failed: {e!r}")
+                    status, payload = 500, {"error": "Internal server error"}
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                        "\r\n"
+                    ).encode()
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        # SIGTERM stops like Ctrl-C, so the fitting processes are shut down too
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel
+        )
+        print(f"✓ Listening on http://{host}:{port} (watching {self.tsv_dir}/)")
+        async with server:
+            watcher = asyncio.ensure_future(self.watch())
+            try:
+                await server.serve_forever()
+            finally:
+                watcher.cancel()
+                self.pool.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ratings over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument("--min-games", type=int, default=50)
+    parser.add_argument("--n-bootstrap", type=int, default=50)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between checks of the TSV directory",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Fitting processes (default: 1)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RATING SERVICE")
+    print("=" * 70)
+    print(f"Minimum games: {args.min_games}, bootstrap samples: {args.n_bootstrap}")
+
+    service = RatingService(
+        tsv_dir=args.tsv_dir,
+        min_games=args.min_games,
+        n_bootstrap=args.n_bootstrap,
+        poll_interval=args.poll_interval,
+        workers=args.workers,
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n✓ Stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,10 +1,86 @@
 #!/usr/bin/env python3
 """
 Convenience wrapper for running Bradley-Terry analysis.
-This script is at the top level for easy access.
+
+Commands are dispatched lazily: only the module behind the selected command is
+imported, so lightweight commands (help, validate) never load numpy, pandas
+or scipy.
 """
 
+import importlib
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# command -> (message, "module:function"); remaining CLI args are forwarded
+COMMANDS = {
+    "main": (
+        "Running WHR computation with bootstrap...",
+        "leaderboard.compute_whr_rankings:main",
+    ),
+    "bootstrap": ("Running bootstrap examples...", "bt.bootstrap_example:main"),
+    "quick-check": (
+        "Running quick minimum games check...",
+        "bt.quick_min_games_check:quick_check",
+    ),
+    "analyze": (
+        "Running comprehensive minimum games analysis...",
+        "leaderboard.analyze_min_games:main",
+    ),
+    "validate": (
+        "Validating WHR consistency in track1.json...",
+        "leaderboard.validate_whr_consistency:validate_whr_consistency",
+    ),
+    "tune": (
+        "Cross-validating regularization and normalization...",
+        "leaderboard.cross_validate:main",
+    ),
+    "validate-float32": (
+        "Validating float32 fits against float64...",
+        "leaderboard.validate_float32:main",
+    ),
+    "benchmark": (
+        "Running benchmarks across revisions...",
+        "leaderboard.benchmark_revisions:main",
+    ),
+    "export-h2h": (
+        "Exporting compact head-to-head data...",
+        "leaderboard.export_h2h:main",
+    ),
+    "serve": (
+        "Starting the rating service...",
+        "leaderboard.rating_service:main",
+    ),
+    "load-test": (
+        "Load testing the rating service...",
+        "leaderboard.load_test_service:main",
+    ),
+    "watch": (
+        "Watching the ladder TSVs...",
+        "leaderboard.watch_ladders:main",
+    ),
+    "history": (
+        "Querying the ladder history...",
+        "leaderboard.ladder_history:main",
+    ),
+    "ingest-battles": (
+        "Ingesting battle logs...",
+        "leaderboard.ingest_battles:main",
+    ),
+    "fetch": (
+        "Fetching the ladder TSVs...",
+        "leaderboard.fetch_ladders:main",
+    ),
+    "compress-ladders": (
+        "Converting the ladder TSVs...",
+        "leaderboard.ladder_files:main",
+    ),
+    "startup-check": (
+        "Checking command startup time...",
+        "leaderboard.check_startup_time:main",
+    ),
+}
 
 
 def print_help():
@@ -13,24 +89,39 @@ def print_help():
 Bradley-Terry Analysis Tools
 ============================
 
-Usage: python run_bt_analysis.py [command]
+Usage: python run_bt_analysis.py [command] [args...]
 
 Commands:
-  main              Run main analysis with bootstrap (default)
+  main              Compute WHR ratings and update track1.json (default)
+                    e.g. run_bt_analysis.py main 150 200
   bootstrap         Run bootstrap examples
   quick-check       Quick minimum games threshold check (2-3 min)
-  analyze           Comprehensive minimum games analysis (10-15 min)
+  analyze           Comprehensive minimum games analysis (under a minute)
+  tune              Cross-validate regularization x normalization per format
+  validate          Check WHR threshold consistency in track1.json
+  validate-float32  Check float32 fits agree with float64 within 0.1 Elo
+  benchmark         Benchmark WHR scenarios across git revisions
+  export-h2h        Write compact h2h_<format>.json for the H2H page
+  serve             Serve rankings and win probabilities over HTTP
+  load-test         Load test the rating service
+  watch             Republish track1.json when the ladder TSVs change
+  history           Store ladder snapshots and query them over time
+  ingest-battles    Turn Showdown battle logs into matchup counts
+  fetch             Download changed ladder TSVs (--base-url URL)
+  compress-ladders  Store the ladder TSVs as .tsv.gz (or --codec zstd/none)
+  startup-check     Verify lightweight commands start quickly
   help              Show this help message
 
 Examples:
-  python run_bt_analysis.py main
+  python run_bt_analysis.py main 150
   python run_bt_analysis.py quick-check
-  python run_bt_analysis.py analyze
+  python run_bt_analysis.py tune --min-games 150
+  python run_bt_analysis.py validate
 
 Note: You can also run modules directly:
-  python -m bt.whr
-  python bt/quick_min_games_check.py
-  python bt/analyze_min_games.py
+  python compute_whr_rankings.py 150
+  python analyze_min_games.py
+  python ../bt/quick_min_games_check.py
 """
     )
 
@@ -42,35 +133,21 @@ def main():
         print_help()
         return
 
-    if command == "main":
-        print("Running main Bradley-Terry analysis...")
-        from bt.whr import main
-
-        main()
-
-    elif command == "bootstrap":
-        print("Running bootstrap examples...")
-        import bt.bootstrap_example as be
-
-        be.main()
-
-    elif command == "quick-check":
-        print("Running quick minimum games check...")
-        import bt.quick_min_games_check as qm
-
-        qm.quick_check()
-
-    elif command == "analyze":
-        print("Running comprehensive minimum games analysis...")
-        import bt.analyze_min_games as am
-
-        am.main()
-
-    else:
+    if command not in COMMANDS:
         print(f"Unknown command: {command}")
         print_help()
         sys.exit(1)
 
+    message, target = COMMANDS[command]
+    module_name, func_name = target.split(":")
+    print(message)
+
+    # Forward remaining arguments as if the module had been run directly
+    sys.argv = [module_name] + sys.argv[2:]
+    result = getattr(importlib.import_module(module_name), func_name)()
+    if result is False:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Split a leaderboard document (track1.json) into per-format shards.
+
+track1.json bundles every format in one document, so the leaderboard page has
+to download and parse all of them to show one table. Next to <name>.json this
+writes a <name>/ directory with:
+
+- index.json: the top-level fields of the document (last_updated, metadata,
+  qualifying_status, ...), the byte size of the document the shards were
+  cut from (source_bytes) and, per format, the shard path and player count;
+- <format>.json: the players of one format (display fields and WHR block) and
+  that format's WHR fit summary.
+
+The monolithic document is left untouched by the script. Everything that
+writes a leaderboard document (compute_whr_rankings.py, parse_tsv_ladders.py,
+clear_format.py, track1_delta.py) goes through write_leaderboard, which
+rewrites the shards with it. The page compares source_bytes with the size of
+the served document and falls back to it when the shards are out of date.
+
+Usage:
+    python shard_track1.py [track1.json ...]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def shard_dir(track1_path: str) -> Path:
+    """Directory holding the shards of a leaderboard document."""
+    return Path(track1_path).with_suffix("")
+
+
+def write_json_atomic(path, data, **json_kwargs) -> int:
+    """
+    Write JSON through a temporary file and a rename, so readers never see a
+    partially written file.
+
+    Returns:
+        Number of bytes written
+    """
+    return _write_text_atomic(path, json.dumps(data, **json_kwargs))
+
+
+def _write_text_atomic(path, text: str) -> int:
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    return len(text.encode())
+
+
+def build_shards(
+    track1_data: Dict[str, object], source_bytes: Optional[int] = None
+) -> Dict[str, Dict[str, object]]:
+    """
+    Split a leaderboard document into an index and one shard per format.
+
+    Args:
+        track1_data: Parsed track1.json document
+        source_bytes: Size of the serialized document, recorded in the index
+
+    Returns:
+        Dictionary mapping file name ('index.json', '<format>.json') to its
+        JSON content
+    """
+    formats = track1_data.get("formats", {})
+    metadata = dict(track1_data.get("metadata", {}))
+    summaries = metadata.pop("whr_formats", {})
+    timestamps = track1_data.get("format_timestamps", {})
+
+    index = {key: value for key, value in track1_data.items() if key != "formats"}
+    if "metadata" in track1_data:
+        index["metadata"] = metadata
+    if source_bytes is not None:
+        index["source_bytes"] = source_bytes
+    index["formats"] = {}
+
+    shards = {}
+    for format_name, players in formats.items():
+        shard = {
+            "format": format_name,
+            "last_updated": timestamps.get(
+                format_name, track1_data.get("last_updated", "")
+            ),
+            "players": players,
+        }
+        if format_name in summaries:
+            shard["whr_format"] = summaries[format_name]
+        shards[f"{format_name}.json"] = shard
+        index["formats"][format_name] = {
+            "path": f"{format_name}.json",
+            "players": len(players),
+        }
+
+    return {"index.json": index, **shards}
+
+
+def write_shards(
+    track1_data: Dict[str, object],
+    track1_path: str,
+    source_bytes: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Write the index and per-format shards of a leaderboard document.
+
+    Shards of formats no longer in the document are removed.
+
+    Args:
+        track1_data: Parsed track1.json document
+        track1_path: Path of the monolithic document; shards go to the
+            directory of the same name without the suffix
+        source_bytes: Size of the serialized document (default: the size
+            of track1_path on disk, which must then hold track1_data)
+
+    Returns:
+        Dictionary mapping written file name to its size in bytes
+    """
+    out_dir = shard_dir(track1_path)
+    out_dir.mkdir(exist_ok=True)
+    if source_bytes is None and Path(track1_path).exists():
+        source_bytes = Path(track1_path).stat().st_size
+
+    # The index goes last, so it never lists a shard that is not written yet
+    shards = build_shards(track1_data, source_bytes)
+    shards["index.json"] = shards.pop("index.json")
+    sizes = {}
+    for name, content in shards.items():
+        sizes[name] = write_json_atomic(
+            out_dir / name, content, separators=(",", ":")
+        )
+
+    for stale in out_dir.glob("*.json"):
+        if stale.name not in sizes:
+            stale.unlink()
+    return sizes
+
+
+def write_leaderboard(
+    track1_data: Dict[str, object], track1_path: str, **json_kwargs
+) -> Dict[str, int]:
+    """
+    Write a leaderboard document and its shards together, each file atomically.
+
+    Args:
+        track1_data: Leaderboard document
+        track1_path: Path of the monolithic document
+        **json_kwargs: json.dumps arguments of the document (e.g. indent=2)
+
+    Returns:
+        Dictionary mapping written shard file name to its size in bytes
+    """
+    text = json.dumps(track1_data, **json_kwargs)
+    sizes = write_shards(track1_data, track1_path, len(text.encode()))
+    _write_text_atomic(track1_path, text)
+    return sizes
+
+
+def main():
+    paths = sys.argv[1:] or ["track1.json"]
+
+    print("=" * 70)
+    print("SHARDING LEADERBOARD OUTPUTS")
+    print("=" * 70)
+
+    ok = True
+    for path in paths:
+        try:
+            with open(path) as f:
+                track1_data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"❌ Could not read {path}: {e}")
+            ok = False
+            continue
+
+        sizes = write_shards(track1_data, path)
+        total = Path(path).stat().st_size
+        print(f"✓ {path} ({total:,} bytes) -> {shard_dir(path)}/")
+        for name, size in sizes.items():
+            print(f"    {name:<16} {size:>8,} bytes")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Versioned deltas between successive leaderboard documents (track1.json).
+
+Every update_track1_json run bumps metadata.version and writes the patch from
+the previous version next to the shards, as track1/deltas/<N>_to_<N+1>.json:
+
+- metadata: top-level metadata keys whose value changed (null = removed);
+- formats.<format>.whr: username -> changed WHR fields (null = field removed);
+- formats.<format>.whr_cleared: usernames whose WHR block was cleared;
+- formats.<format>.rank_moves: username -> [old whr_rank, new whr_rank];
+- formats.<format>.players: the full player list, only when players were
+  added, removed, reordered or changed outside their WHR block.
+
+The WHR blocks are compared as (players x fields) arrays in one vectorized
+pass per format. A mirror holding version N applies N->N+1, N+1->N+2, ... with
+apply_delta (or `python track1_delta.py DOCUMENT DELTA...`) and falls back to
+the full document when a delta is missing.
+
+Usage:
+    python track1_delta.py <track1.json> <delta.json> [<delta.json> ...] [--output FILE]
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.shard_track1 import write_json_atomic, write_leaderboard
+
+MAX_DELTAS = 50  # Deltas kept in the deltas/ directory
+
+
+def document_version(track1_data: Dict[str, object]) -> int:
+    """Version of a leaderboard document (0 before the first versioned run)."""
+    return int(track1_data.get("metadata", {}).get("version", 0))
+
+
+def _player_key(player: Dict[str, object]) -> str:
+    username = player.get("username", {})
+    return username.get("original", username.get("display", ""))
+
+
+def _without_whr(players: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    return [{k: v for k, v in p.items() if k != "whr"} for p in players]
+
+
+def _diff_whr(
+    old_players: List[Dict[str, object]], new_players: List[Dict[str, object]]
+) -> Dict[str, object]:
+    """Vectorized diff of the WHR blocks of one format."""
+    import numpy as np
+
+    old_whr = {_player_key(p): p.get("whr") for p in old_players}
+    usernames = [_player_key(p) for p in new_players]
+    old_blocks = [old_whr.get(u) for u in usernames]
+    new_blocks = [p.get("whr") for p in new_players]
+
+    fields = sorted(
+        {key for block in old_blocks + new_blocks if block for key in block}
+    )
+
+    def to_array(blocks):
+        # Missing blocks, missing fields and None are all NaN
+        return np.array(
+            [
+                [
+                    np.nan if not block or block.get(f) is None else float(block[f])
+                    for f in fields
+                ]
+                for block in blocks
+            ],
+            dtype=float,
+        ).reshape(len(blocks), len(fields))
+
+    old, new = to_array(old_blocks), to_array(new_blocks)
+    changed = (old != new) & ~(np.isnan(old) & np.isnan(new))
+    has_old = np.array([bool(b) for b in old_blocks], dtype=bool)
+    has_new = np.array([bool(b) for b in new_blocks], dtype=bool)
+
+    delta = {"whr": {}, "whr_cleared": [], "rank_moves": {}}
+    for row in np.flatnonzero(has_new & (changed.any(axis=1) | ~has_old)):
+        block = new_blocks[row]
+        delta["whr"][usernames[row]] = {
+            fields[c]: block.get(fields[c]) for c in np.flatnonzero(changed[row])
+        }
+    delta["whr_cleared"] = [usernames[row] for row in np.flatnonzero(has_old & ~has_new)]
+
+    if "whr_rank" in fields:
+        rank = fields.index("whr_rank")
+        moved = has_old & has_new & changed[:, rank]
+        delta["rank_moves"] = {
+            usernames[row]: [int(old[row, rank]), int(new[row, rank])]
+            for row in np.flatnonzero(moved)
+        }
+    return delta
+
+
+def diff_track1(
+    old_data: Dict[str, object], new_data: Dict[str, object]
+) -> Dict[str, object]:
+    """
+    Delta that turns one leaderboard document into the next.
+
+    Args:
+        old_data: Previous document (version N)
+        new_data: Updated document (version N+1)
+
+    Returns:
+        Delta dictionary (see the module docstring)
+    """
+    old_meta = old_data.get("metadata", {})
+    new_meta = new_data.get("metadata", {})
+    metadata = {
+        key: new_meta.get(key)
+        for key in set(old_meta) | set(new_meta)
+        if old_meta.get(key) != new_meta.get(key)
+    }
+
+    delta = {
+        "from_version": document_version(old_data),
+        "to_version": document_version(new_data),
+        "last_updated": new_data.get("last_updated", ""),
+        "metadata": metadata,
+        "formats": {},
+        "removed_formats": [
+            f for f in old_data.get("formats", {}) if f not in new_data.get("formats", {})
+        ],
+    }
+    for format_name, new_players in new_data.get("formats", {}).items():
+        old_players = old_data.get("formats", {}).get(format_name, [])
+        format_delta = _diff_whr(old_players, new_players)
+        if _without_whr(old_players) != _without_whr(new_players):
+            format_delta["players"] = new_players
+        if any(format_delta.values()):
+            delta["formats"][format_name] = format_delta
+    return delta
+
+
+def apply_delta(
+    track1_data: Dict[str, object], delta: Dict[str, object]
+) -> Dict[str, object]:
+    """
+    Apply a delta to the document it was computed from.
+
+    Args:
+        track1_data: Document at delta['from_version']
+        delta: Output of diff_track1
+
+    Returns:
+        New document at delta['to_version'] (the input is not modified)
+    """
+    version = document_version(track1_data)
+    if version != delta["from_version"]:
+        raise ValueError(
+            f"Delta {delta['from_version']}->{delta['to_version']} does not "
+            f"apply to version {version}"
+        )
+
+    data = copy.deepcopy(track1_data)
+    data["last_updated"] = delta["last_updated"]
+    metadata = data.setdefault("metadata", {})
+    for key, value in delta["metadata"].items():
+        if value is None:
+            metadata.pop(key, None)
+        else:
+            metadata[key] = value
+
+    formats = data.setdefault("formats", {})
+    for format_name in delta["removed_formats"]:
+        formats.pop(format_name, None)
+    for format_name, format_delta in delta["formats"].items():
+        if "players" in format_delta:
+            old_whr = {_player_key(p): p.get("whr") for p in formats.get(format_name, [])}
+            players = copy.deepcopy(format_delta["players"])
+            # The list carries the new WHR blocks; keep the old ones so the
+            # WHR patches below apply the same way in both cases
+            for player in players:
+                if "whr" in player:
+                    player["whr"] = copy.deepcopy(old_whr.get(_player_key(player)))
+            formats[format_name] = players
+        players = {_player_key(p): p for p in formats.get(format_name, [])}
+        for username, fields in format_delta["whr"].items():
+            block = players[username].get("whr") or {}
+            for key, value in fields.items():
+                if value is None:
+                    block.pop(key, None)
+                else:
+                    block[key] = value
+            players[username]["whr"] = block
+        for username in format_delta["whr_cleared"]:
+            players[username]["whr"] = None
+    return data
+
+
+def write_delta(
+    delta: Dict[str, object], deltas_dir: Path, keep: int = MAX_DELTAS
+) -> Path:
+    """
+    Write a delta as <from>_to_<to>.json and keep only the newest `keep`.
+
+    Returns:
+        Path of the written delta
+    """
+    deltas_dir = Path(deltas_dir)
+    deltas_dir.mkdir(parents=True, exist_ok=True)
+    path = deltas_dir / f"{delta['from_version']}_to_{delta['to_version']}.json"
+    write_json_atomic(path, delta, separators=(",", ":"))
+
+    existing = sorted(
+        deltas_dir.glob("*_to_*.json"), key=lambda p: int(p.stem.split("_to_")[1])
+    )
+    for stale in existing[:-keep]:
+        stale.unlink()
+    return path
+
+
+def main():
+    # Imported here: compute_whr_rankings imports this module on its fast path
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Apply leaderboard deltas to a document"
+    )
+    parser.add_argument("document", help="Leaderboard document at the first delta's version")
+    parser.add_argument("deltas", nargs="+", help="Deltas to apply, in order")
+    parser.add_argument("--output", default=None, help="Output file (default: in place)")
+    args = parser.parse_args()
+
+    with open(args.document) as f:
+        data = json.load(f)
+    for path in args.deltas:
+        with open(path) as f:
+            delta = json.load(f)
+        try:
+            data = apply_delta(data, delta)
+        except ValueError as e:
+            print(f"❌ {path}: {e}")
+            return False
+        print(f"✓ Applied {path} (version {delta['from_version']} -> {delta['to_version']})")
+
+    output = args.output or args.document
+    write_leaderboard(data, output, indent=2)
+    print(f"✅ Wrote version {document_version(data)} to {output}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Validate the float32 compute mode of BradleyTerryModel.
+
+Fits every format in float64 and float32 (point estimate and bootstrap, same
+resamples) and checks that the Elo outputs agree within a tolerance.
+
+Usage:
+    python validate_float32.py [--min-games N] [--n-bootstrap B] [--tolerance ELO]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard.ladder_files import resolve_ladder
+from leaderboard.whr import HeadToHeadMatrix, BradleyTerryModel
+
+FORMATS = {
+    "gen1ou": "showdown_tsvs/gen1ou.tsv",
+    "gen2ou": "showdown_tsvs/gen2ou.tsv",
+    "gen3ou": "showdown_tsvs/gen3ou.tsv",
+    "gen4ou": "showdown_tsvs/gen4ou.tsv",
+    "gen9ou": "showdown_tsvs/gen9ou.tsv",
+}
+
+# Columns of get_rankings_with_elo_uncertainty that are compared
+ELO_COLUMNS = ["BT_Elo", "Elo_Std", "Elo_CI_Lower", "Elo_CI_Upper"]
+
+
+def fit_rankings(h2h: HeadToHeadMatrix, dtype, args):
+    """Bootstrap fit in the given dtype; returns (rankings, bootstrap results)."""
+    model = BradleyTerryModel(h2h)
+    results = model.fit_bootstrap(
+        n_bootstrap=args.n_bootstrap,
+        fit_method=args.fit_method,
+        verbose=False,
+        batch_size=25,
+        regularization=0.01,
+        normalize_matchups="sqrt",
+        ties="davidson",
+        dtype=dtype,
+    )
+    rankings = model.get_rankings_with_elo_uncertainty(results)
+    return rankings.set_index("Username"), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate float32 fitting")
+    parser.add_argument("--min-games", type=int, default=0)
+    parser.add_argument("--n-bootstrap", type=int, default=50)
+    parser.add_argument(
+        "--fit-method", default="lbfgs", choices=["lbfgs", "newton"]
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Maximum allowed Elo difference (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("FLOAT32 VALIDATION")
+    print("=" * 70)
+    print(f"Fit method: {args.fit_method}, bootstrap samples: {args.n_bootstrap}")
+    print(f"Tolerance: {args.tolerance} Elo\n")
+
+    all_ok = True
+    for format_name, tsv_path in FORMATS.items():
+        if not resolve_ladder(tsv_path).exists():
+            print(f"⚠️  {tsv_path} not found, skipping {format_name}")
+            continue
+        h2h = HeadToHeadMatrix(filepath=tsv_path, min_games=args.min_games)
+        if len(h2h.players) < 3:
+            print(f"⚠️  {format_name}: only {len(h2h.players)} players, skipping")
+            continue
+
+        ref, ref_results = fit_rankings(h2h, np.float64, args)
+        low, low_results = fit_rankings(h2h, np.float32, args)
+        low = low.loc[ref.index]
+
+        diffs = {
+            col: float(np.max(np.abs(ref[col] - low[col].astype(float))))
+            for col in ELO_COLUMNS
+        }
+        worst = max(diffs.values())
+        ok = worst <= args.tolerance
+        all_ok &= ok
+
+        memory_ratio = (
+            low_results["strengths_samples"].nbytes
+            / ref_results["strengths_samples"].nbytes
+        )
+        status = "✓" if ok else "❌"
+        print(
+            f"{status} {format_name}: {len(ref)} players, max |ΔElo| = {worst:.4f} "
+            f"(sample memory x{memory_ratio:.2f})"
+        )
+        for col, diff in diffs.items():
+            print(f"    {col:<14} {diff:.4f}")
+
+    print()
+    if all_ok:
+        print(f"✅ float32 Elo outputs agree within {args.tolerance} points")
+    else:
+        print(f"❌ float32 Elo outputs differ by more than {args.tolerance} points")
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
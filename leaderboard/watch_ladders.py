@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Watch the ladder TSVs and republish the leaderboard when they change.
+
+Replaces rerunning parse_tsv_ladders.py and compute_whr_rankings.py by hand
+or from cron. showdown_tsvs/ is polled every --poll-interval seconds; a burst
+of writes is processed once no TSV has changed for --debounce seconds.
+
+A processing cycle hashes every TSV and compares it with the digests stored
+in track1.json (metadata.source_digests), so touched-but-identical files and
+restarts trigger no work. Compressed ladders (.tsv.gz, .tsv.zst) are watched
+too and hashed by their decompressed content, so recompressing a ladder is
+not a change either. Only the formats whose content changed are
+recomputed:
+
+- their display entries are reparsed (parse_tsv_file / format_players);
+- each ladder is parsed once into a HeadToHeadMatrix shared by the WHR fit
+  and the head-to-head export;
+- the WHR fit is warm-started from the previous fit of the format, kept in
+  memory across cycles.
+
+The new version is then published like compute_whr_rankings.py does (delta,
+shards, track1.json, each replaced atomically) and the compact head-to-head
+exports of the changed formats are rewritten. With --history, each changed
+TSV is also stored as a snapshot in the ladder history database
+(ladder_history.py).
+
+Usage:
+    python watch_ladders.py [--min-games 50] [--n-bootstrap 100]
+                            [--debounce 5] [--poll-interval 1] [--once]
+                            [--history ladder_history.db]
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard import export_h2h
+from leaderboard.compute_whr_rankings import (
+    WHR_FORMATS,
+    apply_whr_data,
+    compute_whr_for_format,
+    publish_track1,
+)
+from leaderboard.ladder_files import ladder_digest, ladder_paths
+from leaderboard.ladder_history import LadderHistory
+from leaderboard.parse_tsv_ladders import LADDER_FILES, format_players, parse_tsv_file
+
+
+class LadderWatcher:
+    """Recomputes the leaderboard for the ladder TSVs whose content changed."""
+
+    def __init__(
+        self,
+        tsv_dir: str = "showdown_tsvs",
+        track1_path: str = "track1.json",
+        min_games: int = 50,
+        n_bootstrap: int = 100,
+        history_path: Optional[str] = None,
+    ):
+        self.tsv_dir = Path(tsv_dir)
+        self.track1_path = track1_path
+        self.min_games = min_games
+        self.n_bootstrap = n_bootstrap
+        # The head-to-head exports live next to track1.json
+        self.export_dir = Path(track1_path).parent
+        self.history_path = history_path
+        self.formats = list(dict.fromkeys([*LADDER_FILES, *WHR_FORMATS]))
+        self.warm_starts: Dict[str, dict] = {f: {} for f in self.formats}
+
+    def paths(self) -> Dict[str, Path]:
+        """TSV path (plain or compressed) of every watched format that exists."""
+        paths = ladder_paths(self.tsv_dir)
+        return {f: paths[f] for f in self.formats if f in paths}
+
+    def poll(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) of every watched TSV; cheap enough to call often."""
+        state = {}
+        for format_name, path in self.paths().items():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Replaced by another variant since the listing
+            state[format_name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def load_track1(self) -> dict:
+        try:
+            with open(self.track1_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"last_updated": "", "formats": {}, "source": "tsv_files"}
+
+    def changed_formats(self, track1_data: dict) -> Dict[str, str]:
+        """Formats whose TSV digest differs from the published one."""
+        published = track1_data.get("metadata", {}).get("source_digests", {})
+        digests = {f: ladder_digest(p) for f, p in self.paths().items()}
+        return {f: d for f, d in digests.items() if published.get(f) != d}
+
+    def process(self) -> List[str]:
+        """
+        Recompute and republish the formats whose TSV content changed.
+
+        Returns:
+            Names of the recomputed formats (empty if nothing changed)
+        """
+        from leaderboard.whr import HeadToHeadMatrix
+
+        track1_data = self.load_track1()
+        changed = self.changed_formats(track1_data)
+        if not changed:
+            print("✓ No ladder content changed, nothing to do")
+            return []
+
+        print(f"\n{'='*70}")
+        print(f"RECOMPUTING {', '.join(f.upper() for f in changed)}")
+        print(f"{'='*70}")
+        start = time.perf_counter()
+        previous_data = copy.deepcopy(track1_data)
+        now = datetime.now(timezone.utc).isoformat()
+
+        timestamps = track1_data.setdefault("format_timestamps", {})
+        for format_name in track1_data.get("formats", {}):
+            timestamps.setdefault(format_name, track1_data.get("last_updated", ""))
+        track1_data["last_updated"] = now
+
+        whr_data_by_format, summaries_by_format, matrices = {}, {}, {}
+        for format_name in changed:
+            path = self.paths()[format_name]
+            players = parse_tsv_file(str(path), verbose=False)
+            track1_data.setdefault("formats", {})[format_name] = format_players(players)
+            timestamps[format_name] = now
+            print(f"✓ Parsed {len(players)} PAC players from {path}")
+
+            if format_name in WHR_FORMATS or format_name in export_h2h.FORMATS:
+                matrices[format_name] = HeadToHeadMatrix(filepath=str(path), min_games=0)
+            if format_name in WHR_FORMATS:
+                summary = {}
+                whr_data = compute_whr_for_format(
+                    tsv_path=str(path),
+                    format_name=format_name,
+                    min_games=self.min_games,
+                    n_bootstrap=self.n_bootstrap,
+                    summary=summary,
+                    warm_start=self.warm_starts[format_name],
+                    h2h=matrices[format_name],
+                )
+                if whr_data:
+                    whr_data_by_format[format_name] = whr_data
+                    summaries_by_format[format_name] = summary
+
+        changed_whr = [f for f in changed if f in WHR_FORMATS]
+        if changed_whr:
+            apply_whr_data(
+                track1_data,
+                whr_data_by_format,
+                self.min_games,
+                summaries_by_format,
+                formats=changed_whr,
+            )
+        track1_data.setdefault("metadata", {}).setdefault("source_digests", {}).update(
+            changed
+        )
+        publish_track1(track1_data, previous_data, self.track1_path)
+
+        for format_name in changed:
+            if format_name not in export_h2h.FORMATS:
+                continue
+            data = export_h2h.build_compact_h2h(matrices[format_name], format_name)
+            export_h2h.write_compact_h2h(
+                data,
+                self.export_dir / f"h2h_{format_name}.json",
+                self.export_dir / f"h2h_{format_name}.bin",
+            )
+            print(f"✓ Exported h2h_{format_name}.json ({data['total_players']} players)")
+
+        if self.history_path:
+            with LadderHistory(self.history_path) as history:
+                for format_name in changed:
+                    history.ingest(format_name, self.paths()[format_name], now)
+            print(f"✓ Stored {len(changed)} snapshot(s) in {self.history_path}")
+
+        print(f"\n✅ Republished {len(changed)} format(s) in {time.perf_counter() - start:.1f}s")
+        return list(changed)
+
+    def run_cycle(self) -> bool:
+        """process(), reporting errors instead of stopping the watch."""
+        try:
+            self.process()
+            return True
+        except Exception as e:
+            # The digests were not published, so the next change retries
+            print(f"❌ Error recomputing the leaderboard: {e}")
+            import traceback
+
+            traceback.print_exc()
+            return False
+
+    def watch(self, poll_interval: float = 1.0, debounce: float = 5.0) -> None:
+        """Poll the TSVs forever; process once a burst of writes has settled."""
+        state = self.poll()
+        last_change = time.monotonic()
+        pending = True  # Catch up with changes made while not watching
+        while True:
+            current = self.poll()
+            if current != state:
+                state, last_change, pending = current, time.monotonic(), True
+            elif pending and time.monotonic() - last_change >= debounce:
+                pending = False
+                self.run_cycle()
+            time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Republish the leaderboard when the ladder TSVs change"
+    )
+    parser.add_argument("--tsv-dir", default="showdown_tsvs")
+    parser.add_argument("--track1", default="track1.json")
+    parser.add_argument("--min-games", type=int, default=50)
+    parser.add_argument("--n-bootstrap", type=int, default=100)
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=5.0,
+        help="Seconds without TSV writes before recomputing",
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Process the current TSVs once and exit",
+    )
+    parser.add_argument(
+        "--history",
+        default=None,
+        help="Also store changed TSVs in this ladder history database",
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LADDER WATCH MODE")
+    print("=" * 70)
+    watcher = LadderWatcher(
+        tsv_dir=args.tsv_dir,
+        track1_path=args.track1,
+        min_games=args.min_games,
+        n_bootstrap=args.n_bootstrap,
+        history_path=args.history,
+    )
+    print(f"Watching {args.tsv_dir}/ ({', '.join(watcher.paths())})")
+    print(
+        f"Min games: {args.min_games}, bootstrap samples: {args.n_bootstrap}, "
+        f"debounce: {args.debounce:g}s"
+    )
+
+    if args.once:
+        return watcher.run_cycle()
+    try:
+        watcher.watch(args.poll_interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
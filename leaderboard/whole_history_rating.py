@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Time-varying Whole History Rating (Coulom, 2008).
+
+Unlike `BradleyTerryModel`, which fits one static strength per player from the
+cumulative H2H data, this engine keeps one rating per player per period in
+which the player played. Consecutive ratings of a player are linked by a
+Wiener-process prior, r(t2) - r(t1) ~ N(0, w2 * (t2 - t1)), so an agent that
+was retrained mid-season is rated for its current strength while its older
+periods keep their own estimates.
+
+Each player's ratings are updated with a Newton step on its own log-posterior.
+Because the prior only couples consecutive periods, the player's Hessian is
+tridiagonal and the step is solved in O(T) with a banded solver. Sweeping all
+players (Gauss-Seidel) until convergence gives the joint MAP estimate.
+
+Periods are appended incrementally with `add_period`; only the players that
+played in the new period need to be iterated, so the cost of an update stays
+linear in the affected players' history lengths. The time buckets of
+battle-log matchup counts are appended with `add_matchup_counts`, and
+`LadderHistory.whole_history_rating` builds the rating from the intervals
+between stored ladder snapshots.
+
+Ratings are stored on the same natural-log scale as `BradleyTerryModel`'s
+log-strengths, P(i beats j) = 1 / (1 + exp(-(r_i - r_j))).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LN10 = np.log(10)
+
+
+class WholeHistoryRating:
+    """
+    Whole History Rating over per-period matchup counts.
+
+    Example:
+        whr = WholeHistoryRating(w2=30.0)
+        whr.add_period(1, [("PAC-A", "PAC-B", 12, 8), ("PAC-B", "PAC-C", 5, 5)])
+        whr.add_period(2, [("PAC-A", "PAC-C", 3, 9)])
+        whr.fit()
+        whr.get_current_ratings()
+    """
+
+    def __init__(
+        self,
+        w2: float = 30.0,
+        prior_elo_std: float = 400.0,
+        elo_scale: float = 400.0,
+    ):
+        """
+        Args:
+            w2: Wiener-process variance in Elo² per unit of period time
+                (Coulom's w²). Larger values let ratings drift faster.
+            prior_elo_std: Std (Elo) of the Gaussian prior on each player's
+                first rating; anchors otherwise unidentifiable offsets.
+            elo_scale: Elo scaling constant used for conversions (default: 400)
+        """
+        self.elo_scale = elo_scale
+        to_natural = LN10 / elo_scale
+        self.w2 = w2 * to_natural**2
+        self.prior_var = (prior_elo_std * to_natural) ** 2
+
+        self.players: List[str] = []
+        self._player_index: Dict[str, int] = {}
+
+        # One entry per player-period; ratings of all player-periods live in
+        # one flat array so opponents' ratings can be gathered in one step.
+        self._ratings = np.zeros(0)
+        self._n_player_periods = 0
+        self._period_times: List[List[float]] = []  # per player, chronological
+        self._period_ids: List[List[int]] = []  # per player, flat rating ids
+
+        # Per player: appended chunks of (own period position, opponent flat id,
+        # wins, losses), concatenated lazily into arrays.
+        self._game_chunks: List[List[Tuple[np.ndarray, ...]]] = []
+        self._game_cache: Dict[int, Tuple[np.ndarray, ...]] = {}
+        self._dirty = set()
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+    def _player_id(self, username: str) -> int:
+        idx = self._player_index.get(username)
+        if idx is None:
+            idx = len(self.players)
+            self._player_index[username] = idx
+            self.players.append(username)
+            self._period_times.append([])
+            self._period_ids.append([])
+            self._game_chunks.append([])
+        return idx
+
+    def _player_period(self, player: int, time: float) -> Tuple[int, int]:
+        """Return (position within player's history, flat id) for a period."""
+        times = self._period_times[player]
+        if times and times[-1] == time:
+            return len(times) - 1, self._period_ids[player][-1]
+        if times and time < times[-1]:
+            raise ValueError(
+                f"Periods must be appended in order: {time} < {times[-1]} "
+                f"for {self.players[player]}"
+            )
+
+        # A new period starts at the player's latest rating
+        initial = self._ratings[self._period_ids[player][-1]] if times else 0.0
+        flat_id = self._n_player_periods
+        if flat_id >= len(self._ratings):
+            grown = np.zeros(max(16, 2 * len(self._ratings)))
+            grown[: len(self._ratings)] = self._ratings
+            self._ratings = grown
+        self._ratings[flat_id] = initial
+        self._n_player_periods += 1
+
+        times.append(time)
+        self._period_ids[player].append(flat_id)
+        return len(times) - 1, flat_id
+
+    def add_period(
+        self, time: float, matchups: Iterable[Tuple[str, str, float, float]]
+    ) -> List[str]:
+        """
+        Append the games of one period.
+
+        Args:
+            time: Period time (e.g. day number); must not precede earlier periods
+                of the same players. Re-using the latest time adds to that period.
+            matchups: Iterable of (player_a, player_b, wins_a, wins_b)
+
+        Returns:
+            Usernames of the players that played in this period
+        """
+        per_player: Dict[int, List[Tuple[int, int, float, float]]] = {}
+        for player_a, player_b, wins_a, wins_b in matchups:
+            if wins_a + wins_b <= 0 or player_a == player_b:
+                continue
+            a, b = self._player_id(player_a), self._player_id(player_b)
+            pos_a, id_a = self._player_period(a, time)
+            pos_b, id_b = self._player_period(b, time)
+            per_player.setdefault(a, []).append((pos_a, id_b, wins_a, wins_b))
+            per_player.setdefault(b, []).append((pos_b, id_a, wins_b, wins_a))
+
+        for player, games in per_player.items():
+            pos, opp, wins, losses = zip(*games)
+            self._game_chunks[player].append(
+                (
+                    np.asarray(pos, dtype=np.int64),
+                    np.asarray(opp, dtype=np.int64),
+                    np.asarray(wins, dtype=float),
+                    np.asarray(losses, dtype=float),
+                )
+            )
+            self._dirty.add(player)
+
+        return [self.players[p] for p in per_player]
+
+    def add_period_matrix(
+        self, time: float, usernames: Sequence[str], wins_matrix: np.ndarray
+    ) -> List[str]:
+        """
+        Append one period given as a wins matrix (wins_matrix[i, j] = wins of i over j).
+
+        Only the non-zero upper-triangle pairs are visited, so sparse periods
+        cost O(games) rather than O(n²).
+        """
+        wins_matrix = np.asarray(wins_matrix)
+        rows, cols = np.nonzero(np.triu(wins_matrix + wins_matrix.T, k=1))
+        return self.add_period(
+            time,
+            zip(
+                (usernames[i] for i in rows),
+                (usernames[j] for j in cols),
+                wins_matrix[rows, cols],
+                wins_matrix[cols, rows],
+            ),
+        )
+
+    def add_matchup_counts(self, counts) -> List[str]:
+        """
+        Append battle-log matchup counts (ingest_battles.py), one period per
+        time bucket.
+
+        Periods are timed in days (unix time of the bucket's middle / 86400),
+        so w2 is in Elo² per day. WHR has no tie model: a tie counts as half a
+        win for each player.
+
+        Args:
+            counts: Path of the .npz written by ingest_battles.py, or the
+                loaded dictionary of arrays
+
+        Returns:
+            Usernames of the players that played in the appended periods
+        """
+        if isinstance(counts, (str, bytes)) or hasattr(counts, "__fspath__"):
+            with np.load(counts) as data:
+                counts = {key: data[key] for key in data.files}
+
+        usernames = [str(u) for u in counts["usernames"]]
+        bucket_seconds = int(counts.get("bucket_seconds", 86400))
+        times = np.asarray(counts["time"])
+        half_ties = np.asarray(counts["t"]) / 2
+        wins_i = np.asarray(counts["w"]) + half_ties
+        wins_j = np.asarray(counts["l"]) + half_ties
+
+        played = set()
+        for bucket in np.unique(times):
+            rows = np.flatnonzero(times == bucket)
+            played.update(
+                self.add_period(
+                    (float(bucket) + bucket_seconds / 2) / 86400,
+                    zip(
+                        (usernames[k] for k in counts["i"][rows]),
+                        (usernames[k] for k in counts["j"][rows]),
+                        wins_i[rows],
+                        wins_j[rows],
+                    ),
+                )
+            )
+        return [p for p in self.players if p in played]
+
+    def _games(self, player: int) -> Tuple[np.ndarray, ...]:
+        if player in self._dirty or player not in self._game_cache:
+            chunks = self._game_chunks[player]
+            self._game_cache[player] = tuple(
+                np.concatenate([c[k] for c in chunks]) for k in range(4)
+            )
+            self._dirty.discard(player)
+        return self._game_cache[player]
+
+    # ------------------------------------------------------------------
+    # Newton updates
+    # ------------------------------------------------------------------
+    def _prior_precisions(self, player: int) -> np.ndarray:
+        """Precision of the Wiener prior between consecutive periods."""
+        gaps = np.diff(np.asarray(self._period_times[player], dtype=float))
+        return 1.0 / (self.w2 * np.maximum(gaps, 1e-12))
+
+    def _neg_hessian_and_gradient(self, player: int):
+        """Banded negative Hessian (3, T) and gradient of the log-posterior."""
+        ids = np.asarray(self._period_ids[player])
+        r = self._ratings[ids]
+        n_periods = len(ids)
+        pos, opp, wins, losses = self._games(player)
+
+        probs = 1 / (1 + np.exp(-(r[pos] - self._ratings[opp])))
+        total = wins + losses
+        grad = np.bincount(pos, weights=wins - total * probs, minlength=n_periods)
+        diag = np.bincount(
+            pos, weights=total * probs * (1 - probs), minlength=n_periods
+        )
+
+        # Prior on the first rating
+        grad[0] -= r[0] / self.prior_var
+        diag[0] += 1 / self.prior_var
+
+        # Wiener process between consecutive periods
+        banded = np.zeros((3, n_periods))
+        if n_periods > 1:
+            prec = self._prior_precisions(player)
+            step = np.diff(r) * prec
+            grad[:-1] += step
+            grad[1:] -= step
+            diag[:-1] += prec
+            diag[1:] += prec
+            banded[0, 1:] = -prec
+            banded[2, :-1] = -prec
+        banded[1] = diag
+        return banded, grad
+
+    def _update_player(self, player: int) -> float:
+        from scipy.linalg import solve_banded
+
+        banded, grad = self._neg_hessian_and_gradient(player)
+        delta = solve_banded((1, 1), banded, grad)
+        ids = self._period_ids[player]
+        self._ratings[ids] += delta
+        return float(np.max(np.abs(delta)))
+
+    def iterate(self, players: Optional[Iterable[str]] = None) -> float:
+        """
+        One Gauss-Seidel sweep of Newton updates.
+
+        Args:
+            players: Usernames to update (default: all players)
+
+        Returns:
+            Largest rating change (natural-log scale)
+        """
+        ids = (
+            range(len(self.players))
+            if players is None
+            else [self._player_index[p] for p in players]
+        )
+        max_change = 0.0
+        for player in ids:
+            if self._period_ids[player]:
+                max_change = max(max_change, self._update_player(player))
+
+        # The likelihood and the Wiener prior are invariant to a common shift
+        # of all ratings, which per-player steps resolve only slowly. The exact
+        # optimal shift under the first-period prior is minus their mean.
+        first = [ids[0] for ids in self._period_ids if ids]
+        shift = -float(np.mean(self._ratings[first])) if first else 0.0
+        self._ratings[: self._n_player_periods] += shift
+        return max(max_change, abs(shift))
+
+    def fit(
+        self,
+        players: Optional[Iterable[str]] = None,
+        max_iter: int = 100,
+        tol: float = 1e-6,
+        verbose: bool = False,
+    ) -> int:
+        """
+        Iterate until ratings converge.
+
+        Args:
+            players: Restrict updates to these players, e.g. those returned by
+                add_period for an incremental update (default: all players)
+            max_iter: Maximum number of sweeps
+            tol: Convergence tolerance on the largest rating change
+            verbose: Print progress
+
+        Returns:
+            Number of sweeps performed
+        """
+        players = list(players) if players is not None else None
+        for iteration in range(max_iter):
+            change = self.iterate(players)
+            if verbose:
+                print(f"    Sweep {iteration + 1}: max_change = {change:.2e}", end="\r")
+            if change < tol:
+                if verbose:
+                    print(f"\nWHR converged in {iteration + 1} sweeps")
+                return iteration + 1
+        if verbose:
+            print(f"\nWHR did not converge after {max_iter} sweeps")
+        return max_iter
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+    def _period_variances(self, player: int) -> np.ndarray:
+        """
+        Diagonal of the inverse negative Hessian of one player, in O(T).
+
+        With d the forward and e the backward Schur complements of the
+        tridiagonal matrix A, (A⁻¹)_kk = 1 / (d_k + e_k - A_kk)
+        (Coulom 2008, appendix B, in ratio form to avoid overflow).
+        """
+        banded, _ = self._neg_hessian_and_gradient(player)
+        diag = banded[1]
+        off_sq = banded[2, :-1] ** 2
+        n_periods = len(diag)
+
+        forward = diag.copy()
+        for k in range(1, n_periods):
+            forward[k] -= off_sq[k - 1] / forward[k - 1]
+        backward = diag.copy()
+        for k in range(n_periods - 2, -1, -1):
+            backward[k] -= off_sq[k] / backward[k + 1]
+
+        return 1.0 / (forward + backward - diag)
+
+    def to_elo(self, ratings: np.ndarray, center: float = 1500.0) -> np.ndarray:
+        """Convert natural-log ratings to the Elo scale used by strengths_to_elo."""
+        return self.elo_scale * np.asarray(ratings) / LN10 + center
+
+    def get_history(self, username: str) -> Dict[str, np.ndarray]:
+        """
+        Rating history of one player.
+
+        Returns:
+            Dictionary with 'time', 'rating' (natural log), 'elo_offset'
+            (Elo relative to 0) and 'elo_std' arrays, one entry per period.
+        """
+        player = self._player_index[username]
+        ratings = self._ratings[self._period_ids[player]]
+        std = np.sqrt(self._period_variances(player))
+        return {
+            "time": np.asarray(self._period_times[player], dtype=float),
+            "rating": ratings.copy(),
+            "elo_offset": self.to_elo(ratings, center=0.0),
+            "elo_std": self.elo_scale * std / LN10,
+        }
+
+    def get_current_ratings(
+        self, center: float = 1500.0, with_uncertainty: bool = True
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Latest rating of every player on the Elo scale.
+
+        Ratings are centered so that the mean current rating equals `center`,
+        matching `BradleyTerryModel.strengths_to_elo`.
+
+        Returns:
+            Dict mapping username to {'whr_elo', 'whr_std', 'last_period', 'n_periods'}
+        """
+        active = [p for p in range(len(self.players)) if self._period_ids[p]]
+        latest = np.array([self._ratings[self._period_ids[p][-1]] for p in active])
+        elo = self.to_elo(latest - latest.mean(), center=center)
+
+        result = {}
+        for k, player in enumerate(active):
+            entry = {
+                "whr_elo": float(elo[k]),
+                "last_period": self._period_times[player][-1],
+                "n_periods": len(self._period_ids[player]),
+            }
+            if with_uncertainty:
+                std = np.sqrt(self._period_variances(player)[-1])
+                entry["whr_std"] = float(self.elo_scale * std / LN10)
+            result[self.players[player]] = entry
+        return result
@@ -3,14 +3,20 @@
 Compute the full head-to-head win matrix from Pokemon battle data.
 This recreates the logic from headToHeadMatrix.js in Python.
 Also implements Bradley-Terry model for skill estimation.
+
+pandas and scipy are imported inside the functions that need them, so importing
+this module only pays for numpy.
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import numpy as np
+import copy
 import json
-from typing import Dict, List, Tuple, Optional
-from scipy.sparse import lil_matrix
-from scipy.optimize import minimize
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class HeadToHeadMatrix:
@@ -19,30 +25,167 @@ class HeadToHeadMatrix:
         Initialize the H2H matrix calculator.
 
         Args:
-            filepath: Path to TSV file with battle data (default: showdown_tsvs/gen1ou.tsv)
+            filepath: Path to TSV file with battle data (default: showdown_tsvs/gen1ou.tsv);
+                .tsv.gz / .tsv.zst variants of the path are found and read too
             min_games: Minimum games required to be considered in the rankings
         """
         self.min_games = min_games
         self.players = []
         self.filepath = filepath
+        # Per-interval game counts (see set_intervals), for time decay
+        self.intervals = None
         self._load_data(filepath)
         self._compute_matrix()
 
     def _username_to_h2h_key(self, username: str) -> str:
         return "".join(c for c in username.lower() if c.isalnum())
 
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, min_games: int = 10, filepath: Optional[str] = None
+    ) -> "HeadToHeadMatrix":
+        """
+        Build the matrix from ladder rows already in memory.
+
+        Args:
+            df: One row per player, in ladder file order, with the Username,
+                Elo, Glicko, Rating_Deviation, W, L, T and H2H_Data columns
+                (H2H_Data as a JSON string or an already decoded dict)
+            min_games: Minimum games required to be considered in the rankings
+            filepath: Optional description of where the rows came from
+
+        Returns:
+            HeadToHeadMatrix equal to loading the same rows from a TSV file
+        """
+        h2h = cls.__new__(cls)
+        h2h.min_games = min_games
+        h2h.filepath = filepath
+        h2h.intervals = None
+        h2h._load_frame(df)
+        h2h._compute_matrix()
+        return h2h
+
+    @classmethod
+    def from_matchup_counts(
+        cls, counts, min_games: int = 10, as_of: Optional[float] = None
+    ) -> "HeadToHeadMatrix":
+        """
+        Build the matrix from battle-log matchup counts (ingest_battles.py).
+
+        The players have no ladder ratings (Elo, Glicko and deviation are NaN)
+        and are ordered by games played. The time buckets of the counts are
+        attached as intervals (set_intervals), so fit_logistic(half_life=...)
+        works directly.
+
+        Args:
+            counts: Path of the .npz written by ingest_battles.py, or the
+                loaded dictionary of arrays
+            min_games: Minimum games required to be considered in the rankings
+            as_of: Unix time the interval ages (in days) are measured from
+                (default: the end of the last bucket)
+
+        Returns:
+            HeadToHeadMatrix of the battles
+        """
+        import pandas as pd
+
+        filepath = None
+        if isinstance(counts, (str, bytes)) or hasattr(counts, "__fspath__"):
+            filepath = str(counts)
+            with np.load(counts) as data:
+                counts = {key: data[key] for key in data.files}
+
+        usernames = [str(u) for u in counts["usernames"]]
+        keys = [str(k) for k in counts["keys"]]
+        i_idx, j_idx = counts["i"], counts["j"]
+        w, l, t = counts["w"], counts["l"], counts["t"]
+
+        # Records over all buckets, one per (player, opponent) side
+        n = len(usernames)
+        pair = i_idx * n + j_idx
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        totals = [np.bincount(inverse, weights=c).astype(int) for c in (w, l, t)]
+        records = [dict() for _ in range(n)]
+        for p, pw, pl, pt in zip(pairs.tolist(), *(c.tolist() for c in totals)):
+            i, j = divmod(p, n)
+            records[i][keys[j]] = {"w": pw, "l": pl, "t": pt}
+            records[j][keys[i]] = {"w": pl, "l": pw, "t": pt}
+
+        df = pd.DataFrame(
+            {
+                "Username": usernames,
+                "Elo": np.nan,
+                "Glicko": np.nan,
+                "Rating_Deviation": np.nan,
+                "W": np.bincount(i_idx, weights=w, minlength=n).astype(int)
+                + np.bincount(j_idx, weights=l, minlength=n).astype(int),
+                "L": np.bincount(i_idx, weights=l, minlength=n).astype(int)
+                + np.bincount(j_idx, weights=w, minlength=n).astype(int),
+                "T": np.bincount(i_idx, weights=t, minlength=n).astype(int)
+                + np.bincount(j_idx, weights=t, minlength=n).astype(int),
+                "H2H_Data": records,
+            }
+        )
+        order = np.argsort(-(df["W"] + df["L"] + df["T"]).to_numpy(), kind="stable")
+        h2h = cls.from_frame(
+            df.iloc[order].reset_index(drop=True), min_games, filepath
+        )
+
+        bucket_seconds = int(counts.get("bucket_seconds", 86400))
+        if as_of is None:
+            as_of = float(counts["time"].max()) + bucket_seconds if len(pair) else 0.0
+        # The games of a bucket are dated at its middle
+        ages = (as_of - (counts["time"] + bucket_seconds / 2)) / 86400
+        h2h.set_intervals(
+            [usernames[k] for k in np.concatenate([i_idx, j_idx])],
+            [usernames[k] for k in np.concatenate([j_idx, i_idx])],
+            np.concatenate([w, l]),
+            np.concatenate([t, t]),
+            np.concatenate([ages, ages]),
+        )
+        return h2h
+
     def _load_data(self, filepath: str = "showdown_tsvs/gen1ou.tsv") -> None:
-        df = pd.read_csv(filepath, sep="\t")
+        import pandas as pd
+
+        if hasattr(filepath, "read"):
+            df = pd.read_csv(filepath, sep="\t")
+        else:
+            try:
+                from leaderboard.ladder_files import open_ladder
+            except ModuleNotFoundError:
+                # Imported as a top-level module from leaderboard/ (from whr import ...)
+                from ladder_files import open_ladder
+
+            # .tsv.gz / .tsv.zst ladders are decompressed while parsing
+            with open_ladder(filepath) as f:
+                df = pd.read_csv(f, sep="\t")
+        if not {"W", "L", "T"}.issubset(df.columns):
+            # Some ladder exports (gen1ou, gen9ou) omit the record columns;
+            # recover them from the per-opponent H2H records instead.
+            totals = df["H2H_Data"].map(self._h2h_totals)
+            for idx, col in enumerate(["W", "L", "T"]):
+                df[col] = totals.map(lambda t: t[idx])
+        self._load_frame(df)
+
+    def _load_frame(self, df: pd.DataFrame) -> None:
+        import pandas as pd
+
         filtered_df = df[df["W"] + df["L"] + df["T"] >= self.min_games].copy()
         filtered_df = filtered_df.sort_values("Elo", ascending=False).reset_index(
             drop=True
         )
+        self.total_games = (
+            filtered_df["W"] + filtered_df["L"] + filtered_df["T"]
+        ).to_numpy()
         self.players = []
         for _, row in filtered_df.iterrows():
             try:
-                h2h_data = (
-                    json.loads(row["H2H_Data"]) if pd.notna(row["H2H_Data"]) else {}
-                )
+                raw = row["H2H_Data"]
+                if isinstance(raw, dict):
+                    h2h_data = raw
+                else:
+                    h2h_data = json.loads(raw) if pd.notna(raw) else {}
             except (json.JSONDecodeError, TypeError):
                 print(
                     f"Error parsing H2H data for {row['Username']}: {row['H2H_Data']}"
@@ -63,6 +206,18 @@ class HeadToHeadMatrix:
             f"Loaded {len(self.players)} players with at least {self.min_games} games"
         )
 
+    @staticmethod
+    def _h2h_totals(raw) -> Tuple[int, int, int]:
+        """Sum wins, losses and ties over a raw H2H_Data JSON string."""
+        try:
+            records = json.loads(raw) if isinstance(raw, str) else {}
+        except json.JSONDecodeError:
+            return 0, 0, 0
+        wins = sum(r.get("w", 0) for r in records.values())
+        losses = sum(r.get("l", 0) for r in records.values())
+        ties = sum(r.get("t", 0) for r in records.values())
+        return wins, losses, ties
+
     def get_h2h_record_by_username(self, player_username: str):
         for player in self.players:
             if player["Username"] == player_username:
@@ -94,6 +249,7 @@ class HeadToHeadMatrix:
         win_pct_matrix = np.full((n, n), np.nan)
         games_matrix = np.zeros((n, n), dtype=int)
         wins_matrix = np.zeros((n, n), dtype=int)
+        ties_matrix = np.zeros((n, n), dtype=int)
 
         for i, player1 in enumerate(self.players):
             for j, player2 in enumerate(self.players):
@@ -108,6 +264,7 @@ class HeadToHeadMatrix:
                     )
                     games_matrix[i, j] = total
                     wins_matrix[i, j] = wins
+                    ties_matrix[i, j] = ties
 
                     if total > 0:
                         win_pct_matrix[i, j] = self.get_win_percentage(wins, losses)
@@ -117,6 +274,113 @@ class HeadToHeadMatrix:
         self.win_matrix = win_pct_matrix
         self.games_matrix = games_matrix
         self.wins_matrix = wins_matrix
+        self.ties_matrix = ties_matrix
+
+    def subset(self, min_games: int) -> "HeadToHeadMatrix":
+        """
+        Restrict to players with at least `min_games` games, without re-parsing.
+
+        Thresholds are nested, so a matrix loaded with a low threshold can be
+        subset to any higher one; the result equals loading the file again
+        with `min_games`.
+
+        Args:
+            min_games: Minimum games required (at least self.min_games)
+
+        Returns:
+            New HeadToHeadMatrix with its own player list and matrices
+        """
+        if min_games < self.min_games:
+            raise ValueError(
+                f"Cannot subset to min_games={min_games} below the loaded "
+                f"threshold {self.min_games}"
+            )
+        idx = np.flatnonzero(self.total_games >= min_games)
+        sub = copy.copy(self)
+        sub.min_games = min_games
+        sub.players = [self.players[i] for i in idx]
+        sub.total_games = self.total_games[idx]
+        for name in ["win_matrix", "games_matrix", "wins_matrix", "ties_matrix"]:
+            setattr(sub, name, getattr(self, name)[np.ix_(idx, idx)])
+        if self.intervals is not None:
+            local = np.full(len(self.players), -1)
+            local[idx] = np.arange(len(idx))
+            keep = (local[self.intervals["i"]] >= 0) & (local[self.intervals["j"]] >= 0)
+            sub.intervals = {k: v[keep] for k, v in self.intervals.items()}
+            sub.intervals["i"] = local[sub.intervals["i"]]
+            sub.intervals["j"] = local[sub.intervals["j"]]
+        return sub
+
+    def set_intervals(
+        self,
+        players: List[str],
+        opponents: List[str],
+        wins: np.ndarray,
+        ties: np.ndarray,
+        ages: np.ndarray,
+    ) -> None:
+        """
+        Attach per-interval game counts, used by time-decayed fits.
+
+        Each entry is the row player's wins and ties against an opponent
+        during one interval between ladder snapshots (see
+        ladder_history.interval_games), `ages` old. Entries of players not
+        in the matrix are dropped. For decay_weights to be exact, the
+        intervals of each (player, opponent) should add up to wins_matrix
+        and ties_matrix.
+
+        Args:
+            players: Username of the row player of each entry
+            opponents: Username or H2H key of the opponent of each entry
+            wins: Wins of the row player in the interval
+            ties: Ties in the interval
+            ages: Age of the interval (e.g. days before the snapshot)
+        """
+        index = {self._username_to_h2h_key(u): k for k, u in enumerate(self.get_usernames())}
+        i_idx = np.array([index.get(self._username_to_h2h_key(u), -1) for u in players])
+        j_idx = np.array([index.get(self._username_to_h2h_key(u), -1) for u in opponents])
+        keep = (i_idx >= 0) & (j_idx >= 0)
+        self.intervals = {
+            "i": i_idx[keep],
+            "j": j_idx[keep],
+            "wins": np.asarray(wins, dtype=float)[keep],
+            "ties": np.asarray(ties, dtype=float)[keep],
+            "age": np.asarray(ages, dtype=float)[keep],
+        }
+
+    def decay_weights(self, half_life: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-matchup weights of exponential time decay.
+
+        A game played `age` ago counts 0.5 ** (age / half_life). The weight of
+        a cell is its decayed interval count over its plain interval count,
+        separately for wins and ties, so multiplying the wins and ties
+        matrices by them gives the decayed counts; bootstrap replicates of
+        the matrices are weighted the same way. Cells without interval data
+        keep weight 1.
+
+        Returns:
+            (wins weights, ties weights), each of shape (n_players, n_players)
+        """
+        if self.intervals is None:
+            raise ValueError(
+                "Time decay needs per-interval game counts (set_intervals)"
+            )
+        if half_life <= 0:
+            raise ValueError(f"half_life must be positive, got {half_life}")
+        n = len(self.players)
+        cell = self.intervals["i"] * n + self.intervals["j"]
+        decay = 0.5 ** (self.intervals["age"] / half_life)
+
+        weights = []
+        for outcome in ("wins", "ties"):
+            counts = self.intervals[outcome]
+            plain = np.bincount(cell, weights=counts, minlength=n * n)
+            decayed = np.bincount(cell, weights=counts * decay, minlength=n * n)
+            weight = np.ones(n * n)
+            np.divide(decayed, plain, out=weight, where=plain > 0)
+            weights.append(weight.reshape(n, n))
+        return weights[0], weights[1]
 
     def get_usernames(self) -> List[str]:
         """Get list of usernames in order."""
@@ -127,7 +391,7 @@ class HeadToHeadMatrix:
         Convert matrix to pandas DataFrame with usernames as labels.
 
         Args:
-            matrix_type: Type of matrix to return ('win_pct', 'games', or 'wins')
+            matrix_type: Type of matrix to return ('win_pct', 'games', 'wins', or 'ties')
 
         Returns:
             DataFrame with usernames as both index and columns
@@ -138,12 +402,16 @@ class HeadToHeadMatrix:
             matrix = self.games_matrix
         elif matrix_type == "wins":
             matrix = self.wins_matrix
+        elif matrix_type == "ties":
+            matrix = self.ties_matrix
         else:
             raise ValueError(f"Unknown matrix_type: {matrix_type}")
 
         if matrix is None:
             raise ValueError("Must call compute_matrix() first")
 
+        import pandas as pd
+
         usernames = self.get_usernames()
         return pd.DataFrame(matrix, index=usernames, columns=usernames)
 
@@ -204,12 +472,228 @@ class HeadToHeadMatrix:
         print("=" * 60)
 
 
+TIE_MODELS = (None, "davidson", "rao-kupper")
+
+# Log tie parameter used when a dataset has no ties at all (ν ≈ 0, θ ≈ 1)
+NO_TIES_LOG_PARAM = -50.0
+
+
+def _log_sigmoid(x: np.ndarray) -> np.ndarray:
+    """log σ(x), stable for large |x| and dtype preserving."""
+    return -np.logaddexp(0, -x)
+
+
+def _outcome_kernels(d: np.ndarray, s: float, ties: Optional[str]):
+    """
+    Log-probabilities of each matchup outcome and their derivatives.
+
+    Plain Bradley-Terry has outcomes (win, loss); the tie models add a third
+    outcome governed by a scalar tie parameter on log scale s:
+        'davidson':   P(tie) ∝ ν √(π_i π_j),            ν = exp(s)
+        'rao-kupper': P(i beats j) = σ(d - η),           η = exp(s), θ = e^η
+    All three reduce to P(i beats j | decisive) = σ(θ_i - θ_j) in the limit
+    of no ties, so log-strengths stay on the same scale.
+
+    Args:
+        d: Log-strength differences θ_i - θ_j, one per matchup row
+        s: Log tie parameter (ignored when ties is None)
+        ties: None, 'davidson' or 'rao-kupper'
+
+    Returns:
+        (log_p, dlog_p_dd, dlog_p_ds), arrays of shape (n_outcomes, n_rows);
+        dlog_p_ds is None for the plain model.
+    """
+    # Complements such as 1 - σ(x) are evaluated as σ(-x) so that nothing
+    # cancels catastrophically, which keeps float32 accurate for large |d|
+    if ties is None:
+        log_p = np.stack([_log_sigmoid(d), _log_sigmoid(-d)])
+        p = np.exp(log_p)
+        return log_p, np.stack([p[1], -p[0]]), None
+
+    if ties == "davidson":
+        log_z = np.logaddexp(np.logaddexp(d / 2, -d / 2), s)
+        log_p = np.stack([d / 2 - log_z, -d / 2 - log_z, s - log_z])
+        p = np.exp(log_p)
+        dlog_dd = np.stack([p[1] + p[2] / 2, -p[0] - p[2] / 2, (p[1] - p[0]) / 2])
+        dlog_ds = np.stack([-p[2], -p[2], p[0] + p[1]])
+        return log_p, dlog_dd, dlog_ds
+
+    if ties == "rao-kupper":
+        eta = np.exp(s)
+        log_p_win = _log_sigmoid(d - eta)
+        log_p_loss = _log_sigmoid(-d - eta)
+        log_not_win = _log_sigmoid(eta - d)
+        log_not_loss = _log_sigmoid(eta + d)
+        # P(tie) = σ(η - d) σ(η + d) (1 - e^{-2η}), evaluated in log space
+        log_p_tie = log_not_win + log_not_loss + np.log(-np.expm1(-2 * eta))
+        p_win, p_loss = np.exp(log_p_win), np.exp(log_p_loss)
+        not_win, not_loss = np.exp(log_not_win), np.exp(log_not_loss)
+        log_p = np.stack([log_p_win, log_p_loss, log_p_tie])
+        dlog_dd = np.stack([not_win, -not_loss, p_loss - p_win])
+        dlog_deta = np.stack(
+            [-not_win, -not_loss, p_win + p_loss + 2 / np.expm1(2 * eta)]
+        )
+        return log_p, dlog_dd, eta * dlog_deta
+
+    raise ValueError(f"Unknown tie model: {ties}. Use one of {TIE_MODELS}")
+
+
+class FamilyPrior:
+    """
+    Hierarchical Gaussian prior on the log-strengths.
+
+    θ_p ~ N(μ_g(p), 1/reg) for players in family g, with μ_g ~ N(0, 1/family_reg);
+    players without a family keep the plain ridge prior θ_p ~ N(0, 1/reg).
+
+    The family means have the closed form μ_g = reg Σ_{p∈g} θ_p / (reg n_g + family_reg),
+    so they are profiled out and the fitters see the quadratic penalty ½ θᵀQθ.
+    With no families this is exactly the ridge penalty ½ reg ||θ||².
+    """
+
+    def __init__(
+        self,
+        families: List[Optional[str]],
+        reg: float,
+        family_reg: float = 0.01,
+    ):
+        """
+        Args:
+            families: Family label of each player (None for no family)
+            reg: Precision of players around their family mean (or zero)
+            family_reg: Precision of the family means around zero
+        """
+        self.families = sorted({f for f in families if f is not None})
+        lookup = {f: g for g, f in enumerate(self.families)}
+        self.index = np.array(
+            [lookup[f] if f is not None else -1 for f in families], dtype=int
+        )
+        self.member = self.index >= 0
+        self.reg = reg
+        self.family_reg = family_reg
+        sizes = np.bincount(self.index[self.member], minlength=len(self.families))
+        self.shrink = reg / (reg * sizes + family_reg)
+
+    def subset(self, members: np.ndarray) -> "FamilyPrior":
+        """The same prior restricted to the players in `members`."""
+        labels = [
+            self.families[g] if g >= 0 else None for g in self.index[members]
+        ]
+        return FamilyPrior(labels, self.reg, self.family_reg)
+
+    def means(self, theta: np.ndarray) -> np.ndarray:
+        """Closed-form family means given the log-strengths."""
+        sums = np.bincount(
+            self.index[self.member],
+            weights=theta[self.member],
+            minlength=len(self.families),
+        )
+        return (self.shrink * sums).astype(theta.dtype)
+
+    def penalty(self, theta: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Penalty value and its gradient with respect to θ."""
+        if not self.families:
+            return 0.5 * self.reg * np.sum(theta**2), self.reg * theta
+        mu = self.means(theta)
+        resid = theta - np.where(self.member, mu[self.index], 0.0)
+        value = 0.5 * self.reg * np.sum(resid**2) + 0.5 * self.family_reg * np.sum(
+            mu**2
+        )
+        return value, self.reg * resid
+
+    def hessian(self) -> np.ndarray:
+        """Q = reg I minus reg * shrink_g on each family block."""
+        hess = self.reg * np.eye(len(self.index))
+        for g in range(len(self.families)):
+            members = np.flatnonzero(self.index == g)
+            hess[np.ix_(members, members)] -= self.reg * self.shrink[g]
+        return hess
+
+
+def _relabel_by_size(labels: np.ndarray) -> np.ndarray:
+    """Relabel components so that 0 is the largest, 1 the next largest, ..."""
+    sizes = np.bincount(labels)
+    order = np.argsort(-sizes, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[labels]
+
+
+def summarize_bootstrap(
+    strengths_samples: np.ndarray,
+    log_strengths_samples: np.ndarray,
+    tie_parameter_samples: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Summary statistics of bootstrap samples, in the format of fit_bootstrap().
+
+    Args:
+        strengths_samples: Array of shape (n_bootstrap, n_players)
+        log_strengths_samples: Array of shape (n_bootstrap, n_players)
+        tie_parameter_samples: Tie parameter per sample (tie models only)
+    """
+    results = {
+        "strengths_samples": strengths_samples,
+        "log_strengths_samples": log_strengths_samples,
+        "mean_strengths": np.mean(strengths_samples, axis=0),
+        "std_strengths": np.std(strengths_samples, axis=0),
+        "ci_lower": np.percentile(strengths_samples, 2.5, axis=0),
+        "ci_upper": np.percentile(strengths_samples, 97.5, axis=0),
+    }
+    if tie_parameter_samples is not None:
+        results["tie_parameter_samples"] = tie_parameter_samples
+    return results
+
+
+# Columns of the rankings tables built by BradleyTerryModel.rankings_table
+RANKING_COLUMNS = {
+    "strength": [
+        "Rank", "Username", "BT_Strength", "Log_Strength", "Total_Wins",
+        "Total_Losses", "Total_Games", "Win_Rate", "Elo", "Glicko",
+    ],
+    "elo": [
+        "Rank", "Username", "BT_Strength", "BT_Elo", "Log_Strength", "Total_Wins",
+        "Total_Losses", "Total_Games", "Win_Rate", "Original_Elo", "Glicko",
+    ],
+    "uncertainty": [
+        "Rank", "Username", "BT_Strength", "BT_Std", "BT_CI_Lower", "BT_CI_Upper",
+        "Total_Wins", "Total_Losses", "Win_Rate", "Elo",
+    ],
+    "elo_uncertainty": [
+        "Rank", "Username", "BT_Strength", "BT_Std", "BT_CI_Lower", "BT_CI_Upper",
+        "BT_Elo", "Elo_Std", "Elo_CI_Lower", "Elo_CI_Upper", "Total_Wins",
+        "Total_Losses", "Win_Rate", "Original_Elo", "Glicko",
+    ],
+}
+
+
+def load_probability_matrix(path: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Read a matrix written by BradleyTerryModel.export_probability_matrix.
+
+    Returns:
+        (players, probabilities) with probabilities as a float k x k array
+    """
+    import base64
+
+    with open(path) as f:
+        data = json.load(f)
+    quantized = np.frombuffer(
+        base64.b64decode(data["data"]), dtype=np.dtype(data["dtype"]).newbyteorder("<")
+    ).reshape(data["shape"])
+    return data["players"], quantized / data["scale"]
+
+
 class BradleyTerryModel:
     """
     Bradley-Terry model for estimating player strengths from pairwise comparisons.
 
     The model assumes P(i beats j) = π_i / (π_i + π_j)
     where π_i is the strength parameter for player i.
+
+    With ties='davidson' or ties='rao-kupper', draws are modelled explicitly
+    and the fitted tie parameter is stored in `tie_parameter`. A fit with
+    decompose=True fits one tie parameter per connected component (log scale,
+    in `component_tie_params`); `tie_parameter` reports the largest one's.
     """
 
     def __init__(self, h2h_matrix: HeadToHeadMatrix):
@@ -223,6 +707,16 @@ class BradleyTerryModel:
         self.n_players = len(h2h_matrix.players)
         self.strengths = None
         self.log_strengths = None
+        self.tie_model = None
+        self.tie_parameter = None
+        self.family_means = {}
+        self.components = None
+        self.strong_components = None
+        self.component_tie_params = None
+        self.params = None
+        self.fit_info = None
+        # (wins matrix, row sums, column sums) of the last rankings table
+        self._totals = None
 
     def fit_logistic(
         self,
@@ -235,6 +729,15 @@ class BradleyTerryModel:
         verbose: bool = True,
         normalize_matchups: str = None,
         max_games_per_matchup: int = None,
+        matchup_power: float = None,
+        ties: str = None,
+        families=None,
+        family_regularization: float = 0.01,
+        decompose: bool = False,
+        n_jobs: int = None,
+        dtype=np.float64,
+        x0: np.ndarray = None,
+        half_life: float = None,
     ) -> np.ndarray:
         """
         Fit Bradley-Terry model using logistic regression formulation.
@@ -255,12 +758,44 @@ class BradleyTerryModel:
             max_iter: Maximum iterations for gradient descent (default: 1000)
             tol: Convergence tolerance for gradient descent (default: 1e-6)
             verbose: Whether to print progress (default: True)
-            normalize_matchups: How to weight matchup contributions (None, 'equal_weight', 'sqrt', 'cap')
+            normalize_matchups: How to weight matchup contributions (None, 'equal_weight', 'sqrt', 'cap', 'power')
                 None: Use all games (default)
                 'equal_weight': Each matchup contributes equally regardless of game count
                 'sqrt': Weight by sqrt(total games), balancing informativeness with preventing domination
                 'cap': Cap games per matchup at max_games_per_matchup
+                'power': Weight by total games ** matchup_power
+                A matchup of n games with weight w enters the likelihood as
+                its outcome counts scaled by w / n (real-valued, no rounding).
             max_games_per_matchup: Maximum games to use per matchup (only used with normalize_matchups='cap')
+            matchup_power: Exponent α of normalize_matchups='power'; 1 uses
+                all games, 0.5 is 'sqrt' and 0 is 'equal_weight'
+            ties: How to treat tied games (None, 'davidson', 'rao-kupper')
+                None: Ignore ties (default)
+                'davidson': Davidson (1970) model, tie parameter ν
+                'rao-kupper': Rao-Kupper (1967) model, tie parameter θ >= 1
+            families: Hierarchical shrinkage of players toward a family mean
+                None: Shrink every player toward zero (default)
+                'auto': Starter-kit families from parse_tsv_ladders.agent_family
+                list: Family label of each player (None for no family)
+            family_regularization: L2 penalty on the family means (only used
+                with families); `regularization` then sets how strongly
+                players shrink toward their family mean
+            decompose: Fit each connected component of the comparison graph
+                independently (see find_components). Strengths are then only
+                comparable within a component and are normalized per component.
+            n_jobs: Worker threads for per-component fits (default: one per CPU)
+            dtype: Floating point type of comparison arrays, parameters,
+                gradients and results (np.float64 or np.float32). float32
+                halves memory and bandwidth; Elo ratings agree to well within
+                0.1 points (see validate_float32.py).
+            x0: Starting parameters, e.g. `self.params` of a previous fit
+                (warm start); log-strengths followed by the log tie parameter
+                for tie models
+            half_life: Exponential time decay: a game `half_life` old (in the
+                unit of the interval ages, e.g. days) counts half as much as
+                a current one. Needs per-interval counts on the matrix
+                (HeadToHeadMatrix.set_intervals, e.g. from
+                LadderHistory.history_matrix); None uses all games equally.
 
         Returns:
             Array of strength parameters (π values)
@@ -269,6 +804,10 @@ class BradleyTerryModel:
 
         if self.h2h.wins_matrix is None:
             raise ValueError("Must compute H2H matrices first")
+        if ties not in TIE_MODELS:
+            raise ValueError(f"Unknown tie model: {ties}. Use one of {TIE_MODELS}")
+        if x0 is not None and not np.all(np.isfinite(x0)):
+            raise ValueError("Warm start x0 has non-finite values")
 
         # Build dataset from pairwise comparisons
         if normalize_matchups:
@@ -277,230 +816,579 @@ class BradleyTerryModel:
             )
         else:
             vprint("Building comparison dataset...")
-        comparisons = []
-        for i in range(self.n_players):
-            for j in range(self.n_players):
-                if i != j:
-                    n_ij = self.h2h.wins_matrix[i, j]  # wins by i over j
-                    n_ji = self.h2h.wins_matrix[j, i]  # wins by j over i
-                    total = n_ij + n_ji
-
-                    if total >= min_games and total > 0:
-                        # Apply normalization/weighting
-                        if normalize_matchups == "cap" and max_games_per_matchup:
-                            if total > max_games_per_matchup:
-                                scale_factor = max_games_per_matchup / total
-                                n_ij_use = int(round(n_ij * scale_factor))
-                                n_ji_use = int(round(n_ji * scale_factor))
-                            else:
-                                n_ij_use = int(n_ij)
-                                n_ji_use = int(n_ji)
-                        elif normalize_matchups == "equal_weight":
-                            # Each matchup contributes exactly 1 label, proportional to win rate
-                            n_ij_use = 1 if n_ij > 0 else 0
-                            n_ji_use = 1 if n_ji > 0 else 0
-                        elif normalize_matchups == "sqrt":
-                            # Weight by sqrt of total games
-                            sqrt_total = np.sqrt(total)
-                            win_rate = n_ij / total if total > 0 else 0.5
-                            loss_rate = n_ji / total if total > 0 else 0.5
-                            # Ensure at least 1 label if there were any games
-                            n_ij_use = (
-                                max(1, int(round(win_rate * sqrt_total)))
-                                if n_ij > 0
-                                else 0
-                            )
-                            n_ji_use = (
-                                max(1, int(round(loss_rate * sqrt_total)))
-                                if n_ji > 0
-                                else 0
-                            )
-                        else:
-                            # No normalization - use all games
-                            n_ij_use = int(n_ij)
-                            n_ji_use = int(n_ji)
-
-                        # Add the normalized number of comparisons
-                        for _ in range(n_ij_use):
-                            comparisons.append((i, j, 1))
-                        for _ in range(n_ji_use):
-                            comparisons.append((i, j, 0))
-
-        n_comparisons = len(comparisons)
-        vprint(f"   Built dataset with {n_comparisons:,} pairwise comparisons")
+        matchups = self._build_matchups(
+            min_games,
+            normalize_matchups,
+            max_games_per_matchup,
+            ties,
+            dtype,
+            matchup_power,
+            half_life,
+        )
+
+        n_comparisons = float(matchups["counts"].sum())
+        vprint(
+            f"   Built dataset with {n_comparisons:,.1f} weighted pairwise comparisons "
+            f"over {len(matchups['i']):,} matchups"
+        )
+        prior = self._build_prior(families, regularization, family_regularization)
+        if prior.families:
+            vprint(f"   Shrinking toward {len(prior.families)} family means")
         vprint(f"   Starting optimization...")
 
+        fitter_kwargs = dict(
+            ties=ties, lr=lr, max_iter=max_iter, tol=tol, verbose=verbose, x0=x0
+        )
+        if decompose:
+            x, info = self._fit_components(
+                method, matchups, prior, n_jobs, **fitter_kwargs
+            )
+        else:
+            self.components = None
+            self.component_tie_params = None
+            x, info = self._run_fitter(method, matchups, prior, **fitter_kwargs)
+
+        # Every matchup lies within one component, fitted with its own tie
+        # parameter, so this is the objective the component fits maximized
+        row_tie_params = None
+        if decompose and ties:
+            row_tie_params = self.component_tie_params[self.components[matchups["i"]]]
+        loglik, grad = self._log_likelihood_terms(
+            x, matchups, prior, ties, row_tie_params=row_tie_params
+        )
+        penalty = prior.penalty(x[: self.n_players])[0]
+        self.fit_info = {
+            **info,
+            "log_likelihood": float(loglik + penalty),
+            "penalty": float(penalty),
+            "gradient_norm": float(np.max(np.abs(grad))) if len(grad) else 0.0,
+        }
+        self.params = x
+        theta = x[: self.n_players].astype(dtype, copy=False)
+        self.tie_model = ties
+        self.tie_parameter = self._tie_parameter(x[-1], ties) if ties else None
+
+        # Convert log-strengths to strengths
+        self.log_strengths = theta
+        self.strengths = np.exp(theta)
+
+        # Normalize (per component: strengths of different components are
+        # not comparable, so each one is scaled to average 1 on its own)
+        groups = self.components if decompose else np.zeros(self.n_players, int)
+        sizes = np.bincount(groups)
+        self.strengths = self.strengths * (
+            sizes[groups] / np.bincount(groups, weights=self.strengths)[groups]
+        ).astype(dtype)
+        self.log_strengths = np.log(self.strengths)
+
+        # Family means on the same (normalized) log scale
+        shift = -np.log(np.mean(np.exp(theta)))
+        self.family_means = {
+            f: float(mu + shift) for f, mu in zip(prior.families, prior.means(theta))
+        }
+
+        return self.strengths
+
+    def _run_fitter(
+        self,
+        method: str,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        ties: str = None,
+        lr: float = 0.001,
+        max_iter: int = 1000,
+        tol: float = 1e-6,
+        verbose: bool = True,
+        x0: np.ndarray = None,
+    ) -> Tuple[np.ndarray, Dict[str, object]]:
+        """
+        Dispatch to the optimizer named by `method`.
+
+        Returns:
+            (x, info) with the fitted parameters and a dict with the number of
+            'iterations' and whether the optimizer 'converged'
+        """
+        if ties and not matchups["counts"][2].any():
+            # Without any tied game the tie parameter's MLE is on the boundary
+            # (ν = 0, θ = 1), where every tie model reduces to plain BT
+            plain = {**matchups, "counts": matchups["counts"][:2]}
+            x0 = x0[: matchups["n_players"]] if x0 is not None else None
+            x, info = self._run_fitter(
+                method, plain, prior, None, lr, max_iter, tol, verbose, x0
+            )
+            return np.append(x, x.dtype.type(NO_TIES_LOG_PARAM)), info
+
         if method == "lbfgs":
-            theta = self._fit_logistic_lbfgs(
-                comparisons, regularization, verbose=verbose
+            return self._fit_logistic_lbfgs(
+                matchups, prior, ties=ties, verbose=verbose, x0=x0
             )
         elif method == "gradient_descent":
-            theta = self._fit_logistic_gd(
-                comparisons,
-                regularization,
+            return self._fit_logistic_gd(
+                matchups,
+                prior,
+                ties=ties,
                 max_iter=max_iter,
                 lr=lr,
                 tol=tol,
                 verbose=verbose,
+                x0=x0,
             )
         elif method == "newton":
-            theta = self._fit_logistic_newton(
-                comparisons, regularization, verbose=verbose
+            return self._fit_logistic_newton(
+                matchups, prior, ties=ties, verbose=verbose, x0=x0
+            )
+        raise ValueError(f"Unknown method: {method}")
+
+    def find_components(
+        self, min_games: int = 0, ties: str = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Connected components of the comparison graph.
+
+        Strengths are only identified within a (weakly) connected component.
+        Inside one, the maximum-likelihood estimate exists only if the "beats"
+        graph (i -> j when i won or tied at least once against j) is strongly
+        connected; otherwise some players are perfectly separated and their
+        rating gaps are set by the ridge term alone.
+
+        Components are labelled by decreasing size, so component 0 is the
+        largest.
+
+        Args:
+            min_games: Minimum games required to include a matchup
+            ties: Count ties as comparisons in both directions
+
+        Returns:
+            Dictionary with 'components' and 'strong_components' (label per
+            player) and their counts 'n_components' and 'n_strong_components'
+        """
+        return self._components_of_matchups(
+            self._build_matchups(min_games, ties=ties), ties
+        )
+
+    def _fit_components(
+        self,
+        method: str,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        n_jobs: int = None,
+        **fitter_kwargs,
+    ) -> Tuple[np.ndarray, Dict[str, object]]:
+        """
+        Fit every connected component of the comparison graph on its own, in
+        parallel threads. Players without any matchup keep θ = 0.
+
+        With a tie model, each component fits its own tie parameter, stored
+        in component_tie_params; the one of the largest component goes to the
+        last entry of the returned parameters.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        ties = fitter_kwargs["ties"]
+        x0 = fitter_kwargs.pop("x0", None)
+        # Components of the matchups actually used (after min_games)
+        info = self._components_of_matchups(matchups, ties)
+        self.components = info["components"]
+        self.strong_components = info["strong_components"]
+
+        n_components = info["n_components"]
+        if fitter_kwargs["verbose"]:
+            print(f"   Fitting {n_components} connected component(s)")
+
+        row_component = self.components[matchups["i"]]
+        jobs = []
+        for c in range(n_components):
+            members = np.flatnonzero(self.components == c)
+            if len(members) < 2:
+                continue
+            local = np.full(self.n_players, -1)
+            local[members] = np.arange(len(members))
+            rows = row_component == c
+            sub_matchups = {
+                "i": local[matchups["i"][rows]],
+                "j": local[matchups["j"][rows]],
+                "counts": matchups["counts"][:, rows],
+                "n_players": len(members),
+            }
+            sub_x0 = None
+            if x0 is not None:
+                sub_x0 = np.append(x0[members], x0[-1]) if ties else x0[members]
+            jobs.append((members, sub_matchups, prior.subset(members), sub_x0))
+
+        if len(jobs) > 1:
+            fitter_kwargs = {**fitter_kwargs, "verbose": False}
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(
+                pool.map(
+                    lambda job: self._run_fitter(
+                        method, job[1], job[2], x0=job[3], **fitter_kwargs
+                    ),
+                    jobs,
+                )
+            )
+
+        x = self._initial_params(matchups, ties, x0)
+        for (members, _, _, _), (x_c, _) in zip(jobs, results):
+            x[members] = x_c[: len(members)]
+        self.component_tie_params = None
+        if ties:
+            # Components without matchups (single players) keep the initial value
+            self.component_tie_params = np.full(n_components, float(x[-1]))
+            for (members, _, _, _), (x_c, _) in zip(jobs, results):
+                self.component_tie_params[self.components[members[0]]] = x_c[-1]
+            if results:
+                # jobs are in component order, so the first is the largest
+                x[-1] = results[0][0][-1]
+        info = {
+            "iterations": max((r[1]["iterations"] for r in results), default=0),
+            "converged": all(r[1]["converged"] for r in results),
+        }
+        return x, info
+
+    def _components_of_matchups(
+        self, matchups: Dict[str, np.ndarray], ties: str
+    ) -> Dict[str, np.ndarray]:
+        """Weak and strong components of an already built set of matchups."""
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n = self.n_players
+        i_idx, j_idx, counts = matchups["i"], matchups["j"], matchups["counts"]
+        graph = csr_matrix((np.ones(len(i_idx)), (i_idx, j_idx)), shape=(n, n))
+        n_weak, weak = connected_components(graph, directed=False)
+
+        # Rows come in both orders, so a win of j over i is row (j, i)
+        beats = counts[0] > 0
+        if ties:
+            beats |= counts[2] > 0
+        beats_graph = csr_matrix(
+            (np.ones(beats.sum()), (i_idx[beats], j_idx[beats])), shape=(n, n)
+        )
+        n_strong, strong = connected_components(
+            beats_graph, directed=True, connection="strong"
+        )
+
+        return {
+            "components": _relabel_by_size(weak),
+            "strong_components": _relabel_by_size(strong),
+            "n_components": n_weak,
+            "n_strong_components": n_strong,
+        }
+
+    def component_report(self, min_games: int = 0) -> pd.DataFrame:
+        """
+        Flag players whose ratings are only comparable within their component.
+
+        Uses the components of the last fit with decompose=True, otherwise
+        computes them from the data.
+
+        Args:
+            min_games: Minimum games per matchup (when computing components)
+
+        Returns:
+            DataFrame with columns:
+                - Username, Component, Component_Size, Strong_Component
+                - Comparable: in the largest component, i.e. comparable with
+                  the bulk of the ladder
+                - Separated: the player's component is not strongly connected,
+                  so some rating gaps are set by the ridge term alone
+        """
+        import pandas as pd
+
+        if self.components is None:
+            info = self.find_components(min_games=min_games, ties=self.tie_model)
+            components, strong = info["components"], info["strong_components"]
+        else:
+            components, strong = self.components, self.strong_components
+
+        component_size = np.bincount(components)
+        strong_size = np.bincount(strong)
+        return pd.DataFrame(
+            {
+                "Username": self.h2h.get_usernames(),
+                "Component": components,
+                "Component_Size": component_size[components],
+                "Strong_Component": strong,
+                "Comparable": components == 0,
+                "Separated": strong_size[strong] < component_size[components],
+            }
+        )
+
+    def _build_prior(
+        self, families, reg: float, family_reg: float
+    ) -> FamilyPrior:
+        """Resolve the `families` argument of fit_logistic into a FamilyPrior."""
+        if families is None:
+            families = [None] * self.n_players
+        elif families == "auto":
+            try:
+                from leaderboard.parse_tsv_ladders import agent_family
+            except ModuleNotFoundError:
+                from parse_tsv_ladders import agent_family
+
+            families = [agent_family(u) for u in self.h2h.get_usernames()]
+        elif len(families) != self.n_players:
+            raise ValueError(
+                f"families has {len(families)} entries for {self.n_players} players"
             )
+        return FamilyPrior(families, reg, family_reg)
+
+    def _build_matchups(
+        self,
+        min_games: int = 0,
+        normalize_matchups: str = None,
+        max_games_per_matchup: int = None,
+        ties: str = None,
+        dtype=np.float64,
+        matchup_power: float = None,
+        half_life: float = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Build one row per ordered matchup (i, j) with its outcome counts.
+
+        Normalization reweights each matchup as a whole: its outcome counts
+        are scaled by weight / total games, so counts are real-valued and a
+        matchup's win rate is kept exactly. Computed vectorized over the
+        whole matrix. With half_life, outcomes are first time-decayed
+        (HeadToHeadMatrix.decay_weights); min_games still applies to the
+        undecayed game counts.
+
+        Returns:
+            Dictionary with 'i', 'j' (player indices), 'counts', an array of
+            shape (n_outcomes, n_rows) holding wins of i, wins of j and, for
+            tie models, ties, and 'n_players'.
+        """
+        wins = self.h2h.wins_matrix.astype(float)
+        losses = wins.T
+        tied = (
+            self.h2h.ties_matrix.astype(float) if ties else np.zeros_like(wins)
+        )
+        total = wins + losses + tied
+        games = total  # min_games counts undecayed games
+        if half_life is not None:
+            wins_weight, ties_weight = self.h2h.decay_weights(half_life)
+            wins = wins * wins_weight
+            losses = wins.T
+            tied = tied * ties_weight
+            total = wins + losses + tied
+
+        mask = (games >= min_games) & (total > 0)
+        np.fill_diagonal(mask, False)
+        i_idx, j_idx = np.nonzero(mask)
+        outcomes = [wins[mask], losses[mask], tied[mask]]
+        total = total[mask]
+
+        # Apply normalization/weighting: weight = effective games of the matchup
+        if normalize_matchups == "cap" and max_games_per_matchup:
+            weight = np.minimum(total, max_games_per_matchup)
+        elif normalize_matchups == "equal_weight":
+            weight = np.ones_like(total)
+        elif normalize_matchups == "sqrt":
+            weight = np.sqrt(total)
+        elif normalize_matchups == "power":
+            if matchup_power is None:
+                raise ValueError("normalize_matchups='power' requires matchup_power")
+            weight = total**matchup_power
+        elif normalize_matchups in (None, "cap"):
+            weight = total
         else:
-            raise ValueError(f"Unknown method: {method}")
+            raise ValueError(f"Unknown normalize_matchups: {normalize_matchups}")
+        outcomes = [c * (weight / total) for c in outcomes]
+
+        counts = np.stack(outcomes if ties else outcomes[:2]).astype(dtype)
+        return {"i": i_idx, "j": j_idx, "counts": counts, "n_players": self.n_players}
+
+    @staticmethod
+    def _initial_tie_log_param(counts: np.ndarray, ties: str) -> float:
+        """Moment estimate of the log tie parameter at equal strengths."""
+        tie_rate = np.clip(counts[2].sum() / max(counts.sum(), 1), 1e-3, 0.5)
+        if ties == "davidson":
+            return float(np.log(2 * tie_rate / (1 - tie_rate)))
+        return float(np.log(2 * np.arctanh(tie_rate)))
+
+    @staticmethod
+    def _tie_parameter(s: float, ties: str) -> float:
+        """Report the tie parameter on its conventional scale (ν or θ)."""
+        return float(np.exp(s)) if ties == "davidson" else float(np.exp(np.exp(s)))
+
+    def _initial_params(
+        self, matchups: Dict[str, np.ndarray], ties: str, x0: np.ndarray = None
+    ):
+        if x0 is not None:
+            return np.array(x0, dtype=matchups["counts"].dtype)
+        x0 = np.zeros(
+            matchups["n_players"] + (1 if ties else 0), dtype=matchups["counts"].dtype
+        )
+        if ties:
+            x0[-1] = self._initial_tie_log_param(matchups["counts"], ties)
+        return x0
 
-        # Convert log-strengths to strengths
-        self.log_strengths = theta
-        self.strengths = np.exp(theta)
+    def _log_likelihood_terms(
+        self,
+        x: np.ndarray,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        ties: str = None,
+        fisher: bool = False,
+        row_tie_params: np.ndarray = None,
+    ):
+        """
+        Penalized log-likelihood and its gradient (vectorized over matchups).
 
-        # Normalize
-        self.strengths = self.strengths * self.n_players / np.sum(self.strengths)
-        self.log_strengths = np.log(self.strengths)
+        Args:
+            x: Parameters; log-strengths followed by the log tie parameter
+            matchups: Output of _build_matchups
+            prior: Prior (penalty) on the log-strengths
+            ties: Tie model
+            fisher: Also return per-row Fisher information terms
+            row_tie_params: Log tie parameter of every matchup row, replacing
+                the one in x (per-component fits)
 
-        return self.strengths
+        Returns:
+            (loglik, grad) or (loglik, grad, (f_dd, f_ds, f_ss))
+        """
+        n = matchups["n_players"]
+        i_idx, j_idx, counts = matchups["i"], matchups["j"], matchups["counts"]
+        dtype = counts.dtype
+        x = x.astype(dtype, copy=False)
+        theta = x[:n]
+        s = x[n] if ties else 0.0
+        if ties and row_tie_params is not None:
+            s = row_tie_params.astype(dtype, copy=False)
+
+        log_p, dlog_dd, dlog_ds = _outcome_kernels(
+            theta[i_idx] - theta[j_idx], s, ties
+        )
+        penalty, penalty_grad = prior.penalty(theta)
+        # Scalar accumulated in float64: a float32 total cannot resolve the
+        # small decreases the optimizer checks for convergence
+        loglik = np.sum(counts * log_p, dtype=np.float64) - penalty
+
+        residuals = np.sum(counts * dlog_dd, axis=0)
+        grad = np.zeros_like(x)
+        grad[:n] += np.bincount(i_idx, weights=residuals, minlength=n).astype(dtype)
+        grad[:n] -= np.bincount(j_idx, weights=residuals, minlength=n).astype(dtype)
+        grad[:n] -= penalty_grad
+        if ties:
+            grad[n] = np.sum(counts * dlog_ds)
+
+        if not fisher:
+            return loglik, grad
+
+        # Expected information per row: N * Σ_k p_k (∂log p_k)(∂log p_k)ᵀ
+        probs = np.exp(log_p)
+        total = counts.sum(axis=0)
+        f_dd = total * np.sum(probs * dlog_dd**2, axis=0)
+        f_ds = total * np.sum(probs * dlog_dd * dlog_ds, axis=0) if ties else None
+        f_ss = np.sum(total * np.sum(probs * dlog_ds**2, axis=0)) if ties else None
+        return loglik, grad, (f_dd, f_ds, f_ss)
 
     def _fit_logistic_lbfgs(
-        self, comparisons: List[Tuple[int, int, int]], reg: float, verbose: bool = True
-    ) -> np.ndarray:
+        self,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        ties: str = None,
+        verbose: bool = True,
+        x0: np.ndarray = None,
+    ) -> Tuple[np.ndarray, Dict[str, object]]:
         """Fit using L-BFGS optimization with vectorized computations."""
-        n = self.n_players
-
-        # Convert comparisons to arrays for vectorization
-        comp_array = np.array(comparisons, dtype=np.int32)
-        i_idx = comp_array[:, 0]
-        j_idx = comp_array[:, 1]
-        outcomes = comp_array[:, 2].astype(float)
-        n_comp = len(comparisons)
+        from scipy.optimize import minimize
 
         iteration_count = [0]
 
-        def negative_log_likelihood(theta):
-            """Negative log-likelihood with L2 regularization (vectorized)."""
-            logits = theta[i_idx] - theta[j_idx]
-            # log(p) = logit - log(1 + exp(logit))
-            nll = -np.sum(outcomes * logits - np.log1p(np.exp(logits)))
-            nll += 0.5 * reg * np.sum(theta**2)
-            return nll
-
-        def gradient(theta):
-            """Gradient of negative log-likelihood (vectorized)."""
-            logits = theta[i_idx] - theta[j_idx]
-            probs = 1 / (1 + np.exp(-logits))
-            residuals = outcomes - probs
-            grad = np.zeros(n)
-            grad -= np.bincount(i_idx, weights=residuals, minlength=n)
-            grad += np.bincount(j_idx, weights=residuals, minlength=n)
-            grad += reg * theta
+        def objective(x):
+            """Negative penalized log-likelihood and its gradient."""
+            loglik, grad = self._log_likelihood_terms(x, matchups, prior, ties)
             iteration_count[0] += 1
-            if iteration_count[0] % 10 == 0:
+            if verbose and iteration_count[0] % 10 == 0:
                 print(
-                    f"    Iteration {iteration_count[0]//2}: NLL = {negative_log_likelihood(theta):.4f}",
+                    f"    Iteration {iteration_count[0]}: NLL = {-loglik:.4f}",
                     end="\r",
                 )
-            return grad
+            # L-BFGS-B itself always works in float64
+            return -float(loglik), -grad.astype(np.float64)
 
         # Optimize
-        theta0 = np.zeros(n)
         result = minimize(
-            negative_log_likelihood,
-            theta0,
+            objective,
+            self._initial_params(matchups, ties, x0).astype(np.float64),
             method="L-BFGS-B",
-            jac=gradient,
+            jac=True,
             options={"maxiter": 1000, "disp": False},
         )
         if result.success and verbose:
             print(f"L-BFGS converged in {result.nit} iterations")
         elif verbose:
             print(f"L-BFGS did not converge: {result.message}")
-        return result.x
+        info = {"iterations": int(result.nit), "converged": bool(result.success)}
+        return result.x.astype(matchups["counts"].dtype), info
 
     def _fit_logistic_gd(
         self,
-        comparisons: List[Tuple[int, int, int]],
-        reg: float,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        ties: str = None,
         max_iter: int = 1000,
         lr: float = 0.001,
         tol: float = 1e-6,
         verbose: bool = True,
-    ) -> np.ndarray:
+        x0: np.ndarray = None,
+    ) -> Tuple[np.ndarray, Dict[str, object]]:
         """Fit using gradient descent (vectorized)."""
-        n = self.n_players
-
         vprint = print if verbose else lambda *a, **k: None
-        # Convert comparisons to arrays for vectorization
-        comp_array = np.array(comparisons, dtype=np.int32)
-        i_idx = comp_array[:, 0]
-        j_idx = comp_array[:, 1]
-        outcomes = comp_array[:, 2].astype(float)
 
-        theta = np.zeros(n)
+        x = self._initial_params(matchups, ties, x0)
+        converged = False
+        iteration = -1
 
         for iteration in range(max_iter):
-            # Vectorized gradient computation
-            logits = theta[i_idx] - theta[j_idx]
-            probs = 1 / (1 + np.exp(-logits))
-            residuals = outcomes - probs
-
-            # Accumulate gradients using bincount
-            grad = np.zeros(n)
-            grad += np.bincount(i_idx, weights=residuals, minlength=n)
-            grad -= np.bincount(j_idx, weights=residuals, minlength=n)
-
-            grad -= reg * theta
+            _, grad = self._log_likelihood_terms(x, matchups, prior, ties)
 
             # Update with learning rate
-            theta_new = theta + lr * grad
+            x_new = x + lr * grad
 
-            diff = np.max(np.abs(theta_new - theta))
-            theta = theta_new
+            diff = np.max(np.abs(x_new - x))
+            x = x_new
 
             if iteration % 100 == 0:
                 vprint(f"    Iteration {iteration}: max_diff = {diff:.2e}", end="\r")
 
             if diff < tol:
                 vprint(f"Gradient descent converged in {iteration + 1} iterations")
+                converged = True
                 break
         else:
             vprint(f"Gradient descent did not converge after {max_iter} iterations")
 
-        return theta
+        return x, {"iterations": iteration + 1, "converged": converged}
 
     def _fit_logistic_newton(
-        self, comparisons: List[Tuple[int, int, int]], reg: float, verbose: bool = True
-    ) -> np.ndarray:
+        self,
+        matchups: Dict[str, np.ndarray],
+        prior: FamilyPrior,
+        ties: str = None,
+        verbose: bool = True,
+        x0: np.ndarray = None,
+    ) -> Tuple[np.ndarray, Dict[str, object]]:
         """Fit using Newton's method (Fisher scoring) - vectorized."""
-        n = self.n_players
+        n = matchups["n_players"]
+        i_idx, j_idx = matchups["i"], matchups["j"]
 
         vprint = print if verbose else lambda *a, **k: None
-        # Convert comparisons to arrays for vectorization
-        comp_array = np.array(comparisons, dtype=np.int32)
-        i_idx = comp_array[:, 0]
-        j_idx = comp_array[:, 1]
-        outcomes = comp_array[:, 2].astype(float)
-        n_comp = len(comparisons)
-
-        theta = np.zeros(n)
+
+        x = self._initial_params(matchups, ties, x0)
+        prior_hess = prior.hessian().astype(x.dtype)
         max_iter = 100
         tol = 1e-6
+        converged = False
 
         for iteration in range(max_iter):
-            # Vectorized gradient computation
-            logits = theta[i_idx] - theta[j_idx]
-            probs = 1 / (1 + np.exp(-logits))
-            residuals = outcomes - probs
-
-            # Compute gradient
-            grad = np.zeros(n)
-            grad += np.bincount(i_idx, weights=residuals, minlength=n)
-            grad -= np.bincount(j_idx, weights=residuals, minlength=n)
-
-            # Compute Hessian (Fisher information)
-            # For each comparison: w_ij = p(1-p)
-            weights = probs * (1 - probs)
+            _, grad, (weights, cross, tie_info) = self._log_likelihood_terms(
+                x, matchups, prior, ties, fisher=True
+            )
 
-            # Build Hessian using sparse accumulation
-            hess = np.zeros((n, n))
+            # Build Hessian (Fisher information) using sparse accumulation
+            hess = np.zeros((len(x), len(x)), dtype=x.dtype)
 
             # Diagonal elements: sum of weights where player appears
             np.add.at(hess, (i_idx, i_idx), weights)
@@ -510,32 +1398,42 @@ class BradleyTerryModel:
             np.add.at(hess, (i_idx, j_idx), -weights)
             np.add.at(hess, (j_idx, i_idx), -weights)
 
+            # Tie parameter row/column
+            if ties:
+                col = np.bincount(i_idx, weights=cross, minlength=n)
+                col -= np.bincount(j_idx, weights=cross, minlength=n)
+                hess[:n, n] = col
+                hess[n, :n] = col
+                hess[n, n] = tie_info
+
             # Add regularization
-            grad -= reg * theta
-            hess += reg * np.eye(n)
+            hess[:n, :n] += prior_hess
 
             # Newton step
             try:
                 delta = np.linalg.solve(hess, grad)
-                theta_new = theta + delta
+                x_new = x + delta
             except np.linalg.LinAlgError:
-                print("Hessian is singular, falling back to gradient descent")
-                return self._fit_logistic_gd(comparisons, reg)
+                vprint("Hessian is singular, falling back to gradient descent")
+                return self._fit_logistic_gd(
+                    matchups, prior, ties=ties, verbose=verbose, x0=x0
+                )
 
             # Check convergence
-            diff = np.max(np.abs(theta_new - theta))
-            theta = theta_new
+            diff = np.max(np.abs(x_new - x))
+            x = x_new
 
             if iteration % 10 == 0:
                 vprint(f"    Iteration {iteration}: max_diff = {diff:.2e}", end="\r")
 
             if diff < tol:
                 vprint(f"\n  Newton's method converged in {iteration + 1} iterations")
+                converged = True
                 break
         else:
             vprint(f"\n  Newton's method did not converge after {max_iter} iterations")
 
-        return theta
+        return x, {"iterations": iteration + 1, "converged": converged}
 
     def fit(self, method: str = "lbfgs", **kwargs) -> np.ndarray:
         """
@@ -559,6 +1457,112 @@ class BradleyTerryModel:
                 f"Unknown method: {method}. Use 'logistic', 'lbfgs', 'gradient_descent', or 'newton'"
             )
 
+    def warm_start_params(self, usernames: List[str], params: np.ndarray) -> np.ndarray:
+        """
+        Starting parameters (x0) from a previous fit on a possibly different roster.
+
+        Players still present start from their previous log-strength, new
+        players from 0; trailing parameters (the tie parameter) carry over.
+
+        Args:
+            usernames: Players of the previous fit, in its order
+            params: `params` of the previous fit
+
+        Returns:
+            x0 for fit_logistic / fit_bootstrap on this model's players
+        """
+        previous = dict(zip(usernames, params[: len(usernames)]))
+        return np.concatenate(
+            [
+                [previous.get(u, 0.0) for u in self.h2h.get_usernames()],
+                params[len(usernames) :],
+            ]
+        )
+
+    def fit_path(
+        self,
+        regularizations: List[float],
+        method: str = "lbfgs",
+        verbose: bool = True,
+        **fit_kwargs,
+    ) -> Dict[str, object]:
+        """
+        Fit along a regularization path, from strong to weak regularization.
+
+        Each fit is warm-started from the previous solutions (extrapolated
+        in log λ), so a point of a dense path takes a few optimizer
+        iterations instead of a full solve. The model is left at the weakest
+        regularization.
+
+        Args:
+            regularizations: Regularization values (any order)
+            method: Optimization method, as in fit_logistic
+            verbose: Print one line per regularization value
+            **fit_kwargs: Other fit_logistic arguments (ties, normalize_matchups, ...)
+
+        Returns:
+            Dictionary containing:
+                - 'regularizations': Values in fitting order (descending)
+                - 'strengths': Array of shape (n_lambdas, n_players)
+                - 'log_strengths': Array of shape (n_lambdas, n_players)
+                - 'diagnostics': One fit_info dict per value (iterations,
+                  converged, log_likelihood, penalty, gradient_norm), plus
+                  the tie parameter for tie models
+        """
+        regularizations = sorted(regularizations, reverse=True)
+        dtype = fit_kwargs.get("dtype", np.float64)
+        strengths = np.zeros((len(regularizations), self.n_players), dtype=dtype)
+        log_strengths = np.zeros_like(strengths)
+        diagnostics = []
+
+        x_prev = fit_kwargs.pop("x0", None)
+        x_start = x_prev
+        for k, reg in enumerate(regularizations):
+            self.fit_logistic(
+                method=method,
+                regularization=reg,
+                verbose=False,
+                x0=x_start,
+                **fit_kwargs,
+            )
+            x_start = self.params
+            if (
+                0 < k < len(regularizations) - 1
+                and regularizations[k + 1] > 0
+                # A repeated λ leaves no step in log λ to extrapolate
+                and reg != regularizations[k - 1]
+            ):
+                # Secant predictor: the solution moves smoothly in log λ, so
+                # extrapolate the last step instead of restarting from it
+                step = np.log(regularizations[k + 1] / reg) / np.log(
+                    reg / regularizations[k - 1]
+                )
+                predicted = self.params + step * (self.params - x_prev)
+                if np.all(np.isfinite(predicted)):
+                    x_start = predicted
+            x_prev = self.params
+            strengths[k] = self.strengths
+            log_strengths[k] = self.log_strengths
+            diagnostics.append(
+                {
+                    "regularization": reg,
+                    **self.fit_info,
+                    "tie_parameter": self.tie_parameter,
+                }
+            )
+            if verbose:
+                print(
+                    f"  λ = {reg:<10.4g} log-lik = {self.fit_info['log_likelihood']:.4f}  "
+                    f"iterations = {self.fit_info['iterations']}"
+                )
+
+        return {
+            "regularizations": np.array(regularizations),
+            "strengths": strengths,
+            "log_strengths": log_strengths,
+            "diagnostics": diagnostics,
+        }
+
     def predict_win_probability(self, i: int, j: int) -> float:
         """
         Predict probability that player i beats player j.
@@ -575,6 +1579,166 @@ class BradleyTerryModel:
 
         return self.strengths[i] / (self.strengths[i] + self.strengths[j])
 
+    def predict_outcome_probabilities(self, i: int, j: int) -> Tuple[float, float, float]:
+        """
+        Predict (win, loss, tie) probabilities for player i against player j.
+
+        Without a tie model the tie probability is 0 and the win probability
+        equals predict_win_probability(i, j).
+        """
+        if self.strengths is None:
+            raise ValueError("Must fit model first")
+
+        d = np.array([self.log_strengths[i] - self.log_strengths[j]])
+        probs = np.exp(self._outcome_log_probabilities(d, [i], [j])[:, 0])
+        if self.tie_model is None:
+            return float(probs[0]), float(probs[1]), 0.0
+        return float(probs[0]), float(probs[1]), float(probs[2])
+
+    def _player_indices(self, players) -> np.ndarray:
+        """Indices of players given as usernames or integer indices."""
+        players = np.asarray(players)
+        if np.issubdtype(players.dtype, np.integer):
+            return players
+        index = {u: k for k, u in enumerate(self.h2h.get_usernames())}
+        try:
+            return np.array([index[u] for u in players.ravel()], dtype=int).reshape(
+                players.shape
+            )
+        except KeyError as e:
+            raise KeyError(f"Unknown player: {e.args[0]}") from None
+
+    def predict_win_probabilities(
+        self,
+        players_i,
+        players_j,
+        bootstrap_results: Dict[str, np.ndarray] = None,
+        confidence: float = 0.95,
+        chunk_size: int = 4096,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Predict P(i beats j) for many pairs at once.
+
+        Args:
+            players_i: Usernames (or indices) of the first players
+            players_j: Usernames (or indices) of their opponents, same length
+            bootstrap_results: Results from fit_bootstrap() to add a
+                percentile confidence interval per pair
+            confidence: Coverage of the interval
+            chunk_size: Pairs per chunk of the interval computation, so that
+                at most n_bootstrap x chunk_size differences exist at once
+
+        Returns:
+            Dictionary with 'probability' and, with bootstrap_results,
+            'ci_lower' and 'ci_upper' (arrays with one entry per pair)
+        """
+        if self.strengths is None:
+            raise ValueError("Must fit model first")
+
+        i_idx = self._player_indices(players_i)
+        j_idx = self._player_indices(players_j)
+        theta = self.log_strengths.astype(float)
+        result = {"probability": np.exp(_log_sigmoid(theta[i_idx] - theta[j_idx]))}
+        if bootstrap_results is None:
+            return result
+
+        samples = bootstrap_results["log_strengths_samples"]
+        alpha = (1 - confidence) / 2
+        lower = np.empty(len(i_idx))
+        upper = np.empty(len(i_idx))
+        for start in range(0, len(i_idx), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            d = samples[:, i_idx[chunk]].astype(float) - samples[:, j_idx[chunk]]
+            # The sigmoid is monotone, so quantiles of d map to quantiles of p
+            lo, hi = np.quantile(d, [alpha, 1 - alpha], axis=0)
+            lower[chunk] = np.exp(_log_sigmoid(lo))
+            upper[chunk] = np.exp(_log_sigmoid(hi))
+        result["ci_lower"] = lower
+        result["ci_upper"] = upper
+        return result
+
+    def export_probability_matrix(
+        self,
+        top_k: int = None,
+        bits: int = 8,
+        path: str = None,
+        block_size: int = 1024,
+    ) -> Dict[str, object]:
+        """
+        Predicted win-probability matrix of the top-k players, quantized.
+
+        Entry [a, b] is P(a beats b) stored as round(p * (2**bits - 1)) in an
+        unsigned integer type, so a 1000 x 1000 matrix takes 1 MB at 8 bits
+        (absolute error at most 0.002) or 2 MB at 16 bits. Rows are computed
+        in blocks of `block_size`, so no float matrix of the full size exists.
+
+        Args:
+            top_k: Number of strongest players (default: all)
+            bits: 8 or 16
+            path: If given, also write the matrix as JSON with the data
+                base64-encoded (read it back with load_probability_matrix)
+            block_size: Rows computed at once
+
+        Returns:
+            Dictionary with 'players' (usernames, strongest first), 'scale'
+            (2**bits - 1) and 'probabilities' (quantized k x k array)
+        """
+        if self.strengths is None:
+            raise ValueError("Must fit model first")
+        if bits not in (8, 16):
+            raise ValueError(f"bits must be 8 or 16, got {bits}")
+
+        theta = self.log_strengths.astype(float)
+        order = np.argsort(-theta, kind="stable")[:top_k]
+        theta = theta[order]
+        k = len(order)
+        scale = 2**bits - 1
+        quantized = np.empty((k, k), dtype=np.uint8 if bits == 8 else np.uint16)
+        for start in range(0, k, block_size):
+            d = theta[start : start + block_size, None] - theta[None, :]
+            quantized[start : start + block_size] = np.rint(
+                np.exp(_log_sigmoid(d)) * scale
+            )
+
+        usernames = self.h2h.get_usernames()
+        export = {
+            "players": [usernames[i] for i in order],
+            "scale": scale,
+            "probabilities": quantized,
+        }
+        if path is not None:
+            import base64
+
+            little_endian = quantized.astype(quantized.dtype.newbyteorder("<"))
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "players": export["players"],
+                        "scale": scale,
+                        "dtype": quantized.dtype.name,
+                        "shape": [k, k],
+                        "data": base64.b64encode(little_endian.tobytes()).decode("ascii"),
+                    },
+                    f,
+                )
+        return export
+
+    def _outcome_log_probabilities(
+        self, d: np.ndarray, i_idx: np.ndarray = None, j_idx: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Log-probabilities of (i wins, j wins[, tie]) for log-strength
+        differences d = θ_i - θ_j under the fitted tie model.
+
+        After a per-component fit, pairs (i_idx, j_idx) within one component
+        use that component's tie parameter and other pairs the reported one.
+        """
+        s = float(self.params[-1]) if self.tie_model else 0.0
+        if self.component_tie_params is not None and i_idx is not None:
+            same = self.components[i_idx] == self.components[j_idx]
+            s = np.where(same, self.component_tie_params[self.components[i_idx]], s)
+        return _outcome_kernels(d, s, self.tie_model)[0]
+
     def get_rankings(self, ascending: bool = False) -> pd.DataFrame:
         """
         Get player rankings based on Bradley-Terry strengths.
@@ -585,35 +1749,117 @@ class BradleyTerryModel:
         Returns:
             DataFrame with rankings and statistics
         """
+        return self.rankings_table(
+            columns=RANKING_COLUMNS["strength"], ascending=ascending
+        )
+
+    def _player_totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wins and losses of every player, cached per wins matrix.
+
+        fit_bootstrap and the analysis scripts swap in new matrices rather
+        than editing them in place, so the matrix object identifies the data.
+        """
+        wins = self.h2h.wins_matrix
+        if self._totals is None or self._totals[0] is not wins:
+            self._totals = (wins, wins.sum(axis=1), wins.sum(axis=0))
+        return self._totals[1], self._totals[2]
+
+    def rankings_table(
+        self,
+        bootstrap_results: Dict[str, np.ndarray] = None,
+        center: float = 1500.0,
+        scale: float = 400.0,
+        ascending: bool = False,
+        columns: List[str] = None,
+        as_frame: bool = True,
+    ):
+        """
+        Build the rankings table column by column, sorted by strength.
+
+        Args:
+            bootstrap_results: Results from fit_bootstrap(), needed for the
+                uncertainty columns (BT_Std, BT_CI_*, Elo_Std, Elo_CI_*)
+            center: Elo center point (default: 1500)
+            scale: Elo scaling constant (default: 400)
+            ascending: If True, sort by ascending strength
+            columns: Columns to include, in order (default: all available);
+                see RANKING_COLUMNS for the sets of the get_rankings* methods
+            as_frame: Return a DataFrame; otherwise a dict of column arrays
+
+        Returns:
+            DataFrame (or dict of arrays) with one row per player
+        """
         if self.strengths is None:
             raise ValueError("Must fit model first")
+        if columns is None:
+            columns = RANKING_COLUMNS[
+                "elo_uncertainty" if bootstrap_results is not None else "elo"
+            ]
+
+        total_wins, total_losses = self._player_totals()
+        total_games = total_wins + total_losses
+        players = self.h2h.players
+        player_elo = np.array([p["Elo"] for p in players])
+
+        # Column builders; only the requested ones are evaluated
+        def bootstrap(key):
+            if bootstrap_results is None:
+                raise ValueError("Uncertainty columns need bootstrap_results")
+            return bootstrap_results[key]
+
+        cache = {}
+
+        def elo_uncertainty(key):
+            if "elo" not in cache:
+                bootstrap("strengths_samples")
+                cache["elo"] = self.bootstrap_to_elo_uncertainty(
+                    bootstrap_results, center=center, scale=scale
+                )
+            return cache["elo"][key]
+
+        builders = {
+            "Username": lambda: np.array([p["Username"] for p in players], dtype=object),
+            "BT_Strength": lambda: self.strengths,
+            "Log_Strength": lambda: self.log_strengths,
+            "BT_Std": lambda: bootstrap("std_strengths"),
+            "BT_CI_Lower": lambda: bootstrap("ci_lower"),
+            "BT_CI_Upper": lambda: bootstrap("ci_upper"),
+            "BT_Elo": lambda: self.strengths_to_elo(center=center, scale=scale),
+            "Elo_Std": lambda: elo_uncertainty("elo_std"),
+            "Elo_CI_Lower": lambda: elo_uncertainty("elo_ci_lower"),
+            "Elo_CI_Upper": lambda: elo_uncertainty("elo_ci_upper"),
+            "Total_Wins": lambda: total_wins.astype(np.int64),
+            "Total_Losses": lambda: total_losses.astype(np.int64),
+            "Total_Games": lambda: total_games.astype(np.int64),
+            "Win_Rate": lambda: np.divide(
+                total_wins,
+                total_games,
+                out=np.zeros(len(players)),
+                where=total_games > 0,
+            ),
+            "Elo": lambda: player_elo,
+            "Original_Elo": lambda: player_elo,
+            "Glicko": lambda: np.array([p["Glicko"] for p in players]),
+        }
 
-        rankings = []
-        for i, player in enumerate(self.h2h.players):
-            total_wins = np.sum(self.h2h.wins_matrix[i, :])
-            total_losses = np.sum(self.h2h.wins_matrix[:, i])
-            total_games = total_wins + total_losses
+        if ascending:
+            order = np.argsort(self.strengths, kind="stable")
+        else:
+            order = np.argsort(-self.strengths, kind="stable")
+        table = {}
+        for column in columns:
+            if column == "Rank":
+                table["Rank"] = np.arange(1, len(order) + 1)
+            else:
+                table[column] = np.asarray(builders[column]())[order]
 
-            rankings.append(
-                {
-                    "Rank": 0,  # Will be filled after sorting
-                    "Username": player["Username"],
-                    "BT_Strength": self.strengths[i],
-                    "Log_Strength": self.log_strengths[i],
-                    "Total_Wins": int(total_wins),
-                    "Total_Losses": int(total_losses),
-                    "Total_Games": int(total_games),
-                    "Win_Rate": total_wins / total_games if total_games > 0 else 0,
-                    "Elo": player["Elo"],
-                    "Glicko": player["Glicko"],
-                }
-            )
+        if not as_frame:
+            return table
 
-        df = pd.DataFrame(rankings)
-        df = df.sort_values("BT_Strength", ascending=ascending).reset_index(drop=True)
-        df["Rank"] = range(1, len(df) + 1)
+        import pandas as pd
 
-        return df
+        return pd.DataFrame(table)
 
     def strengths_to_elo(
         self, center: float = 1500.0, scale: float = 400.0
@@ -713,15 +1959,11 @@ class BradleyTerryModel:
         """
         # Convert all bootstrap samples to Elo scale
         strengths_samples = bootstrap_results["strengths_samples"]
-        n_bootstrap, n_players = strengths_samples.shape
 
-        elo_samples = np.zeros_like(strengths_samples)
-        for i in range(n_bootstrap):
-            # Convert each bootstrap sample
-            log10_strengths = np.log10(strengths_samples[i, :])
-            mean_log10 = np.mean(log10_strengths)
-            centered_log10 = log10_strengths - mean_log10
-            elo_samples[i, :] = scale * centered_log10 + center
+        # Center each sample's log-strengths (rows) like strengths_to_elo
+        log10_strengths = np.log10(strengths_samples)
+        centered_log10 = log10_strengths - log10_strengths.mean(axis=1, keepdims=True)
+        elo_samples = scale * centered_log10 + center
 
         # Compute statistics in Elo scale
         elo_ratings = self.strengths_to_elo(center=center, scale=scale)
@@ -751,39 +1993,12 @@ class BradleyTerryModel:
         Returns:
             DataFrame with rankings including both BT strength and Elo-like rating
         """
-        if self.strengths is None:
-            raise ValueError("Must fit model first")
-
-        # Get Elo-like ratings
-        elo_ratings = self.strengths_to_elo(center=center, scale=scale)
-
-        rankings = []
-        for i, player in enumerate(self.h2h.players):
-            total_wins = np.sum(self.h2h.wins_matrix[i, :])
-            total_losses = np.sum(self.h2h.wins_matrix[:, i])
-            total_games = total_wins + total_losses
-
-            rankings.append(
-                {
-                    "Rank": 0,  # Will be filled after sorting
-                    "Username": player["Username"],
-                    "BT_Strength": self.strengths[i],
-                    "BT_Elo": elo_ratings[i],
-                    "Log_Strength": self.log_strengths[i],
-                    "Total_Wins": int(total_wins),
-                    "Total_Losses": int(total_losses),
-                    "Total_Games": int(total_games),
-                    "Win_Rate": total_wins / total_games if total_games > 0 else 0,
-                    "Original_Elo": player["Elo"],
-                    "Glicko": player["Glicko"],
-                }
-            )
-
-        df = pd.DataFrame(rankings)
-        df = df.sort_values("BT_Strength", ascending=ascending).reset_index(drop=True)
-        df["Rank"] = range(1, len(df) + 1)
-
-        return df
+        return self.rankings_table(
+            center=center,
+            scale=scale,
+            ascending=ascending,
+            columns=RANKING_COLUMNS["elo"],
+        )
 
     def compute_log_likelihood(self) -> float:
         """
@@ -795,62 +2010,188 @@ class BradleyTerryModel:
         if self.strengths is None:
             raise ValueError("Must fit model first")
 
-        ll = 0
-        n = self.n_players
         wins = self.h2h.wins_matrix
+        i_idx, j_idx = np.nonzero(wins)
+        d = self.log_strengths[i_idx].astype(float) - self.log_strengths[j_idx]
+        return float(np.sum(wins[i_idx, j_idx] * _log_sigmoid(d)))
 
-        for i in range(n):
-            for j in range(n):
-                if i != j and wins[i, j] > 0:
-                    p_ij = self.predict_win_probability(i, j)
-                    ll += wins[i, j] * np.log(p_ij + 1e-10)
-
-        return ll
-
-    def evaluate_predictions(self, min_games: int = 10) -> Dict[str, float]:
+    def matchup_predictions(
+        self,
+        min_games: int = 0,
+        wins: np.ndarray = None,
+        ties: np.ndarray = None,
+    ) -> Dict[str, np.ndarray]:
         """
-        Evaluate model predictions against actual outcomes.
+        Observed outcomes and model predictions of every played matchup.
+
+        Vectorized over the non-zero entries of the games matrix; each
+        matchup appears once per direction, (i, j) and (j, i).
 
         Args:
-            min_games: Only evaluate matchups with at least this many games
+            min_games: Only matchups with at least this many games (ties included)
+            wins: Wins matrix to evaluate instead of the fitted data (e.g.
+                held-out games)
+            ties: Ties matrix matching `wins`
 
         Returns:
-            Dictionary of evaluation metrics
+            Dictionary of arrays with one entry per ordered matchup:
+                - 'i', 'j': Player indices
+                - 'wins', 'losses', 'ties', 'games': Outcome counts of i vs j
+                - 'player_games': Decisive games of player i over all opponents
+                - 'win_probability': Predicted P(i beats j) = π_i / (π_i + π_j)
+                - 'log_probabilities': Array of shape (n_outcomes, n_matchups)
+                  of log P(i wins), log P(j wins) and, for tie models, log P(tie)
         """
         if self.strengths is None:
             raise ValueError("Must fit model first")
 
-        predictions = []
-        actuals = []
+        wins = self.h2h.wins_matrix if wins is None else wins
+        ties = self.h2h.ties_matrix if ties is None else ties
+        games = wins + wins.T + ties
+        i_idx, j_idx = np.nonzero(games)
+        keep = games[i_idx, j_idx] >= min_games
+        i_idx, j_idx = i_idx[keep], j_idx[keep]
 
-        n = self.n_players
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    total_games = self.h2h.games_matrix[i, j]
-                    if total_games >= min_games:
-                        wins = self.h2h.wins_matrix[i, j]
-                        actual_rate = wins / total_games
-                        pred_prob = self.predict_win_probability(i, j)
+        theta = self.log_strengths.astype(float)
+        d = theta[i_idx] - theta[j_idx]
+        return {
+            "i": i_idx,
+            "j": j_idx,
+            "wins": wins[i_idx, j_idx],
+            "losses": wins[j_idx, i_idx],
+            "ties": ties[i_idx, j_idx],
+            "games": games[i_idx, j_idx],
+            "player_games": (wins.sum(axis=1) + wins.sum(axis=0))[i_idx],
+            "win_probability": np.exp(_log_sigmoid(d)),
+            "log_probabilities": self._outcome_log_probabilities(d, i_idx, j_idx),
+        }
 
-                        predictions.append(pred_prob)
-                        actuals.append(actual_rate)
+    def evaluate_predictions(
+        self,
+        min_games: int = 10,
+        n_bins: int = 10,
+        games_bins: List[float] = None,
+        wins: np.ndarray = None,
+        ties: np.ndarray = None,
+    ) -> Dict[str, object]:
+        """
+        Evaluate model predictions against actual outcomes.
 
-        predictions = np.array(predictions)
-        actuals = np.array(actuals)
+        All metrics come from one pass over the played matchups (see
+        matchup_predictions). Per-game scores use the outcome probabilities
+        of the tie model; without one, a tie counts as half a win and half a
+        loss.
 
-        # Compute metrics
-        mae = np.mean(np.abs(predictions - actuals))
-        rmse = np.sqrt(np.mean((predictions - actuals) ** 2))
+        Args:
+            min_games: Only evaluate matchups with at least this many games
+            n_bins: Number of equal-width predicted-probability bins of the
+                calibration curve
+            games_bins: Bin edges on player i's decisive games for the
+                per-bin breakdown (default: 0, 20, 50, 100, 200, 500, inf)
+            wins: Wins matrix to evaluate instead of the fitted data
+            ties: Ties matrix matching `wins`
 
-        # Accuracy (within 10% of actual)
-        accuracy_10 = np.mean(np.abs(predictions - actuals) < 0.1)
+        Returns:
+            Dictionary of evaluation metrics:
+                - 'mae', 'rmse', 'accuracy_10pct', 'n_matchups': Predicted
+                  win probability vs. observed win rate per matchup
+                - 'log_loss', 'brier', 'n_games': Per-game scores
+                - 'calibration': Reliability curve per probability bin
+                  ('bin_lower', 'bin_upper', 'mean_predicted', 'observed',
+                  'n_games'), over decisive games
+                - 'ece': Expected calibration error (game-weighted)
+                - 'by_games': Breakdown per player-games bin ('bin',
+                  'n_matchups', 'mae', 'log_loss', 'brier')
+        """
+        table = self.matchup_predictions(min_games, wins, ties)
+        predicted = table["win_probability"]
+        errors = predicted - table["wins"] / table["games"]
+        abs_errors = np.abs(errors)
+
+        # Per-game log-loss and multi-class Brier score, per matchup row
+        log_p = table["log_probabilities"]
+        if self.tie_model:
+            counts = np.stack([table["wins"], table["losses"], table["ties"]])
+        else:
+            counts = np.stack([table["wins"], table["losses"]]) + table["ties"] / 2
+        counts = counts.astype(float)
+        probs = np.exp(log_p)
+        brier_per_outcome = np.sum(probs**2, axis=0) - 2 * probs + 1
+        row_games = counts.sum(axis=0)
+        row_log_loss = -np.sum(counts * log_p, axis=0)
+        row_brier = np.sum(counts * brier_per_outcome, axis=0)
+        # Every game is seen from both sides
+        n_games = row_games.sum() / 2
+
+        def ratio(num, den):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(den > 0, num / den, np.nan)
+
+        # Calibration of P(i beats j) on decisive games
+        decisive = (table["wins"] + table["losses"]).astype(float)
+        edges = np.linspace(0.0, 1.0, n_bins + 1)
+        b = np.clip(np.searchsorted(edges, predicted, side="right") - 1, 0, n_bins - 1)
+        bin_games = np.bincount(b, weights=decisive, minlength=n_bins)
+        mean_predicted = ratio(
+            np.bincount(b, weights=decisive * predicted, minlength=n_bins), bin_games
+        )
+        observed = ratio(
+            np.bincount(b, weights=table["wins"], minlength=n_bins), bin_games
+        )
+        filled = bin_games > 0
+        ece = (
+            float(
+                np.sum(bin_games[filled] * np.abs(observed - mean_predicted)[filled])
+                / bin_games.sum()
+            )
+            if filled.any()
+            else float("nan")
+        )
 
+        # Breakdown by player i's games (intervals closed on the right)
+        games_edges = np.asarray(
+            games_bins if games_bins is not None else [0, 20, 50, 100, 200, 500, np.inf],
+            dtype=float,
+        )
+        n_groups = len(games_edges) - 1
+        g = np.searchsorted(games_edges, table["player_games"], side="left") - 1
+        in_range = (g >= 0) & (g < n_groups)
+        g = np.where(in_range, g, n_groups)  # overflow bucket, dropped below
+
+        def per_group(values):
+            return np.bincount(g, weights=values, minlength=n_groups + 1)[:n_groups]
+
+        group_matchups = per_group(np.ones(len(g)))
+        group_games = per_group(row_games)
+        labels = [
+            f"{lo:g}-{hi:g}" if np.isfinite(hi) else f"{lo:g}+"
+            for lo, hi in zip(games_edges[:-1], games_edges[1:])
+        ]
+
+        n_matchups = len(predicted)
         return {
-            "mae": mae,
-            "rmse": rmse,
-            "accuracy_10pct": accuracy_10,
-            "n_matchups": len(predictions),
+            "mae": float(abs_errors.mean()) if n_matchups else float("nan"),
+            "rmse": float(np.sqrt(np.mean(errors**2))) if n_matchups else float("nan"),
+            "accuracy_10pct": float(np.mean(abs_errors < 0.1)) if n_matchups else float("nan"),
+            "n_matchups": n_matchups,
+            "log_loss": float(ratio(row_log_loss.sum(), row_games.sum())),
+            "brier": float(ratio(row_brier.sum(), row_games.sum())),
+            "n_games": float(n_games),
+            "calibration": {
+                "bin_lower": edges[:-1],
+                "bin_upper": edges[1:],
+                "mean_predicted": mean_predicted,
+                "observed": observed,
+                "n_games": bin_games,
+            },
+            "ece": ece,
+            "by_games": {
+                "bin": labels,
+                "n_matchups": group_matchups.astype(int),
+                "mae": ratio(per_group(abs_errors), group_matchups),
+                "log_loss": ratio(per_group(row_log_loss), group_games),
+                "brier": ratio(per_group(row_brier), group_games),
+            },
         }
 
     def bootstrap_sample_games(
@@ -858,7 +2199,8 @@ class BradleyTerryModel:
         method: str = "resample",
         fraction: float = 1.0,
         seed: Optional[int] = None,
-    ) -> Tuple[np.ndarray, np.ndarray]:
+        include_ties: bool = False,
+    ) -> Tuple[np.ndarray, ...]:
         """
         Create a bootstrap sample of the games data.
 
@@ -866,9 +2208,11 @@ class BradleyTerryModel:
             method: 'resample' (sample with replacement), 'subsample' (sample without replacement)
             fraction: Fraction of games to sample (for subsample method)
             seed: Random seed for reproducibility
+            include_ties: Also resample tied games and return the ties matrix
 
         Returns:
-            Tuple of (wins_matrix, games_matrix) for the bootstrap sample
+            Tuple of (wins_matrix, games_matrix) for the bootstrap sample,
+            or (wins_matrix, games_matrix, ties_matrix) with include_ties
         """
         if seed is not None:
             np.random.seed(seed)
@@ -876,6 +2220,7 @@ class BradleyTerryModel:
         n = self.n_players
         wins_boot = np.zeros((n, n), dtype=int)
         games_boot = np.zeros((n, n), dtype=int)
+        ties_boot = np.zeros((n, n), dtype=int)
 
         # For each matchup, sample from the individual games
         for i in range(n):
@@ -883,11 +2228,12 @@ class BradleyTerryModel:
                 if i != j:
                     wins = self.h2h.wins_matrix[i, j]
                     losses = self.h2h.wins_matrix[j, i]
-                    total = wins + losses
+                    ties = self.h2h.ties_matrix[i, j] if include_ties else 0
+                    total = wins + losses + ties
 
                     if total > 0:
-                        # Create array of outcomes (1 = player i wins, 0 = player j wins)
-                        outcomes = np.array([1] * wins + [0] * losses)
+                        # Create array of outcomes (1 = player i wins, 0 = player j wins, 2 = tie)
+                        outcomes = np.array([1] * wins + [0] * losses + [2] * ties)
 
                         if method == "resample":
                             # Bootstrap: sample with replacement
@@ -905,9 +2251,89 @@ class BradleyTerryModel:
                             raise ValueError(f"Unknown method: {method}")
 
                         # Count wins in the sample
-                        wins_boot[i, j] = np.sum(sampled)
+                        wins_boot[i, j] = np.sum(sampled == 1)
+                        ties_boot[i, j] = np.sum(sampled == 2)
                         games_boot[i, j] = len(sampled)
 
+        if include_ties:
+            return wins_boot, games_boot, ties_boot
+        return wins_boot, games_boot
+
+    def bootstrap_sample_batch(
+        self,
+        n_samples: int,
+        method: str = "resample",
+        seed: Optional[int] = None,
+        include_ties: bool = False,
+        fraction: float = 1.0,
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Draw several bootstrap samples of the games data at once.
+
+        Resampling the games of a matchup with replacement is a multinomial
+        draw over its outcomes, and subsampling without replacement is a
+        (multivariate) hypergeometric one, so all matchups and samples are
+        drawn in a few vectorized calls. Unlike bootstrap_sample_games, each
+        unordered pair is sampled once, so the sample stays consistent (wins
+        of i over j in one direction are losses in the other).
+
+        Args:
+            n_samples: Number of bootstrap samples
+            method: 'resample' (with replacement) or 'subsample' (without replacement)
+            seed: Random seed for reproducibility
+            include_ties: Also resample tied games and return the ties matrices
+            fraction: Fraction of games to sample (for subsample method)
+
+        Returns:
+            Tuple of (wins, games[, ties]) arrays of shape (n_samples, n, n)
+        """
+        if method not in ("resample", "subsample"):
+            raise ValueError(f"Unknown method: {method}")
+
+        rng = np.random.default_rng(seed)
+        n = self.n_players
+        i_idx, j_idx = np.triu_indices(n, k=1)
+        wins = self.h2h.wins_matrix
+        outcomes = np.stack(
+            [
+                wins[i_idx, j_idx],
+                wins[j_idx, i_idx],
+                self.h2h.ties_matrix[i_idx, j_idx]
+                if include_ties
+                else np.zeros(len(i_idx), dtype=int),
+            ],
+            axis=-1,
+        ).astype(np.int64)
+        total = outcomes.sum(axis=1)
+        played = total > 0
+        i_idx, j_idx = i_idx[played], j_idx[played]
+        total = total[played]
+        outcomes = outcomes[played]
+
+        if method == "resample":
+            probs = outcomes / total[:, None]
+            draws = rng.multinomial(total, probs, size=(n_samples, len(total)))
+        else:
+            # Draw the wins of i, then split the rest between losses and ties
+            size = np.maximum(1, (total * fraction).astype(np.int64))
+            shape = (n_samples, len(total))
+            first = rng.hypergeometric(
+                outcomes[:, 0], outcomes[:, 1] + outcomes[:, 2], size, size=shape
+            )
+            rest = size - first
+            second = rng.hypergeometric(outcomes[:, 1], outcomes[:, 2], rest)
+            draws = np.stack([first, second, rest - second], axis=-1)
+
+        wins_boot = np.zeros((n_samples, n, n), dtype=np.int32)
+        ties_boot = np.zeros((n_samples, n, n), dtype=np.int32)
+        wins_boot[:, i_idx, j_idx] = draws[..., 0]
+        wins_boot[:, j_idx, i_idx] = draws[..., 1]
+        ties_boot[:, i_idx, j_idx] = draws[..., 2]
+        ties_boot[:, j_idx, i_idx] = draws[..., 2]
+        games_boot = wins_boot + wins_boot.transpose(0, 2, 1) + ties_boot
+
+        if include_ties:
+            return wins_boot, games_boot, ties_boot
         return wins_boot, games_boot
 
     def fit_bootstrap(
@@ -918,6 +2344,8 @@ class BradleyTerryModel:
         fit_method: str = "logistic",
         min_games: int = 0,
         verbose: bool = True,
+        batch_size: int = None,
+        samples: Tuple[np.ndarray, ...] = None,
         **fit_kwargs,
     ) -> Dict[str, np.ndarray]:
         """
@@ -930,7 +2358,15 @@ class BradleyTerryModel:
             fit_method: Fitting method to use ('logistic', 'lbfgs', etc.)
             min_games: Minimum games for fitting
             verbose: Print progress
+            batch_size: Draw replicates in batches of this size with
+                bootstrap_sample_batch instead of one at a time with
+                bootstrap_sample_games
+            samples: Precomputed (wins, games[, ties]) arrays of shape
+                (n_bootstrap, n, n), e.g. from bootstrap_sample_batch, to fit
+                instead of drawing new replicates (so several analyses can
+                share them); overrides n_bootstrap
             **fit_kwargs: Additional arguments for the fitting method
+                (including dtype, which also sets the dtype of the samples)
 
         Returns:
             Dictionary containing:
@@ -940,7 +2376,11 @@ class BradleyTerryModel:
                 - 'std_strengths': Standard deviation of strength estimates
                 - 'ci_lower': Lower 95% confidence interval
                 - 'ci_upper': Upper 95% confidence interval
+                - 'tie_parameter_samples': Tie parameter per sample (tie models only)
+                - 'family_mean_samples': Family -> mean per sample (with families)
         """
+        if samples is not None:
+            n_bootstrap = len(samples[0])
         if verbose:
             print(f"\n{'='*60}")
             print(f"BOOTSTRAP ANALYSIS ({method.upper()})")
@@ -953,28 +2393,50 @@ class BradleyTerryModel:
             print()
 
         n = self.n_players
-        strengths_samples = np.zeros((n_bootstrap, n))
-        log_strengths_samples = np.zeros((n_bootstrap, n))
+        dtype = fit_kwargs.get("dtype", np.float64)
+        strengths_samples = np.zeros((n_bootstrap, n), dtype=dtype)
+        log_strengths_samples = np.zeros((n_bootstrap, n), dtype=dtype)
         fit_kwargs["verbose"] = verbose
+        ties = fit_kwargs.get("ties")
+        tie_parameter_samples = np.zeros(n_bootstrap, dtype=dtype) if ties else None
+        family_mean_samples = {}
+        # 'logistic' is the generic name for the default L-BFGS fitter
+        fit_method = "lbfgs" if fit_method == "logistic" else fit_method
 
         # Store original matrices
         original_wins = self.h2h.wins_matrix.copy()
         original_games = self.h2h.games_matrix.copy()
+        original_ties = self.h2h.ties_matrix.copy()
 
         for b in range(n_bootstrap):
             if verbose and (b + 1) % 10 == 0:
                 print(f"Bootstrap sample {b + 1}/{n_bootstrap}...")
 
             # Create bootstrap sample
-            wins_boot, games_boot = self.bootstrap_sample_games(
-                method=method, fraction=fraction, seed=b
-            )
+            if samples is not None:
+                sample = tuple(m[b] for m in samples)
+            elif batch_size:
+                if b % batch_size == 0:
+                    batch = self.bootstrap_sample_batch(
+                        min(batch_size, n_bootstrap - b),
+                        method=method,
+                        seed=b,
+                        include_ties=bool(ties),
+                        fraction=fraction,
+                    )
+                sample = tuple(m[b % batch_size] for m in batch)
+            else:
+                sample = self.bootstrap_sample_games(
+                    method=method, fraction=fraction, seed=b, include_ties=bool(ties)
+                )
             # Temporarily replace matrices
-            self.h2h.wins_matrix = wins_boot
-            self.h2h.games_matrix = games_boot
+            self.h2h.wins_matrix = sample[0]
+            self.h2h.games_matrix = sample[1]
+            if ties:
+                self.h2h.ties_matrix = sample[2]
             # Fit model on bootstrap sample
             self.fit_logistic(
-                method=fit_method if fit_method != "lbfgs" else "lbfgs",
+                method=fit_method,
                 min_games=min_games,
                 **fit_kwargs,
             )
@@ -982,44 +2444,48 @@ class BradleyTerryModel:
             # Store results
             strengths_samples[b, :] = self.strengths
             log_strengths_samples[b, :] = self.log_strengths
+            if ties:
+                tie_parameter_samples[b] = self.tie_parameter
+            for family, mu in self.family_means.items():
+                family_mean_samples.setdefault(family, np.zeros(n_bootstrap))[b] = mu
 
         # Restore original matrices
         self.h2h.wins_matrix = original_wins
         self.h2h.games_matrix = original_games
+        self.h2h.ties_matrix = original_ties
 
         # Fit on full data
         if verbose:
             print(f"\nFitting on full data...")
         self.fit_logistic(
-            method=fit_method if fit_method != "lbfgs" else "lbfgs",
+            method=fit_method,
             min_games=min_games,
             **fit_kwargs,
         )
 
-        # Compute statistics
-        mean_strengths = np.mean(strengths_samples, axis=0)
-        std_strengths = np.std(strengths_samples, axis=0)
-        ci_lower = np.percentile(strengths_samples, 2.5, axis=0)
-        ci_upper = np.percentile(strengths_samples, 97.5, axis=0)
+        results = summarize_bootstrap(
+            strengths_samples, log_strengths_samples, tie_parameter_samples
+        )
+        if family_mean_samples:
+            results["family_mean_samples"] = family_mean_samples
 
         if verbose:
             print(f"\n{'='*60}")
             print("BOOTSTRAP RESULTS")
             print(f"{'='*60}")
             print(
-                f"Mean strength range: [{mean_strengths.min():.4f}, {mean_strengths.max():.4f}]"
+                f"Mean strength range: [{results['mean_strengths'].min():.4f}, "
+                f"{results['mean_strengths'].max():.4f}]"
             )
-            print(f"Mean std deviation: {std_strengths.mean():.4f}")
-            print(f"Median std deviation: {np.median(std_strengths):.4f}")
+            print(f"Mean std deviation: {results['std_strengths'].mean():.4f}")
+            print(f"Median std deviation: {np.median(results['std_strengths']):.4f}")
+            if ties:
+                print(
+                    f"Tie parameter ({ties}): {self.tie_parameter:.4f} "
+                    f"± {tie_parameter_samples.std():.4f}"
+                )
 
-        return {
-            "strengths_samples": strengths_samples,
-            "log_strengths_samples": log_strengths_samples,
-            "mean_strengths": mean_strengths,
-            "std_strengths": std_strengths,
-            "ci_lower": ci_lower,
-            "ci_upper": ci_upper,
-        }
+        return results
 
     def get_rankings_with_uncertainty(
         self, bootstrap_results: Dict[str, np.ndarray], ascending: bool = False
@@ -1034,35 +2500,11 @@ class BradleyTerryModel:
         Returns:
             DataFrame with rankings and uncertainty estimates
         """
-        if self.strengths is None:
-            raise ValueError("Must fit model first")
-
-        rankings = []
-        for i, player in enumerate(self.h2h.players):
-            total_wins = np.sum(self.h2h.wins_matrix[i, :])
-            total_losses = np.sum(self.h2h.wins_matrix[:, i])
-            total_games = total_wins + total_losses
-
-            rankings.append(
-                {
-                    "Rank": 0,  # Will be filled after sorting
-                    "Username": player["Username"],
-                    "BT_Strength": self.strengths[i],
-                    "BT_Std": bootstrap_results["std_strengths"][i],
-                    "BT_CI_Lower": bootstrap_results["ci_lower"][i],
-                    "BT_CI_Upper": bootstrap_results["ci_upper"][i],
-                    "Total_Wins": int(total_wins),
-                    "Total_Losses": int(total_losses),
-                    "Win_Rate": total_wins / total_games if total_games > 0 else 0,
-                    "Elo": player["Elo"],
-                }
-            )
-
-        df = pd.DataFrame(rankings)
-        df = df.sort_values("BT_Strength", ascending=ascending).reset_index(drop=True)
-        df["Rank"] = range(1, len(df) + 1)
-
-        return df
+        return self.rankings_table(
+            bootstrap_results,
+            ascending=ascending,
+            columns=RANKING_COLUMNS["uncertainty"],
+        )
 
     def get_rankings_with_elo_uncertainty(
         self,
@@ -1091,46 +2533,10 @@ class BradleyTerryModel:
                 - Total_Wins, Total_Losses, Win_Rate
                 - Original_Elo (from input data)
         """
-        if self.strengths is None:
-            raise ValueError("Must fit model first")
-
-        # Convert bootstrap results to Elo scale
-        elo_uncertainty = self.bootstrap_to_elo_uncertainty(
-            bootstrap_results, center=center, scale=scale
+        return self.rankings_table(
+            bootstrap_results,
+            center=center,
+            scale=scale,
+            ascending=ascending,
+            columns=RANKING_COLUMNS["elo_uncertainty"],
         )
-
-        rankings = []
-        for i, player in enumerate(self.h2h.players):
-            total_wins = np.sum(self.h2h.wins_matrix[i, :])
-            total_losses = np.sum(self.h2h.wins_matrix[:, i])
-            total_games = total_wins + total_losses
-
-            rankings.append(
-                {
-                    "Rank": 0,  # Will be filled after sorting
-                    "Username": player["Username"],
-                    # Bradley-Terry scale
-                    "BT_Strength": self.strengths[i],
-                    "BT_Std": bootstrap_results["std_strengths"][i],
-                    "BT_CI_Lower": bootstrap_results["ci_lower"][i],
-                    "BT_CI_Upper": bootstrap_results["ci_upper"][i],
-                    # Elo scale
-                    "BT_Elo": elo_uncertainty["elo_ratings"][i],
-                    "Elo_Std": elo_uncertainty["elo_std"][i],
-                    "Elo_CI_Lower": elo_uncertainty["elo_ci_lower"][i],
-                    "Elo_CI_Upper": elo_uncertainty["elo_ci_upper"][i],
-                    # Game statistics
-                    "Total_Wins": int(total_wins),
-                    "Total_Losses": int(total_losses),
-                    "Win_Rate": total_wins / total_games if total_games > 0 else 0,
-                    # Original ratings
-                    "Original_Elo": player["Elo"],
-                    "Glicko": player["Glicko"],
-                }
-            )
-
-        df = pd.DataFrame(rankings)
-        df = df.sort_values("BT_Strength", ascending=ascending).reset_index(drop=True)
-        df["Rank"] = range(1, len(df) + 1)
-
-        return df